@@ -1,19 +1,96 @@
-from typing import List
+from typing import List, Union
 import math
+import warnings
 import matplotlib.pyplot as plt
+import numpy as np
+from nhpp import DEFAULT_TOLERANCE, NHPPModel
+from stats import FailureStats
+from loader import load_failure_times
+from solver import ConvergenceWarning, solve, warm_bracket
 
 
-class GOModel:
+class GOModel(NHPPModel):
+    name = "GO"
+
     def __init__(self):
         """
         初始化GOModel类的实例。
 
-        该方法设置了类的初始状态，包括时间列表t、精度参数epslv、参数a和b。
+        该方法设置了类的初始状态，包括时间列表t、精度参数epslv、参数a和b，以及求根方法和求根统计信息。
+        GO模型为NHPP模型：m(t) = a*(1 - e^(-b*t))，λ(t) = a*b*e^(-b*t)。
         """
-        self.t = []  # 存储故障时间的列表，初始为空列表
+        super().__init__()
+        self.t = []  # 存储故障时间的列表（由read_data读取时为数组），初始为空列表
         self.epslv = None  # 精度参数，初始值为None
         self.a = 0  # 参数a，初始值为0
         self.b = 0  # 参数b，初始值为0
+        self.stats = None  # 故障数据的充分统计量，在calculate中一次性计算
+        self.solver = "bisection"  # 求根方法，可选"bisection"、"newton"、"illinois"、"brent"
+        self.xtol = None  # 区间宽度精度，为None时取epslv
+        self.ftol = None  # 残差精度，为None时取epslv
+        # epslv也未设置时取NHPP模型的默认精度DEFAULT_TOLERANCE
+        self.max_iterations = 1000  # 最大迭代次数，防止无限循环
+        self.iterations = 0  # 求根迭代次数
+        self.evaluations = 0  # 函数求值次数
+        self.residual = None  # 根处的函数值
+        self.converged = None  # 是否收敛
+
+    def mean_value(self, t: np.ndarray) -> np.ndarray:
+        """
+        计算GO模型的均值函数m(t) = a*(1 - e^(-b*t))。
+
+        :param t: 时间数组。
+        :return: 均值函数数组。
+        """
+        return self.a * -np.expm1(-self.b * np.asarray(t, dtype=float))
+
+    def intensity(self, t: np.ndarray) -> np.ndarray:
+        """
+        计算GO模型的失效强度λ(t) = a*b*e^(-b*t)。
+
+        :param t: 时间数组。
+        :return: 失效强度数组。
+        """
+        return self.a * self.b * np.exp(-self.b * np.asarray(t, dtype=float))
+
+    def shape(self, z: np.ndarray) -> np.ndarray:
+        """
+        计算GO模型的形状函数G(z) = 1 - e^(-z)。
+
+        :param z: 无量纲时间b*t。
+        :return: G(z)。
+        """
+        return -np.expm1(-np.asarray(z, dtype=float))
+
+    def shape_derivative(self, z: np.ndarray) -> np.ndarray:
+        """
+        计算GO模型形状函数的导数G'(z) = e^(-z)。
+
+        :param z: 无量纲时间b*t。
+        :return: G'(z)。
+        """
+        return np.exp(-np.asarray(z, dtype=float))
+
+    def a_from_x(self, stats: FailureStats, x: float) -> float:
+        """
+        给定x = b*tn时a的极大似然估计a = n/(1 - e^(-x))。
+
+        :param stats: 故障数据的统计量。
+        :param x: 无量纲参数x = b*tn。
+        :return: 参数a。
+        """
+        return stats.n / -math.expm1(-x)
+
+    def _tolerances(self):
+        """
+        求根使用的精度，区间宽度精度xtol和残差精度ftol未单独设置时都取epslv，epslv也未设置时取DEFAULT_TOLERANCE。
+
+        :return: (xtol, ftol)。
+        """
+        default = self.epslv if self.epslv is not None else DEFAULT_TOLERANCE
+        xtol = self.xtol if self.xtol is not None else default
+        ftol = self.ftol if self.ftol is not None else default
+        return xtol, ftol
 
     def Dfunction(self, lst: List[float]) -> float:
         """
@@ -22,28 +99,19 @@ class GOModel:
         :param lst: 故障时间列表。
         :return: 累积故障数。
         """
-        result = 0
-        n = len(lst)
-        for i in range(1, n):
-            t1 = lst[i]
-            result += t1
+        return FailureStats(lst).D
 
-        tn = lst[-1]
-        result /= tn
-        result /= n
-        return result
-
-    def read_data(self):
+    def read_data(self, path: Union[str, List[str]] = "test.txt"):
         """
         从文件中读取故障数据。
 
-        该方法从名为"test.txt"的文件中读取故障数据，并将故障时间存储在t列表中。
+        该方法从"故障序号 故障时间"格式的文件（默认为"test.txt"，可为多个文件或.gz压缩文件）中批量读取故障数据，
+        并将故障时间数组存储在t中。解析结果会缓存为.npy文件，数据文件未变化时直接加载缓存。
+
+        :param path: 文件路径或文件路径列表。
         """
         try:
-            with open("test.txt", 'r') as input_file:
-                for line in input_file:
-                    failure_Number, Timetofailure = map(int, line.strip().split())
-                    self.t.append(float(Timetofailure))
+            self.t = load_failure_times(path)
         except FileNotFoundError:
             print("文件未找到，请检查文件路径是否正确。")
 
@@ -55,77 +123,91 @@ class GOModel:
         """
         self.epslv = float(input("请输入epslv的值："))
 
-    def calculate(self):
+    def calculate(self, stats: FailureStats = None):
         """
         计算模型的参数a和b。
 
-        该方法根据读取的故障数据和设置的精度参数epslv，计算模型的参数a和b。
+        该方法根据读取的故障数据和设置的精度参数epslv，按self.solver指定的求根方法计算模型的参数a和b，
+        并将迭代次数、函数求值次数、最终残差和是否收敛记录在模型上。
+
+        :param stats: 已根据t计算好的充分统计量，为None时根据t计算。多个模型可共享同一份统计量。
+        """
+        self.stats = stats if stats is not None else FailureStats(self.t)
+        self._fit()
+
+    def append_failure(self, t: float):
+        """
+        追加一个新的故障时间并重新计算参数a和b。
+
+        该方法以O(1)的代价更新D值所依赖的累加量，并以上一次求得的xm为初始猜测热启动求根，
+        因此每次追加故障后的重新拟合近似为常数时间。新故障时间早于最后一个故障时间时（数据不是单调递增的），
+        按完整数据重新计算统计量并从头求解。
+
+        :param t: 新的故障时间。
         """
-        N = len(self.t)
-        tn = self.t[-1]
-        xl = 0
-        xr = 0
-        xm = 0
-        D = self.Dfunction(self.t)
-        f = 0
+        x0 = self.b * self.stats.tn if self.stats is not None and self.b > 0 else None  # 上一次求得的xm
+        if self.stats is not None and self.stats.n == len(self.t) and t >= self.stats.tn:
+            self.stats.append(float(t))
+            if isinstance(self.t, list):
+                self.t.append(float(t))
+            else:
+                self.t = self.stats.t  # t为数组时直接使用统计量缓冲区的视图，避免整体复制
+        else:
+            # 没有统计量或新故障时间早于tn（数据非递增）时，按完整数据重新计算统计量并从头求解
+            self.t = list(self.t) + [float(t)]
+            self.stats = FailureStats(self.t)
+            x0 = None
+        self._fit(x0)
+
+    def _fit(self, x0: float = None):
+        """
+        根据当前的充分统计量求解xm并计算参数a和b。
+
+        :param x0: xm的初始猜测，不为None时先在其附近缩小求根区间。
+        """
+        stats = self.stats
+        N = stats.n
+        tn = stats.tn
+        D = stats.D
 
         # 步骤1: 判断D大小
         if 0 < D < 0.5:
-            # 根据模型的要求，首先计算 `D` 值（通过调用 `self.Dfunction` 方法），然后判断 `D` 的范围。
             # 如果 `D` 的值在 `0` 和 `0.5` 之间，就按照特定公式设置 `xl` 和 `xr` 的初始值，这两个值将作为后续迭代计算的边界。
-            # `xl` 和 `xr` 的设置是基于模型的理论和算法要求，为后续的迭代搜索确定一个初始的区间范围。
             xl = (1 - 2 * D) / 2
             xr = 1 / D
         else:
             # 如果 `D` 不在 `0` 到 `0.5` 这个范围内，说明当前的数据情况可能不满足模型的有效计算条件，
-            # 所以直接返回，不进行后续的复杂计算流程。
+            # 所以直接返回，不进行后续的复杂计算流程。追加故障后可能由有解变为无解，此时清除上一次的结果。
+            self.a = self.b = 0
+            self.converged = None
             return
 
-        # 转步骤2：
-        max_iterations = 1000  # 设置一个最大迭代次数，防止无限循环
-        iteration_count = 0
-
-        while True:
-            # 进入一个循环，这个循环的目的是通过不断迭代来逼近满足特定条件的 `xm` 值。
-            # 每次迭代都会更新 `xm` 的值，并根据 `xm` 计算相关的函数值 `f`，然后根据 `f` 与 `self.epslv` 的比较结果来调整 `xl` 和 `xr` 的值，
-            # 从而逐步缩小搜索范围，直到找到满足条件的 `xm` 值或者达到最大迭代次数。
-            xm = (xl + xr) / 2
-            if math.fabs(xr - xl) <= self.epslv:
-                # 如果当前 `xr` 和 `xl` 的差值的绝对值小于等于用户设置的 `self.epslv` 值，说明已经找到了满足精度要求的 `xm` 值，
-                # 此时就可以跳出循环，进入下一步的计算。
-                break
-            else:
-                y = math.exp(xm)
-                f = (1 - D * xm) * y + (D - 1) * xm - 1
-                if f > self.epslv:
-                    # 如果计算得到的函数值 `f` 大于 `self.epslv`，说明当前的 `xm` 值使得函数值偏大，
-                    # 所以将 `xl` 更新为当前的 `xm` 值，以便在下一次迭代中缩小搜索范围，让函数值更接近目标范围。
-                    xl = xm
-                elif f < -self.epslv:
-                    # 如果计算得到的函数值 `f` 小于负的 `self.epslv`，说明当前的 `xm` 值使得函数值偏小，
-                    # 所以将 `xr` 更新为当前的 `xm` 值，同样是为了在下一次迭代中调整搜索范围，使函数值更符合要求。
-                    xr = xm
-                else:
-                    # 如果函数值 `f` 在 `[-self.epslv, self.epslv]` 范围内，说明已经找到了满足精度要求的 `xm` 值，
-                    # 直接跳出循环，不再进行后续的迭代调整。
-                    break
-
-            iteration_count += 1
-            if iteration_count >= max_iterations:
-                # 在每次迭代过程中，会记录迭代的次数。如果迭代次数达到了设置的最大迭代次数 `max_iterations`（这里设置为1000次），
-                # 说明可能由于数据问题或者算法本身的原因，没有在规定的迭代次数内找到满足精度要求的 `xm` 值。
-                # 此时会打印提示信息，告知用户可能需要检查数据或算法，然后直接返回，不再继续计算。
-                print("达到最大迭代次数，可能未收敛，请检查数据或算法。")
-                return
+        # 步骤2、3：在[xl, xr]内求方程 (1 - D*xm)*e^xm + (D-1)*xm - 1 = 0 的根。
+        # 区间宽度精度xtol和残差精度ftol未单独设置时都取epslv。
+        xtol, ftol = self._tolerances()
+        warm_evaluations = 0
+        if x0 is not None:
+            # 热启动：在上一次的根附近搜索变号区间
+            xl, xr, warm_evaluations = warm_bracket(stats.go_function, x0, xl, xr, max(x0 * 1e-3, xtol))
+        result = solve(self.solver, stats.go_function, xl, xr, xtol, ftol,
+                       self.max_iterations, df=stats.go_derivative, x0=x0)
+        self.iterations = result.iterations
+        self.evaluations = result.evaluations + warm_evaluations
+        self.residual = result.residual
+        self.converged = result.converged
+        if not result.converged:
+            # 区间不变号或达到最大迭代次数仍未满足精度要求，发出警告并不再继续计算。
+            warnings.warn(f"{result.reason}，请检查数据或算法。", ConvergenceWarning)
+            self.a = self.b = 0
+            return
+        xm = result.root
 
         # 步骤4
         b = xm / tn
         ahelp = math.exp(-b * tn)
         a = N / (1 - ahelp)
 
-        # 在通过上述迭代过程找到满足精度要求的 `xm` 值后，就可以根据模型的公式计算出关键参数 `a` 和 `b` 的值。
         # 首先计算 `b` 值，它是 `xm` 与最后一个故障时间 `tn` 的比值。然后通过 `b` 值计算出 `ahelp`，再根据 `ahelp` 和数据长度 `N` 计算出 `a` 值。
-        # 最后将计算得到的 `a` 和 `b` 值分别赋值给 `self.a` 和 `self.b`，以便在类的其他方法中可以使用这些计算出来的关键参数。
         self.a = a
         self.b = b
 
@@ -147,16 +229,3 @@ class GOModel:
         MTBF = 1 / self.b
         # print(f"MTBF: {MTBF}")
         return MTBF
-
-    def calculate_failure_rate_mean(self):
-        """
-        计算GO模型的失效率均值。
-        :return: 失效率均值。
-        """
-        N = len(self.t)
-        failure_rate_sum = 0
-        for i in range(0, N):
-            failure_rate_sum += self.a * self.b * math.exp(-self.b * self.t[i])
-        failure_rate_mean = failure_rate_sum / N
-        # print(f"失效率均值: {failure_rate_mean}")
-        return failure_rate_mean
\ No newline at end of file
@@ -1,19 +1,33 @@
-from typing import List
+from typing import Dict, List, Union
+import warnings
 import matplotlib.pyplot as plt
+import numpy as np
+from stats import FailureStats
+from loader import load_failure_times
+from solver import ConvergenceWarning, solve
+from curves import DEFAULT_CHUNK_SIZE, evaluate_curves
 
 class JMModel:
     def __init__(self):
         """
         初始化JMModel类的实例。
 
-        该方法设置了类的初始状态，包括时间列表t、参数ex和ey、根值root、初始故障数N0和故障强度Fi。
+        该方法设置了类的初始状态，包括时间列表t、参数ex和ey、根值root、初始故障数N0和故障强度Fi，
+        以及求根方法和求根统计信息。
         """
-        self.t = []  # 存储故障时间的列表，初始为空列表
+        self.t = []  # 存储故障时间的列表（由read_data读取时为数组），初始为空列表
         self.ex = None  # 参数ex，初始值为None
         self.ey = None  # 参数ey，初始值为None
         self.root = 0  # 用于计算的根值，初始值为0
         self.N0 = 0  # 初始故障数，初始值为0
         self.Fi = 0  # 故障强度，初始值为0
+        self.stats = None  # 故障数据的充分统计量，在calculate中一次性计算
+        self.solver = "bisection"  # 求根方法，可选"bisection"、"newton"、"illinois"、"brent"
+        self.max_iterations = 1000  # 最大迭代次数
+        self.iterations = 0  # 求根迭代次数（不含区间扩展）
+        self.evaluations = 0  # 函数求值次数（含区间扩展）
+        self.residual = None  # 根处的函数值
+        self.converged = None  # 是否收敛
 
     def getP(self, lst: List[float]) -> float:
         """
@@ -22,15 +36,7 @@ class JMModel:
         :param lst: 故障时间列表。
         :return: 累积故障数。
         """
-        result = 0
-        n = len(lst)
-        for i in range(1, n):
-            t1 = lst[i]
-            t2 = lst[i - 1]
-            result += (i - 1) * (t1 - t2)
-        tn = lst[-1]
-        result /= tn
-        return result
+        return FailureStats(lst).P
 
     def function(self, lst: List[float], N: float) -> float:
         """
@@ -40,24 +46,18 @@ class JMModel:
         :param N: 待计算的N值。
         :return: 函数值。
         """
-        result = 0
-        n = len(lst)
-        P = self.getP(lst)
-        for i in range(1, n):
-            result += 1 / (N - i + 1)
-        result -= (n - 1) / (N - P)
-        return result
+        return FailureStats(lst).jm_function(N)
 
-    def read_data(self):
+    def read_data(self, path: Union[str, List[str]] = "test.txt"):
         """
         从文件中读取故障数据。
 
-        该方法从名为"test.txt"的文件中读取故障数据，并将故障时间存储在t列表中。
+        该方法从"故障序号 故障时间"格式的文件（默认为"test.txt"，可为多个文件或.gz压缩文件）中批量读取故障数据，
+        并将故障时间数组存储在t中。解析结果会缓存为.npy文件，数据文件未变化时直接加载缓存。
+
+        :param path: 文件路径或文件路径列表。
         """
-        with open("test.txt", 'r') as input_file:
-            for line in input_file:
-                failure_Number, Timetofailure = map(int, line.strip().split())
-                self.t.append(float(Timetofailure))
+        self.t = load_failure_times(path)
 
     def set_ex_ey(self):
         """
@@ -68,57 +68,132 @@ class JMModel:
         self.ex = float(input("请输入ex的值："))
         self.ey = float(input("请输入ey的值："))
 
-    def calculate(self):
+    def calculate(self, stats: FailureStats = None):
         """
         计算N0和Fi的值。
 
-        该方法根据读取的故障数据和设置的ex、ey值，计算N0和Fi的值。
+        该方法根据读取的故障数据和设置的ex、ey值，按self.solver指定的求根方法计算N0和Fi的值，
+        并将迭代次数、函数求值次数、最终残差和是否收敛记录在模型上。
+
+        :param stats: 已根据t计算好的充分统计量，为None时根据t计算。多个模型可共享同一份统计量。
         """
-        n = len(self.t)
+        self.stats = stats if stats is not None else FailureStats(self.t)  # 一次性计算P、tn和加权间隔和，后续每次迭代为O(1)
+        self._fit()
 
-        P = self.getP(self.t)
-        # print(f"当ex={self.ex},ey={self.ey}时")
+    def append_failure(self, t: float):
+        """
+        追加一个新的故障时间并重新计算N0和Fi。
+
+        该方法以O(1)的代价更新P值所依赖的累加量，并以上一次求得的root为起点热启动区间搜索和求根，
+        因此每次追加故障后的重新拟合近似为常数时间。新故障时间早于最后一个故障时间时（数据不是单调递增的），
+        按完整数据重新计算统计量并从头求解。
 
-        # 以下是根据P值与((n - 1) / 2)的比较结果来确定后续计算的初始边界值left和right
-        if P > ((n - 1) / 2):
-            left = n - 1
-            right = n
+        :param t: 新的故障时间。
+        """
+        x0 = self.root if self.stats is not None and self.root > 0 else None
+        if self.stats is not None and self.stats.n == len(self.t) and t >= self.stats.tn:
+            self.stats.append(float(t))
+            if isinstance(self.t, list):
+                self.t.append(float(t))
+            else:
+                self.t = self.stats.t  # t为数组时直接使用统计量缓冲区的视图，避免整体复制
         else:
-            return  # 如果P不满足大于((n - 1) / 2)的条件，则直接返回，不进行后续复杂计算。
+            # 没有统计量或新故障时间早于tn（数据非递增）时，按完整数据重新计算统计量并从头求解
+            self.t = list(self.t) + [float(t)]
+            self.stats = FailureStats(self.t)
+            x0 = None
+        self._fit(x0)
 
-        # 以下循环用于通过不断调整right的值，使得function(self.t, right) <= self.ey
-        while self.function(self.t, right) > self.ey:
-            left = right
-            right += 1
+    def _bracket(self, start: int):
+        """
+        寻找使function(self.t, right) <= self.ey的最小整数right（right >= n）。
 
-        # 经过上述循环后，根据function(self.t, right)与self.ex的比较结果，确定self.root的值
-        if self.function(self.t, right) >= self.ex:
-            self.root = right
-        else:
+        从start出发以倍增步长向两侧搜索，再按整数二分定位，结果与从n开始逐一递增right的搜索方式相同。
+
+        :param start: 搜索起点。
+        :return: (left, right, evaluations)，其中left = right - 1。
+        """
+        stats = self.stats
+        n = stats.n
+        lo = n - 1  # 已知function > ey的最大整数（n-1为约定的左边界）
+        right = max(start, n)
+        evaluations = 1
+        step = 1
+        if stats.jm_function(right) > self.ey:
+            lo = right
             while True:
-                # 以下是一个二分查找类似的循环，用于更精确地确定self.root的值，使得function(self.t, self.root)在一定误差范围内满足条件
-                if abs(right - left) < self.ex:
-                    self.root = (right + left) / 2
+                right = lo + step
+                evaluations += 1
+                if stats.jm_function(right) <= self.ey:
                     break
-                self.root = (right + left) / 2
-                if self.function(self.t, self.root) > self.ey:
-                    left = self.root
-                else:
-                    if self.function(self.t, self.root) < (-self.ey):
-                        right = self.root
-                    else:
-                        break
+                lo = right
+                step *= 2
+        else:
+            while right > n:
+                candidate = max(right - step, n)
+                evaluations += 1
+                if stats.jm_function(candidate) > self.ey:
+                    lo = candidate
+                    break
+                right = candidate
+                step *= 2
+        while right - lo > 1:
+            mid = (lo + right) // 2
+            evaluations += 1
+            if stats.jm_function(mid) > self.ey:
+                lo = mid
+            else:
+                right = mid
+        return right - 1, right, evaluations
+
+    def _fit(self, x0: float = None):
+        """
+        根据当前的充分统计量求解N0并计算Fi。
+
+        :param x0: N0的初始猜测，不为None时从其附近开始搜索区间。
+        """
+        stats = self.stats
+        n = stats.n
+
+        P = stats.P
+        # print(f"当ex={self.ex},ey={self.ey}时")
+
+        # 以下是根据P值与((n - 1) / 2)的比较结果来确定是否继续计算
+        if not P > ((n - 1) / 2):
+            # 如果P不满足大于((n - 1) / 2)的条件，则直接返回，不进行后续复杂计算。
+            # 追加故障后可能由有解变为无解，此时清除上一次的结果。
+            self.root = self.N0 = self.Fi = 0
+            self.converged = None
+            return
+
+        # 确定满足function(self.t, right) <= self.ey的最小整数right，以及left = right - 1
+        left, right, evaluations = self._bracket(n if x0 is None else int(x0))
+
+        # 根据function(self.t, right)与self.ex的比较结果，确定self.root的值
+        residual = stats.jm_function(right)
+        evaluations += 1
+        if residual >= self.ex:
+            self.root = right
+            self.iterations = 0
+            self.converged = True
+        else:
+            # 在[left, right]内按self.solver指定的求根方法确定self.root的值，使得function(self.t, self.root)在一定误差范围内满足条件
+            result = solve(self.solver, stats.jm_function, left, right, self.ex, self.ey,
+                           self.max_iterations, df=stats.jm_derivative, x0=x0)
+            self.root = result.root
+            self.iterations = result.iterations
+            evaluations += result.evaluations
+            residual = result.residual
+            self.converged = result.converged
+        self.evaluations = evaluations
+        self.residual = residual
+        if not self.converged:
+            warnings.warn(f"{result.reason}，请检查数据或算法。", ConvergenceWarning)
 
         # 至此，已经确定了self.root的值，接下来根据已确定的值以及之前读取的故障时间数据来计算N0和Fi
 
         self.N0 = self.root
-        sum_val = 0
-        tn = self.t[-1]
-        for i in range(1, n):
-            t1 = self.t[i]
-            t2 = self.t[i - 1]
-            sum_val += (i - 1) * (t1 - t2)
-        self.Fi = (n - 1) / (self.N0 * tn - sum_val)
+        self.Fi = stats.jm_Fi(self.N0)
 
     def print_results(self):
         """
@@ -144,14 +219,61 @@ class JMModel:
         """
         计算JM模型的失效率均值。
 
+        第i个故障间隔内的失效率为Fi*(n - (i - 1))，按间隔长度加权求和后除以最后一个故障时间。
+
         :return: 失效率均值。
         """
-        n = len(self.t)
-        failure_rate_sum = 0
-        for i in range(1, n):
-            t1 = self.t[i]
-            t2 = self.t[i - 1]
-            failure_rate_sum += self.Fi * (n - (i - 1)) * (t1 - t2)
-        failure_rate_mean = failure_rate_sum / (self.t[-1])
+        t = np.asarray(self.t, dtype=float)
+        n = len(t)
+        failure_rate_sum = self.Fi * np.dot(n - np.arange(n - 1), np.diff(t))
+        failure_rate_mean = failure_rate_sum / t[-1]
         # print(f"失效率均值: {failure_rate_mean}")
-        return failure_rate_mean
\ No newline at end of file
+        return float(failure_rate_mean)
+
+    def mean_value(self, t: np.ndarray) -> np.ndarray:
+        """
+        计算JM模型的均值函数m(t) = N0*(1 - e^(-Fi*t))，即到时刻t为止的期望累积故障数。
+
+        :param t: 时间数组。
+        :return: 均值函数数组。
+        """
+        return self.N0 * -np.expm1(-self.Fi * np.asarray(t, dtype=float))
+
+    def intensity(self, t: np.ndarray) -> np.ndarray:
+        """
+        计算JM模型的失效强度λ(t) = N0*Fi*e^(-Fi*t)。
+
+        :param t: 时间数组。
+        :return: 失效强度数组。
+        """
+        return self.N0 * self.Fi * np.exp(-self.Fi * np.asarray(t, dtype=float))
+
+    def log_likelihood(self, stats: FailureStats = None) -> float:
+        """
+        计算当前N0、Fi下故障间隔的对数似然，见FailureStats.jm_log_likelihood。
+
+        :param stats: 故障数据的充分统计量，为None时使用self.stats，两者都没有时根据t计算。
+        :return: 对数似然值。
+        """
+        stats = stats if stats is not None else self.stats if self.stats is not None else FailureStats(self.t)
+        return stats.jm_log_likelihood(self.N0, self.Fi)
+
+    def expected_total_failures(self) -> float:
+        """
+        计算JM模型的期望总故障数，即初始故障数N0。
+
+        :return: 期望总故障数。
+        """
+        return float(self.N0)
+
+    def curves(self, t: np.ndarray, x: np.ndarray = None,
+               chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, np.ndarray]:
+        """
+        在时间网格上计算均值函数、失效强度、期望剩余故障数以及条件可靠度R(x|t)。
+
+        :param t: 时间网格。
+        :param x: 任务时长，可为标量或数组，为None时不计算条件可靠度。
+        :param chunk_size: 每块的元素数上限。
+        :return: 见curves.evaluate_curves。
+        """
+        return evaluate_curves(self, t, x, chunk_size)
@@ -0,0 +1,82 @@
+import numpy as np
+from nhpp import NHPPModel
+from stats import FailureStats
+
+
+class MOModel(NHPPModel):
+    name = "MO"
+
+    def __init__(self):
+        """
+        初始化MOModel类的实例。
+
+        Musa-Okumoto对数泊松模型：m(t) = a*ln(1 + b*t)，λ(t) = a*b/(1 + b*t)。
+        """
+        super().__init__()
+
+    def mean_value(self, t: np.ndarray) -> np.ndarray:
+        """
+        计算MO模型的均值函数m(t) = a*ln(1 + b*t)。
+
+        :param t: 时间数组。
+        :return: 均值函数数组。
+        """
+        return self.a * np.log1p(self.b * np.asarray(t, dtype=float))
+
+    def intensity(self, t: np.ndarray) -> np.ndarray:
+        """
+        计算MO模型的失效强度λ(t) = a*b/(1 + b*t)。
+
+        :param t: 时间数组。
+        :return: 失效强度数组。
+        """
+        return self.a * self.b / (1 + self.b * np.asarray(t, dtype=float))
+
+    def shape(self, z: np.ndarray) -> np.ndarray:
+        """
+        计算MO模型的形状函数G(z) = ln(1 + z)。
+
+        :param z: 无量纲时间b*t。
+        :return: G(z)。
+        """
+        return np.log1p(np.asarray(z, dtype=float))
+
+    def shape_derivative(self, z: np.ndarray) -> np.ndarray:
+        """
+        计算MO模型形状函数的导数G'(z) = 1/(1 + z)。
+
+        :param z: 无量纲时间b*t。
+        :return: G'(z)。
+        """
+        return 1 / (1 + np.asarray(z, dtype=float))
+
+    def expected_total_failures(self) -> float:
+        """
+        MO模型的均值函数无上界，期望总故障数为无穷大。
+
+        :return: 无穷大。
+        """
+        return float("inf")
+
+    def a_from_x(self, stats: FailureStats, x: float) -> float:
+        """
+        给定x = b*tn时a的极大似然估计a = n/ln(1 + x)。
+
+        :param stats: 故障数据的充分统计量。
+        :param x: 无量纲参数x = b*tn。
+        :return: 参数a。
+        """
+        return stats.n / np.log1p(x)
+
+    def score(self, stats: FailureStats, x: float) -> float:
+        """
+        MO模型归一化的似然方程 1/x - mean(u_i/(1 + x*u_i)) - 1/((1 + x)*ln(1 + x))，其中u_i = t_i/tn。
+
+        该方程不能化为充分统计量，每次求值对故障时间数组做一次向量化计算。
+
+        :param stats: 故障数据的充分统计量。
+        :param x: 无量纲参数x = b*tn。
+        :return: 归一化的似然方程函数值。
+        """
+        u = stats.t / stats.tn
+        return 1 / x - float(np.mean(u / (1 + x * u))) - 1 / ((1 + x) * np.log1p(x))
@@ -0,0 +1,78 @@
+import math
+import numpy as np
+from nhpp import NHPPModel
+from stats import FailureStats
+
+
+class SModel(NHPPModel):
+    name = "S型"
+
+    def __init__(self):
+        """
+        初始化SModel类的实例。
+
+        Yamada延迟S型模型：m(t) = a*(1 - (1 + b*t)*e^(-b*t))，λ(t) = a*b^2*t*e^(-b*t)。
+        """
+        super().__init__()
+
+    def mean_value(self, t: np.ndarray) -> np.ndarray:
+        """
+        计算S型模型的均值函数m(t) = a*(1 - (1 + b*t)*e^(-b*t))。
+
+        :param t: 时间数组。
+        :return: 均值函数数组。
+        """
+        bt = self.b * np.asarray(t, dtype=float)
+        return self.a * (-np.expm1(-bt) - bt * np.exp(-bt))
+
+    def intensity(self, t: np.ndarray) -> np.ndarray:
+        """
+        计算S型模型的失效强度λ(t) = a*b^2*t*e^(-b*t)。
+
+        :param t: 时间数组。
+        :return: 失效强度数组。
+        """
+        t = np.asarray(t, dtype=float)
+        return self.a * self.b ** 2 * t * np.exp(-self.b * t)
+
+    def shape(self, z: np.ndarray) -> np.ndarray:
+        """
+        计算S型模型的形状函数G(z) = 1 - (1 + z)*e^(-z)。
+
+        :param z: 无量纲时间b*t。
+        :return: G(z)。
+        """
+        z = np.asarray(z, dtype=float)
+        return -np.expm1(-z) - z * np.exp(-z)
+
+    def shape_derivative(self, z: np.ndarray) -> np.ndarray:
+        """
+        计算S型模型形状函数的导数G'(z) = z*e^(-z)。
+
+        :param z: 无量纲时间b*t。
+        :return: G'(z)。
+        """
+        z = np.asarray(z, dtype=float)
+        return z * np.exp(-z)
+
+    def a_from_x(self, stats: FailureStats, x: float) -> float:
+        """
+        给定x = b*tn时a的极大似然估计a = n/(1 - (1 + x)*e^(-x))。
+
+        :param stats: 故障数据的充分统计量。
+        :param x: 无量纲参数x = b*tn。
+        :return: 参数a。
+        """
+        return stats.n / (-math.expm1(-x) - x * math.exp(-x))
+
+    def score(self, stats: FailureStats, x: float) -> float:
+        """
+        S型模型归一化的似然方程 2/x - sum(t_i)/(n*tn) - x*e^(-x)/(1 - (1 + x)*e^(-x))。
+
+        只依赖充分统计量，每次求值为O(1)。
+
+        :param stats: 故障数据的充分统计量。
+        :param x: 无量纲参数x = b*tn。
+        :return: 归一化的似然方程函数值。
+        """
+        return 2 / x - stats.total_sum / (stats.n * stats.tn) - x * math.exp(-x) / (-math.expm1(-x) - x * math.exp(-x))
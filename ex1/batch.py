@@ -0,0 +1,204 @@
+from typing import Dict, Sequence, Tuple
+import numpy as np
+from scipy.special import digamma
+
+
+def pack(datasets: Sequence[Sequence[float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    将多组故障时间打包为偏移量数组和扁平数组。
+
+    :param datasets: 多组故障时间，每组对应一个组件的故障数据。
+    :return: (offsets, values)，第k组数据为values[offsets[k]:offsets[k + 1]]。
+    """
+    lengths = np.array([len(d) for d in datasets], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    values = np.concatenate([np.asarray(d, dtype=float) for d in datasets])
+    return offsets, values
+
+
+class BatchFailureStats:
+    def __init__(self, offsets: np.ndarray, values: np.ndarray):
+        """
+        初始化BatchFailureStats类的实例。
+
+        该方法对不规则的多组故障时间（offsets + 扁平数组）一次性计算每组的充分统计量，
+        与FailureStats逐组计算的结果一致，但全程为数组运算，没有逐组的Python循环。
+        每组至少需要包含两个故障时间。
+
+        :param offsets: 长度为组数+1的偏移量数组。
+        :param values: 所有组的故障时间拼接成的扁平数组。
+        """
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.values = np.asarray(values, dtype=float)
+        starts = self.offsets[:-1]
+        ends = self.offsets[1:]
+        self.n = ends - starts  # 每组的故障数
+        if np.any(self.n < 2):
+            raise ValueError("每组故障数据至少需要包含两个故障时间。")
+
+        self.group = np.repeat(np.arange(len(self.n)), self.n)  # 每个故障时间所属的组号
+        local = np.arange(len(self.values)) - np.repeat(starts, self.n)  # 组内序号i
+
+        self.t0 = self.values[starts]  # 每组第一个故障时间
+        self.tn = self.values[ends - 1]  # 每组最后一个故障时间
+
+        # 组内间隔t_i - t_{i-1}，每组第一个元素没有前驱，记为0
+        diffs = np.zeros_like(self.values)
+        diffs[1:] = np.diff(self.values)
+        diffs[local == 0] = 0
+        self.weighted_sum = np.add.reduceat((local - 1) * diffs, starts)
+        self.P = self.weighted_sum / self.tn
+
+        self.time_sum = np.add.reduceat(self.values, starts) - self.t0
+        self.D = self.time_sum / self.tn / self.n
+
+    def jm_function(self, N: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        """
+        对指定的若干组同时计算JM模型似然方程的函数值。
+
+        :param N: 每组待计算的N值。
+        :param idx: 组号数组，与N一一对应。
+        :return: 函数值数组。
+        """
+        n = self.n[idx]
+        harmonic = digamma(N + 1) - digamma(N - n + 2)
+        return harmonic - (n - 1) / (N - self.P[idx])
+
+
+def go_function(D: np.ndarray, xm: np.ndarray) -> np.ndarray:
+    """
+    计算GO模型方程(1 - D*xm)*e^xm + (D-1)*xm - 1的函数值。
+
+    :param D: D值数组。
+    :param xm: 待计算的xm数组。
+    :return: 函数值数组。
+    """
+    return (1 - D * xm) * np.exp(xm) + (D - 1) * xm - 1
+
+
+def fit_jm_batch(offsets: np.ndarray, values: np.ndarray, ex: float, ey: float,
+                 stats: BatchFailureStats = None) -> Dict[str, np.ndarray]:
+    """
+    批量拟合JM模型。
+
+    所有组的求根同时进行：先以倍增步长向右扩展区间，再按整数二分找到与逐一递增扩展相同的
+    [left, right]，最后按与JMModel.calculate相同的ex、ey终止条件做数组化的二分查找。
+    不满足P > (n-1)/2的组结果为NaN。
+
+    :param offsets: 长度为组数+1的偏移量数组。
+    :param values: 所有组的故障时间拼接成的扁平数组。
+    :param ex: 区间宽度精度。
+    :param ey: 函数值精度。
+    :param stats: 已计算好的BatchFailureStats，为None时根据offsets和values计算。
+    :return: 包含N0、Fi、MTBF和失效率均值(failure_rate_mean)数组的字典。
+    """
+    if stats is None:
+        stats = BatchFailureStats(offsets, values)
+    n = stats.n.astype(float)
+    root = np.full(len(n), np.nan)
+
+    # 不满足P > (n-1)/2的组无解
+    idx = np.flatnonzero(stats.P > (n - 1) / 2)
+    left = n[idx] - 1
+    right = n[idx].copy()
+    step = np.ones(len(idx))
+
+    # 向右扩展区间，直到function(right) <= ey
+    active = np.arange(len(idx))
+    while len(active):
+        f = stats.jm_function(right[active], idx[active])
+        active = active[f > ey]
+        left[active] = right[active]
+        right[active] += step[active]
+        step[active] *= 2
+
+    # 在(left, right]内按整数二分，找到使function(right) <= ey的最小整数right，
+    # 结果与JMModel.calculate中逐一递增right的扩展方式相同
+    active = np.flatnonzero(right - left > 1)
+    while len(active):
+        mid = np.floor((left[active] + right[active]) / 2)
+        high = stats.jm_function(mid, idx[active]) > ey
+        left[active[high]] = mid[high]
+        right[active[~high]] = mid[~high]
+        active = active[right[active] - left[active] > 1]
+
+    # 与JMModel.calculate一致：若function(right) >= ex，直接取right为根
+    f = stats.jm_function(right, idx)
+    done = f >= ex
+    root[idx[done]] = right[done]
+
+    # 与solver中的求根方法一致：区间端点函数值同号时不迭代，取|f|较小的端点
+    active = np.flatnonzero(~done)
+    fl = stats.jm_function(left[active], idx[active])
+    fr = f[active]
+    stuck = fl * fr > 0
+    pick_left = np.abs(fl) <= np.abs(fr)
+    root[idx[active[stuck]]] = np.where(pick_left, left[active], right[active])[stuck]
+    active = active[~stuck]
+
+    # 其余各组同时二分查找
+    while len(active):
+        mid = (left[active] + right[active]) / 2
+        narrow = np.abs(right[active] - left[active]) < ex
+        f = stats.jm_function(mid, idx[active])
+        found = narrow | (np.abs(f) <= ey)
+        root[idx[active[found]]] = mid[found]
+
+        keep = ~found
+        active, mid, f = active[keep], mid[keep], f[keep]
+        high = f > ey
+        left[active[high]] = mid[high]
+        right[active[~high]] = mid[~high]
+
+    Fi = (n - 1) / (root * stats.tn - stats.weighted_sum)
+    failure_rate_mean = Fi * (n * (stats.tn - stats.t0) - stats.weighted_sum) / stats.tn
+    return {"N0": root, "Fi": Fi, "MTBF": 1 / Fi, "failure_rate_mean": failure_rate_mean}
+
+
+def fit_go_batch(offsets: np.ndarray, values: np.ndarray, epslv: float,
+                 max_iterations: int = 1000,
+                 stats: BatchFailureStats = None) -> Dict[str, np.ndarray]:
+    """
+    批量拟合GO模型。
+
+    所有组的xm按与GOModel.calculate相同的初始区间和epslv终止条件同时二分查找。
+    不满足0 < D < 0.5或达到最大迭代次数仍未收敛的组结果为NaN。
+
+    :param offsets: 长度为组数+1的偏移量数组。
+    :param values: 所有组的故障时间拼接成的扁平数组。
+    :param epslv: 精度参数。
+    :param max_iterations: 最大迭代次数。
+    :param stats: 已计算好的BatchFailureStats，为None时根据offsets和values计算。
+    :return: 包含a、b、MTBF和失效率均值(failure_rate_mean)数组的字典。
+    """
+    if stats is None:
+        stats = BatchFailureStats(offsets, values)
+    D = stats.D
+    xm_root = np.full(len(D), np.nan)
+
+    idx = np.flatnonzero((D > 0) & (D < 0.5))
+    xl = (1 - 2 * D[idx]) / 2
+    xr = 1 / D[idx]
+
+    active = np.arange(len(idx))
+    for _ in range(max_iterations):
+        if not len(active):
+            break
+        xm = (xl[active] + xr[active]) / 2
+        narrow = np.abs(xr[active] - xl[active]) <= epslv
+        f = go_function(D[idx[active]], xm)
+        found = narrow | (np.abs(f) <= epslv)
+        xm_root[idx[active[found]]] = xm[found]
+
+        keep = ~found
+        active, xm, f = active[keep], xm[keep], f[keep]
+        high = f > epslv
+        xl[active[high]] = xm[high]
+        xr[active[~high]] = xm[~high]
+
+    b = xm_root / stats.tn
+    a = stats.n / (1 - np.exp(-xm_root))
+    # 失效率均值：每组sum(a*b*exp(-b*t_i))/n
+    decay = np.add.reduceat(np.exp(-b[stats.group] * stats.values), stats.offsets[:-1])
+    failure_rate_mean = a * b * decay / stats.n
+    return {"a": a, "b": b, "MTBF": 1 / b, "failure_rate_mean": failure_rate_mean}
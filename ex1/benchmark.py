@@ -0,0 +1,188 @@
+from typing import Dict, List, Sequence
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+import warnings
+import numpy as np
+from JM import JMModel
+from GO import GOModel
+from loader import load_failure_times
+from solver import ConvergenceWarning
+
+STAGES = ["read", "fit", "MTBF", "failure_rate_mean"]  # 分别计时的各个阶段
+
+
+def simulate_jm(n: int, N0: float = None, Fi: float = 1e-3, seed: int = 0) -> np.ndarray:
+    """
+    按JM模型生成故障时间：第i个故障间隔服从参数为Fi*(N0-i)的指数分布。
+
+    :param n: 故障数。
+    :param N0: 初始故障数，要求N0 > n-1，为None时取1.2n。
+    :param Fi: 每个故障的失效强度。
+    :param seed: 随机种子。
+    :return: 递增的故障时间数组。
+    """
+    N0 = 1.2 * n if N0 is None else N0
+    rng = np.random.default_rng(seed)
+    return np.cumsum(rng.exponential(1 / (Fi * (N0 - np.arange(n)))))
+
+
+def simulate_go(n: int, b: float = 1e-3, x: float = 2.0, seed: int = 0) -> np.ndarray:
+    """
+    按GO模型生成故障时间：给定[0, T]内发生n次故障，故障时间为密度正比于b*e^(-b*t)的n个独立样本的次序统计量。
+
+    :param n: 故障数。
+    :param b: 参数b。
+    :param x: 观测区间长度T与1/b之比，即b*T。
+    :param seed: 随机种子。
+    :return: 递增的故障时间数组。
+    """
+    rng = np.random.default_rng(seed)
+    u = rng.uniform(size=n)
+    return np.sort(-np.log1p(-u * -np.expm1(-x)) / b)
+
+
+def write_failure_file(path: str, t: np.ndarray):
+    """
+    将故障时间写成"故障序号 故障时间"格式的文件。
+
+    :param path: 文件路径。
+    :param t: 故障时间数组。
+    """
+    np.savetxt(path, np.column_stack([np.arange(1, len(t) + 1), t]), fmt=["%d", "%.6f"])
+
+
+def _best_time(func, repeat: int) -> float:
+    """
+    重复执行func并返回最短耗时（秒）。
+
+    :param func: 无参数函数。
+    :param repeat: 重复次数。
+    :return: 最短耗时。
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_model(model_class, path: str, repeat: int = 3, **settings) -> Dict[str, float]:
+    """
+    对一个模型分别测量读取、拟合、MTBF和失效率均值四个阶段的耗时。
+
+    :param model_class: JMModel或GOModel。
+    :param path: 故障数据文件。
+    :param repeat: 每个阶段的重复次数，取最短耗时。
+    :param settings: 设置到模型上的属性，如ex、ey、epslv、solver。
+    :return: 各阶段耗时（秒）以及求根的函数求值次数。
+    """
+    model = model_class()
+    for key, value in settings.items():
+        setattr(model, key, value)
+
+    def read():
+        model.t = load_failure_times(path, cache=False)
+
+    result = {"read": _best_time(read, repeat)}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        result["fit"] = _best_time(model.calculate, repeat)
+    result["MTBF"] = _best_time(model.calculate_MTBF, repeat)
+    result["failure_rate_mean"] = _best_time(model.calculate_failure_rate_mean, repeat)
+    result["evaluations"] = model.evaluations
+    return result
+
+
+def run_benchmark(sizes: Sequence[int], repeat: int = 3, solver: str = "bisection", seed: int = 0) -> List[Dict]:
+    """
+    在不同规模的模拟数据上测量JM和GO模型各阶段的耗时。
+
+    JM模型使用JM模拟数据，GO模型使用GO模拟数据，数据文件写在临时目录中。
+
+    :param sizes: 故障数列表。
+    :param repeat: 每个阶段的重复次数。
+    :param solver: 求根方法。
+    :param seed: 随机种子。
+    :return: 每个(模型, 规模)一行的结果列表。
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n in sizes:
+            for name, model_class, simulate, settings in [
+                ("JM", JMModel, simulate_jm, {"ex": 1e-6, "ey": 1e-6}),
+                ("GO", GOModel, simulate_go, {"epslv": 1e-10}),
+            ]:
+                path = os.path.join(directory, f"{name}_{n}.txt")
+                write_failure_file(path, simulate(n, seed=seed))
+                result = benchmark_model(model_class, path, repeat, solver=solver, **settings)
+                rows.append({"model": name, "size": n, "solver": solver, **result})
+                os.remove(path)
+    return rows
+
+
+def compare_baseline(rows: List[Dict], baseline: List[Dict], tolerance: float = 0.2) -> List[str]:
+    """
+    与基线结果比较，找出耗时超过基线(1 + tolerance)倍的阶段。
+
+    :param rows: 本次的结果。
+    :param baseline: 基线结果。
+    :param tolerance: 允许的相对变慢比例。
+    :return: 性能回退的描述列表。
+    """
+    reference = {(row["model"], row["size"], row["solver"]): row for row in baseline}
+    regressions = []
+    for row in rows:
+        old = reference.get((row["model"], row["size"], row["solver"]))
+        if old is None:
+            continue
+        for stage in STAGES:
+            if row[stage] > old[stage] * (1 + tolerance):
+                regressions.append(f"{row['model']} n={row['size']} {stage}: "
+                                   f"{old[stage]:.6f}s -> {row[stage]:.6f}s")
+    return regressions
+
+
+def print_rows(rows: List[Dict]):
+    """
+    以表格形式打印基准测试结果。
+
+    :param rows: run_benchmark返回的结果。
+    """
+    columns = ["model", "size"] + STAGES + ["evaluations"]
+    print(" ".join(f"{column:>18}" for column in columns))
+    for row in rows:
+        print(" ".join(f"{row[column]:>18}" if isinstance(row[column], str) else f"{row[column]:>18.6g}"
+                       for column in columns))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JM、GO模型的规模基准测试")
+    parser.add_argument("--sizes", nargs="+", type=float, default=[1e3, 1e4, 1e5], help="故障数")
+    parser.add_argument("--repeat", type=int, default=3, help="每个阶段的重复次数")
+    parser.add_argument("--solver", default="bisection", help="求根方法")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--output", default=None, help="将结果保存为JSON基线文件")
+    parser.add_argument("--baseline", default=None, help="与该JSON基线文件比较")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="允许的相对变慢比例")
+    args = parser.parse_args()
+
+    rows = run_benchmark([int(n) for n in args.sizes], args.repeat, args.solver, args.seed)
+    print_rows(rows)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump({"python": platform.python_version(), "numpy": np.__version__, "results": rows},
+                      output_file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as input_file:
+            regressions = compare_baseline(rows, json.load(input_file)["results"], args.tolerance)
+        if regressions:
+            print("性能回退：")
+            for line in regressions:
+                print(line)
+        else:
+            print("与基线相比没有性能回退。")
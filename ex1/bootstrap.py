@@ -0,0 +1,158 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Sequence, Tuple
+import warnings
+import numpy as np
+from batch import fit_go_batch, fit_jm_batch
+
+PARAMETERS = ["N0", "Fi", "jm_MTBF", "a", "b", "go_MTBF"]  # 给出置信区间的参数
+MODEL_PARAMETERS = {"jm": ("N0", "Fi", "jm_MTBF"), "go": ("a", "b", "go_MTBF")}  # 各模型的参数
+
+
+class BootstrapWarning(UserWarning):
+    """
+    有效的重抽样样本比例过低，置信区间可能有偏。
+    """
+
+
+def _valid(result: Dict[str, np.ndarray], model: str) -> np.ndarray:
+    """
+    判断每个重抽样估计是否有效：参数均为有限值，且Fi>0（JM）或a>0、b>0（GO）。
+
+    :param result: 各参数的重抽样估计数组。
+    :param model: "jm"或"go"。
+    :return: 布尔数组。
+    """
+    valid = np.logical_and.reduce([np.isfinite(result[key]) for key in MODEL_PARAMETERS[model]])
+    if model == "jm":
+        return valid & (result["Fi"] > 0) & (result["N0"] > 0)
+    return valid & (result["a"] > 0) & (result["b"] > 0)
+
+
+def _fit_replicates(samples: np.ndarray, ex: float, ey: float, epslv: float,
+                    models: Sequence[str] = ("jm", "go")) -> Dict[str, np.ndarray]:
+    """
+    用批量求解器同时拟合一组等长的重抽样数据。
+
+    :param samples: 形状为(重复次数, n)的故障时间数组。
+    :param ex: JM模型的ex。
+    :param ey: JM模型的ey。
+    :param epslv: GO模型的epslv。
+    :param models: 需要拟合的模型，"jm"和/或"go"。
+    :return: 各参数的重抽样估计数组。
+    """
+    replicates, n = samples.shape
+    offsets = np.arange(0, replicates * n + 1, n)
+    values = samples.ravel()
+    result = {}
+    with np.errstate(all="ignore"):  # 个别重抽样样本无解时结果为NaN或inf，不逐一警告
+        if "jm" in models:
+            jm = fit_jm_batch(offsets, values, ex, ey)
+            result.update({"N0": jm["N0"], "Fi": jm["Fi"], "jm_MTBF": jm["MTBF"]})
+        if "go" in models:
+            go = fit_go_batch(offsets, values, epslv)
+            result.update({"a": go["a"], "b": go["b"], "go_MTBF": go["MTBF"]})
+    return result
+
+
+def _run_chunk(task: tuple) -> Dict[str, np.ndarray]:
+    """
+    生成并拟合一块重抽样数据，在进程池的子进程中执行。
+
+    :param task: (method, t, point, replicates, seed, ex, ey, epslv)。
+    :return: 各参数的重抽样估计数组。
+    """
+    method, t, point, replicates, seed, ex, ey, epslv = task
+    rng = np.random.default_rng(seed)
+    n = len(t)
+    models = ("jm", "go")
+    if method == "nonparametric":
+        # 对故障间隔时间有放回重抽样后累加为故障时间
+        gaps = np.diff(t, prepend=0.0)
+        samples = np.cumsum(rng.choice(gaps, size=(replicates, n)), axis=1)
+    elif method == "jm":
+        # JM模型：第i个故障间隔服从参数为Fi*(N0-i)的指数分布
+        rates = point["Fi"] * (point["N0"] - np.arange(n))
+        samples = np.cumsum(rng.exponential(1 / rates, size=(replicates, n)), axis=1)
+        models = ("jm",)
+    else:
+        # GO模型：给定[0, tn]内发生n次故障时，故障时间为密度正比于λ(t)的n个独立样本的次序统计量
+        b, tn = point["b"], t[-1]
+        u = rng.uniform(size=(replicates, n))
+        samples = np.sort(-np.log1p(-u * -np.expm1(-b * tn)) / b, axis=1)
+        models = ("go",)
+    return _fit_replicates(samples, ex, ey, epslv, models)
+
+
+def bootstrap(t: Sequence[float], ex: float, ey: float, epslv: float, replicates: int = 10000,
+              method: str = "nonparametric", level: float = 0.95, seed: int = 0, workers: int = None,
+              chunk_size: int = 1000, max_failure: float = 0.05) -> Dict[str, Tuple[float, float, int]]:
+    """
+    计算JM和GO模型参数及MTBF的自助法（bootstrap）百分位置信区间。
+
+    重抽样分块交给进程池执行，每块的随机种子由SeedSequence(seed)按块号派生，
+    因此结果只取决于seed和chunk_size，与进程数无关。无解或估计不符合物理意义（Fi≤0、b≤0等）的重抽样样本不计入区间；
+    失败比例超过max_failure时发出BootstrapWarning，因为剩下的样本只代表部分情形，区间可能有偏，全部失败时抛出ValueError。
+
+    :param t: 故障时间。
+    :param ex: JM模型的ex。
+    :param ey: JM模型的ey。
+    :param epslv: GO模型的epslv。
+    :param replicates: 重抽样次数。
+    :param method: "nonparametric"为对故障间隔重抽样；"parametric"为按拟合的JM、GO模型分别生成数据。
+    :param level: 置信水平。
+    :param seed: 随机种子。
+    :param workers: 并行进程数，为1时在当前进程中计算，为None时使用CPU核数。
+    :param chunk_size: 每块的重抽样次数。
+    :param max_failure: 允许的失败重抽样样本比例，超过时发出警告。
+    :return: 参数名称到(下限, 上限, 有效重抽样次数)的字典。
+    """
+    if method not in ("nonparametric", "parametric"):
+        raise ValueError(f"未知的重抽样方法：{method}，可选：nonparametric、parametric")
+    t = np.asarray(t, dtype=float)
+    point = {key: value[0] for key, value in _fit_replicates(t[np.newaxis, :], ex, ey, epslv).items()}
+    if method == "parametric" and not (np.isfinite(point["N0"]) and np.isfinite(point["b"])):
+        raise ValueError("原始数据无法拟合JM或GO模型，不能进行参数自助法。")
+
+    sizes = [chunk_size] * (replicates // chunk_size)
+    if replicates % chunk_size:
+        sizes.append(replicates % chunk_size)
+    methods = ["nonparametric"] if method == "nonparametric" else ["jm", "go"]
+    seeds = iter(np.random.SeedSequence(seed).spawn(len(sizes) * len(methods)))
+    tasks = [(m, t, point, size, next(seeds), ex, ey, epslv) for size in sizes for m in methods]
+
+    if workers == 1:
+        results = list(map(_run_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_run_chunk, tasks))
+
+    # 参数自助法中JM的参数只取JM模型生成的数据，GO的参数只取GO模型生成的数据
+    alpha = (1 - level) / 2 * 100
+    intervals = {}
+    for model, keys in MODEL_PARAMETERS.items():
+        source = [r for task, r in zip(tasks, results) if task[0] in ("nonparametric", model)]
+        estimates = {key: np.concatenate([r[key] for r in source]) for key in keys}
+        valid = _valid(estimates, model)
+        count = int(valid.sum())
+        if count == 0:
+            raise ValueError(f"{model.upper()}模型的{replicates}次重抽样全部拟合失败，无法计算置信区间。")
+        failure = 1 - count / len(valid)
+        if failure > max_failure:
+            warnings.warn(f"{model.upper()}模型有{failure:.0%}的重抽样拟合失败或估计不符合物理意义，"
+                          f"仅用{count}次有效重抽样计算区间，结果可能有偏。", BootstrapWarning)
+        for key in keys:
+            lower, upper = np.percentile(estimates[key][valid], [alpha, 100 - alpha])
+            intervals[key] = (float(lower), float(upper), count)
+    return intervals
+
+
+def print_intervals(intervals: Dict[str, Tuple[float, float, int]], level: float = 0.95):
+    """
+    打印置信区间。
+
+    :param intervals: bootstrap返回的置信区间。
+    :param level: 置信水平。
+    """
+    print(f"{level:.0%}置信区间：")
+    for key, (lower, upper, count) in intervals.items():
+        print(f"{key}: [{lower}, {upper}]（有效重抽样{count}次）")
@@ -1,49 +1,276 @@
 from JM import JMModel
 from GO import GOModel
+from MO import MOModel
+from S import SModel
+from stats import FailureStats
+from loader import load_failure_times
+from bootstrap import bootstrap, print_intervals
+from prequential import prequential, print_prequential
+from fitcache import FitCache
+from selection import CRITERIA, print_selection, select_models
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence
+import argparse
+import csv
+import itertools
 import os
+import time
 
-if __name__ == "__main__":
-    os.chdir(os.path.dirname(os.path.abspath(__file__)))
-    while True:
-        # 创建JMModel实例
-        jm_model = JMModel()
-        jm_model.read_data()
-        jm_model.set_ex_ey()
-        jm_model.calculate()
-        jm_model.print_results()
-        jm_model.calculate_MTBF()
-        jm_model.calculate_failure_rate_mean()
-
-        # 创建GOModel实例
-        go_model = GOModel()
-        go_model.read_data()
-        go_model.set_epslv()
-        go_model.calculate()
-        go_model.print_results()
-        go_model.calculate_MTBF()
-        go_model.calculate_failure_rate_mean()
-
-        # 计算并比较MTBF
-        jm_MTBF = jm_model.calculate_MTBF()
-        go_MTBF = go_model.calculate_MTBF()
-        print(f"JM模型MTBF: {jm_MTBF}")
-        print(f"GO模型MTBF: {go_MTBF}")
-        if jm_MTBF > go_MTBF:
-            print("在MTBF方面，JM模型表现更好。")
-        elif jm_MTBF < go_MTBF:
-            print("在MTBF方面，GO模型表现更好。")
-        else:
-            print("在MTBF方面，JM模型和GO模型表现相同。")
-
-        # 计算并比较失效率均值
-        jm_failure_rate_mean = jm_model.calculate_failure_rate_mean()
-        go_failure_rate_mean = go_model.calculate_failure_rate_mean()
-        print(f"JM模型失效率均值: {jm_failure_rate_mean}")
-        print(f"GO模型失效率均值: {go_failure_rate_mean}")
-
-        if jm_failure_rate_mean > go_failure_rate_mean:
-            print("在失效率均值方面，GO模型表现更好。")
-        elif jm_failure_rate_mean < go_failure_rate_mean:
-            print("在失效率均值方面，JM模型表现更好。")
+_STATS = None  # 子进程中共享的充分统计量，由_init_worker设置
+
+
+def _init_worker(stats: FailureStats):
+    """
+    进程池初始化函数：每个子进程只接收一次充分统计量，避免每个任务重复传输数据。
+
+    :param stats: 故障数据的充分统计量。
+    """
+    global _STATS
+    _STATS = stats
+
+
+def _fit_jm(setting: tuple) -> Dict[str, float]:
+    """
+    用共享的充分统计量按给定的(ex, ey, solver)拟合JM模型。
+
+    :param setting: (ex, ey, solver)。
+    :return: N0、Fi、MTBF、失效率均值和求根开销。
+    """
+    ex, ey, solver = setting
+    model = JMModel()
+    model.t = _STATS.t
+    model.ex, model.ey, model.solver = ex, ey, solver
+    start = time.perf_counter()
+    model.calculate(_STATS)
+    elapsed = time.perf_counter() - start
+    return {
+        "N0": model.N0, "Fi": model.Fi,
+        "jm_MTBF": model.calculate_MTBF() if model.Fi else float("nan"),
+        "jm_failure_rate_mean": model.calculate_failure_rate_mean(),
+        "jm_evaluations": model.evaluations, "jm_time": elapsed,
+    }
+
+
+def _fit_go(setting: tuple) -> Dict[str, float]:
+    """
+    用共享的充分统计量按给定的(epslv, solver)拟合GO模型。
+
+    :param setting: (epslv, solver)。
+    :return: a、b、MTBF、失效率均值和求根开销。
+    """
+    epslv, solver = setting
+    model = GOModel()
+    model.t = _STATS.t
+    model.epslv, model.solver = epslv, solver
+    start = time.perf_counter()
+    model.calculate(_STATS)
+    elapsed = time.perf_counter() - start
+    return {
+        "a": model.a, "b": model.b,
+        "go_MTBF": model.calculate_MTBF() if model.b else float("nan"),
+        "go_failure_rate_mean": model.calculate_failure_rate_mean(),
+        "go_evaluations": model.evaluations, "go_time": elapsed,
+    }
+
+
+def sweep(t: Sequence[float], ex_values: Sequence[float], ey_values: Sequence[float],
+          epslv_values: Sequence[float], solver: str = "bisection", workers: int = None) -> List[Dict[str, float]]:
+    """
+    在(ex, ey, epslv)网格上批量拟合JM和GO模型。
+
+    数据只读取和统计一次，所有设置共享同一份充分统计量。JM只依赖(ex, ey)、GO只依赖epslv，
+    因此两者分别按各自的设置拟合一次后再组合成网格上的结果，拟合任务分配到进程池并行执行。
+
+    :param t: 故障时间。
+    :param ex_values: ex的取值。
+    :param ey_values: ey的取值。
+    :param epslv_values: epslv的取值。
+    :param solver: 求根方法。
+    :param workers: 并行进程数，为1时在当前进程中计算，为None时使用CPU核数。
+    :return: 每个(ex, ey, epslv)设置一行的结果列表。
+    """
+    stats = FailureStats(t)
+    jm_settings = [(ex, ey, solver) for ex, ey in itertools.product(ex_values, ey_values)]
+    go_settings = [(epslv, solver) for epslv in epslv_values]
+    if workers == 1:
+        _init_worker(stats)
+        jm_results = list(map(_fit_jm, jm_settings))
+        go_results = list(map(_fit_go, go_settings))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(stats,)) as executor:
+            jm_futures = executor.map(_fit_jm, jm_settings)
+            go_futures = executor.map(_fit_go, go_settings)
+            jm_results, go_results = list(jm_futures), list(go_futures)
+
+    rows = []
+    for (ex, ey, _), jm in zip(jm_settings, jm_results):
+        for (epslv, _), go in zip(go_settings, go_results):
+            rows.append({"ex": ex, "ey": ey, "epslv": epslv, **jm, **go})
+    return rows
+
+
+def fit_all_models(t: Sequence[float], ex: float, ey: float, epslv: float,
+                   solver: str = None, cache: FitCache = None) -> Dict[str, object]:
+    """
+    基于同一份充分统计量拟合JM、GO、MO和S型四个模型。
+
+    :param t: 故障时间。
+    :param ex: JM模型的ex。
+    :param ey: JM模型的ey。
+    :param epslv: GO模型的epslv。
+    :param solver: 求根方法，为None时各模型使用各自的默认方法。
+    :param cache: 拟合结果缓存，为None时总是重新拟合。
+    :return: 模型名称到已拟合模型的字典。
+    """
+    stats = FailureStats(t)
+    jm_model, go_model, mo_model, s_model = JMModel(), GOModel(), MOModel(), SModel()
+    jm_model.ex, jm_model.ey = ex, ey
+    go_model.epslv = epslv
+    models = {"JM": jm_model, "GO": go_model, "MO": mo_model, "S": s_model}
+    for model in models.values():
+        model.t = stats.t
+        if solver is not None:
+            model.solver = solver
+        if cache is not None:
+            cache.fit(model, stats)
         else:
-            print("在失效率均值方面，JM模型和GO模型表现相同。")
\ No newline at end of file
+            model.calculate(stats)
+    return models
+
+
+SWEEP_COLUMNS = [
+    "ex", "ey", "epslv", "N0", "Fi", "a", "b", "jm_MTBF", "go_MTBF",
+    "jm_failure_rate_mean", "go_failure_rate_mean", "jm_evaluations", "go_evaluations", "jm_time", "go_time",
+]
+
+
+def print_table(rows: List[Dict[str, float]]):
+    """
+    以表格形式打印sweep的结果。
+
+    :param rows: sweep返回的结果列表。
+    """
+    print(" ".join(f"{column:>14}" for column in SWEEP_COLUMNS))
+    for row in rows:
+        print(" ".join(f"{row[column]:>14.6g}" for column in SWEEP_COLUMNS))
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    解析命令行参数。不带--sweep时保持原有的交互式比较。
+
+    :return: 命令行参数。
+    """
+    parser = argparse.ArgumentParser(description="比较JM模型和GO模型")
+    parser.add_argument("--sweep", action="store_true", help="无交互地在精度参数网格上批量比较")
+    parser.add_argument("--data", nargs="+", default=[os.path.join(os.path.dirname(os.path.abspath(__file__)), "test.txt")],
+                        help="故障数据文件")
+    parser.add_argument("--ex", nargs="+", type=float, default=[1e-3], help="ex的取值")
+    parser.add_argument("--ey", nargs="+", type=float, default=[1e-3], help="ey的取值")
+    parser.add_argument("--epslv", nargs="+", type=float, default=[1e-3], help="epslv的取值")
+    parser.add_argument("--solver", default="bisection", help="求根方法")
+    parser.add_argument("--workers", type=int, default=None, help="并行进程数")
+    parser.add_argument("--output", default=None, help="将结果另存为CSV文件")
+    parser.add_argument("--bootstrap", type=int, default=0, help="计算置信区间的自助法重抽样次数")
+    parser.add_argument("--bootstrap-method", default="nonparametric", choices=["nonparametric", "parametric"],
+                        help="自助法重抽样方法")
+    parser.add_argument("--seed", type=int, default=0, help="自助法随机种子")
+    parser.add_argument("--prequential", type=int, default=0, metavar="START",
+                        help="从前START个故障开始做滚动起点预测评价")
+    parser.add_argument("--select", default=None, choices=CRITERIA,
+                        help="按指定指标（对数似然、AIC、BIC或均方误差）比较JM、GO、MO和S型模型")
+    parser.add_argument("--no-fit-cache", action="store_true", help="交互式比较时不使用拟合结果缓存")
+    return parser.parse_args()
+
+
+def run_sweep(args: argparse.Namespace):
+    """
+    执行--sweep模式：读取一次数据，打印结果表格，并按需保存为CSV文件。
+
+    :param args: 命令行参数。
+    """
+    rows = sweep(load_failure_times(args.data), args.ex, args.ey, args.epslv, args.solver, args.workers)
+    print_table(rows)
+    if args.output:
+        with open(args.output, "w", newline="") as output_file:
+            writer = csv.DictWriter(output_file, fieldnames=SWEEP_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def run_bootstrap(args: argparse.Namespace):
+    """
+    执行--bootstrap模式：按第一组精度参数计算JM、GO模型参数的置信区间并打印。
+
+    :param args: 命令行参数。
+    """
+    intervals = bootstrap(load_failure_times(args.data), args.ex[0], args.ey[0], args.epslv[0], args.bootstrap,
+                          args.bootstrap_method, seed=args.seed, workers=args.workers)
+    print_intervals(intervals)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.sweep or args.bootstrap or args.prequential or args.select:
+        if args.sweep:
+            run_sweep(args)
+        if args.bootstrap:
+            run_bootstrap(args)
+        if args.prequential:
+            print_prequential(prequential(load_failure_times(args.data), args.ex[0], args.ey[0], args.epslv[0],
+                                          args.prequential, args.solver))
+        if args.select:
+            models = fit_all_models(load_failure_times(args.data), args.ex[0], args.ey[0], args.epslv[0])
+            print_selection(select_models(models, criterion=args.select), args.select)
+    else:
+        os.chdir(os.path.dirname(os.path.abspath(__file__)))
+        fit_cache = None if args.no_fit_cache else FitCache()
+        while True:
+            # 创建JMModel实例
+            jm_model = JMModel()
+            jm_model.read_data()
+            jm_model.set_ex_ey()
+            if fit_cache is not None:
+                fit_cache.fit(jm_model)  # 数据和ex、ey未变化时直接使用上一次的结果
+            else:
+                jm_model.calculate()
+            jm_model.print_results()
+            jm_model.calculate_MTBF()
+            jm_model.calculate_failure_rate_mean()
+
+            # 创建GOModel实例
+            go_model = GOModel()
+            go_model.read_data()
+            go_model.set_epslv()
+            if fit_cache is not None:
+                fit_cache.fit(go_model)
+            else:
+                go_model.calculate()
+            go_model.print_results()
+            go_model.calculate_MTBF()
+            go_model.calculate_failure_rate_mean()
+
+            # 计算并比较MTBF
+            jm_MTBF = jm_model.calculate_MTBF()
+            go_MTBF = go_model.calculate_MTBF()
+            print(f"JM模型MTBF: {jm_MTBF}")
+            print(f"GO模型MTBF: {go_MTBF}")
+            if jm_MTBF > go_MTBF:
+                print("在MTBF方面，JM模型表现更好。")
+            elif jm_MTBF < go_MTBF:
+                print("在MTBF方面，GO模型表现更好。")
+            else:
+                print("在MTBF方面，JM模型和GO模型表现相同。")
+
+            # 计算并比较失效率均值
+            jm_failure_rate_mean = jm_model.calculate_failure_rate_mean()
+            go_failure_rate_mean = go_model.calculate_failure_rate_mean()
+            print(f"JM模型失效率均值: {jm_failure_rate_mean}")
+            print(f"GO模型失效率均值: {go_failure_rate_mean}")
+
+            if jm_failure_rate_mean > go_failure_rate_mean:
+                print("在失效率均值方面，GO模型表现更好。")
+            elif jm_failure_rate_mean < go_failure_rate_mean:
+                print("在失效率均值方面，JM模型表现更好。")
+            else:
+                print("在失效率均值方面，JM模型和GO模型表现相同。")
\ No newline at end of file
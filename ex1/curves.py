@@ -0,0 +1,114 @@
+from typing import Dict, Iterator, Tuple
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 1 << 18  # 每次向量化计算的元素数上限，决定临时数组的内存占用
+
+
+def _chunks(n: int, size: int) -> Iterator[slice]:
+    """
+    将长度为n的区间按size切分。
+
+    :param n: 总长度。
+    :param size: 每块的长度。
+    :return: 各块的切片。
+    """
+    for start in range(0, n, size):
+        yield slice(start, min(start + size, n))
+
+
+def evaluate_curves(model, t: np.ndarray, x: np.ndarray = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, np.ndarray]:
+    """
+    在时间网格上计算已拟合模型的可靠性曲线。
+
+    模型需提供mean_value、intensity和expected_total_failures方法（JMModel及各NHPP模型均满足）。
+    时间网格按块计算，每块的元素数不超过chunk_size，除结果数组外只占用有界的临时内存。
+
+    :param model: 已拟合的模型。
+    :param t: 时间网格。
+    :param x: 任务时长，可为标量或数组，为None时不计算条件可靠度。
+    :param chunk_size: 每块的元素数上限。
+    :return: 字典，包含均值函数"mean_value"、失效强度"intensity"、期望剩余故障数"remaining"，
+             x不为None时还包含条件可靠度"reliability"，即R(x|t) = exp(-(m(t + x) - m(t)))，形状为t.shape + x.shape。
+    """
+    t = np.asarray(t, dtype=float).ravel()
+    total = model.expected_total_failures()
+    result = {key: np.empty(len(t)) for key in ("mean_value", "intensity", "remaining")}
+    width = 1
+    if x is not None:
+        x = np.asarray(x, dtype=float)
+        result["reliability"] = np.empty(t.shape + x.shape)
+        width = max(x.size, 1)
+    for s in _chunks(len(t), max(chunk_size // width, 1)):
+        m = model.mean_value(t[s])
+        result["mean_value"][s] = m
+        result["intensity"][s] = model.intensity(t[s])
+        result["remaining"][s] = total - m
+        if x is not None:
+            shape = (-1,) + (1,) * x.ndim
+            increment = model.mean_value(t[s].reshape(shape) + x) - m.reshape(shape)
+            np.exp(-increment, out=result["reliability"][s])
+    return result
+
+
+def iter_batch_curves(a: np.ndarray, b: np.ndarray, t: np.ndarray, x: np.ndarray = None,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[slice, Dict[str, np.ndarray]]]:
+    """
+    按块计算一批指数型模型的可靠性曲线。
+
+    JM模型（a = N0，b = Fi）和GO模型的均值函数都是m(t) = a*(1 - e^(-b*t))，
+    因此可以用fit_jm_batch或fit_go_batch的结果一次计算成千上万个部件的曲线。
+    时间网格按块切分，每块的元素数（部件数×时间点数×任务时长数）不超过chunk_size，
+    调用方可逐块汇总或写入磁盘，适合不能整体放入内存的大网格。
+
+    :param a: 各部件的参数a（或N0）。
+    :param b: 各部件的参数b（或Fi）。
+    :param t: 时间网格。
+    :param x: 任务时长，可为标量或数组，为None时不计算条件可靠度。
+    :param chunk_size: 每块的元素数上限。
+    :return: (切片, 曲线字典)的迭代器，切片为该块在时间网格上的位置，曲线数组的第一维为部件。
+    """
+    a = np.asarray(a, dtype=float).reshape(-1, 1)
+    b = np.asarray(b, dtype=float).reshape(-1, 1)
+    t = np.asarray(t, dtype=float).ravel()
+    width = len(a)
+    if x is not None:
+        x = np.asarray(x, dtype=float)
+        decay = np.expm1(-b.reshape((-1, 1) + (1,) * x.ndim) * x)  # e^(-b*x) - 1，与t无关，只计算一次
+        width *= max(x.size, 1)
+    for s in _chunks(len(t), max(chunk_size // width, 1)):
+        survival = np.exp(-b * t[s])
+        remaining = a * survival
+        curves = {
+            "mean_value": a - remaining,
+            "intensity": b * remaining,
+            "remaining": remaining,
+        }
+        if x is not None:
+            # m(t + x) - m(t) = a*e^(-b*t)*(1 - e^(-b*x))，直接按此式计算以避免相减的精度损失
+            curves["reliability"] = np.exp(remaining.reshape(remaining.shape + (1,) * x.ndim) * decay)
+        yield s, curves
+
+
+def batch_curves(a: np.ndarray, b: np.ndarray, t: np.ndarray, x: np.ndarray = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, out: Dict[str, np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    计算一批指数型模型的可靠性曲线并写入完整的结果数组。
+
+    :param a: 各部件的参数a（或N0）。
+    :param b: 各部件的参数b（或Fi）。
+    :param t: 时间网格。
+    :param x: 任务时长，可为标量或数组，为None时不计算条件可靠度。
+    :param chunk_size: 每块的元素数上限。
+    :param out: 预先分配的结果数组（可为np.memmap），为None时新建。
+    :return: 与iter_batch_curves的键相同的字典，数组形状为(部件数, 时间点数)或(部件数, 时间点数) + x.shape。
+    """
+    components, points = np.size(a), np.size(t)
+    if out is None:
+        out = {key: np.empty((components, points)) for key in ("mean_value", "intensity", "remaining")}
+        if x is not None:
+            out["reliability"] = np.empty((components, points) + np.shape(x))
+    for s, curves in iter_batch_curves(a, b, t, x, chunk_size):
+        for key, value in curves.items():
+            out[key][:, s] = value
+    return out
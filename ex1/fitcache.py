@@ -0,0 +1,134 @@
+from typing import Dict, Optional, Sequence
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import numpy as np
+from loader import CACHE_DIR_NAME
+
+DEFAULT_PATH = os.path.join(CACHE_DIR_NAME, "fits.sqlite3")  # 默认缓存文件，相对于当前目录
+SETTINGS = ["ex", "ey", "epslv", "solver", "xtol", "ftol", "max_iterations"]  # 影响拟合结果的设置
+PARAMETERS = ["root", "N0", "Fi", "a", "b"]  # 拟合得到的参数
+DIAGNOSTICS = ["iterations", "evaluations", "residual", "converged"]  # 求根统计信息
+
+
+def _plain(value):
+    """
+    将NumPy标量转换为可JSON序列化的Python值。
+
+    :param value: 属性值。
+    :return: Python值。
+    """
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class FitCache:
+    def __init__(self, path: str = DEFAULT_PATH, max_bytes: int = 64 << 20):
+        """
+        初始化FitCache类的实例。
+
+        拟合结果保存在SQLite数据库中，键由故障时间内容的SHA-1、模型类名和求根设置共同计算，
+        数据和设置都不变时直接读取上一次的参数和求根统计信息，无需重新拟合。
+        缓存总大小超过max_bytes时按最近最少使用（LRU）的顺序删除条目。
+
+        :param path: 缓存数据库文件路径。
+        :param max_bytes: 缓存条目的总大小上限（字节）。
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0  # 命中次数
+        self.misses = 0  # 未命中次数
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=30)
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS fits "
+                                    "(key TEXT PRIMARY KEY, value TEXT, size INTEGER, accessed INTEGER)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS fits_accessed ON fits (accessed)")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS meta (id INTEGER PRIMARY KEY, total INTEGER)")
+            self.connection.execute("INSERT OR IGNORE INTO meta VALUES (0, 0)")
+
+    def close(self):
+        """
+        关闭缓存数据库。
+        """
+        self.connection.close()
+
+    def key(self, model, t: Sequence[float] = None) -> str:
+        """
+        计算模型在当前数据和设置下的缓存键。
+
+        :param model: 模型实例。
+        :param t: 故障时间，为None时使用model.t。
+        :return: 缓存键。
+        """
+        t = np.ascontiguousarray(model.t if t is None else t, dtype=float)
+        settings = {name: _plain(getattr(model, name)) for name in SETTINGS if hasattr(model, name)}
+        digest = hashlib.sha1(t.tobytes())
+        digest.update(type(model).__name__.encode())
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, object]]:
+        """
+        读取缓存条目并更新其访问时间。
+
+        :param key: 缓存键。
+        :return: 缓存的参数和求根统计信息，不存在时返回None。
+        """
+        with self.connection:
+            row = self.connection.execute("SELECT value FROM fits WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.connection.execute("UPDATE fits SET accessed = ? WHERE key = ?", (time.time_ns(), key))
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict[str, object]):
+        """
+        写入缓存条目，总大小超过上限时删除最久未访问的条目。
+
+        :param key: 缓存键。
+        :param value: 参数和求根统计信息。
+        """
+        text = json.dumps(value)
+        size = len(key) + len(text)
+        with self.connection:
+            old = self.connection.execute("SELECT size FROM fits WHERE key = ?", (key,)).fetchone()
+            self.connection.execute("INSERT OR REPLACE INTO fits VALUES (?, ?, ?, ?)",
+                                    (key, text, size, time.time_ns()))
+            self.connection.execute("UPDATE meta SET total = total + ? WHERE id = 0", (size - (old[0] if old else 0),))
+            total = self.connection.execute("SELECT total FROM meta WHERE id = 0").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            removed, stale = 0, []
+            for stale_key, stale_size in self.connection.execute("SELECT key, size FROM fits ORDER BY accessed"):
+                if total - removed <= self.max_bytes:
+                    break
+                stale.append((stale_key,))
+                removed += stale_size
+            self.connection.executemany("DELETE FROM fits WHERE key = ?", stale)
+            self.connection.execute("UPDATE meta SET total = total - ? WHERE id = 0", (removed,))
+
+    def fit(self, model, stats=None) -> bool:
+        """
+        拟合模型，数据和设置未变化时直接使用缓存的结果。
+
+        命中时把缓存的参数和求根统计信息设置到模型上；未命中时调用model.calculate(stats)并写入缓存。
+
+        :param model: 已设置好t和精度参数的模型实例。
+        :param stats: 传给calculate的充分统计量。
+        :return: 是否命中缓存。
+        """
+        key = self.key(model, stats.t if stats is not None else None)
+        value = self.get(key)
+        if value is not None:
+            for name, item in value.items():
+                setattr(model, name, item)
+            self.hits += 1
+            return True
+        model.calculate(stats)
+        self.put(key, {name: _plain(getattr(model, name)) for name in PARAMETERS + DIAGNOSTICS
+                       if hasattr(model, name)})
+        self.misses += 1
+        return False
@@ -0,0 +1,132 @@
+from typing import List, Union
+import gzip
+import hashlib
+import os
+import warnings
+import numpy as np
+
+CACHE_DIR_NAME = ".failure_cache"  # 缓存目录名，默认位于数据文件所在目录
+
+
+def _open(path: str):
+    """
+    以二进制方式打开故障数据文件，扩展名为.gz时按gzip解压。
+
+    :param path: 文件路径。
+    :return: 文件对象。
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def parse_failure_file(path: str) -> np.ndarray:
+    """
+    解析"故障序号 故障时间"格式的文件。
+
+    整个文件一次性读入后由NumPy批量解析，故障时间可以是整数或浮点数。
+
+    :param path: 文件路径，支持.gz压缩文件。
+    :return: 故障时间数组。
+    """
+    with _open(path) as input_file:
+        text = input_file.read()
+    with warnings.catch_warnings():
+        # 遇到无法解析的内容时NumPy只发出警告并截断结果，这里将其视为格式错误
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(text, dtype=float, sep=" ")
+        except (DeprecationWarning, ValueError):
+            raise ValueError(f"文件{path}中存在无法解析的内容。")
+    if values.size % 2 != 0:
+        raise ValueError(f"文件{path}的格式应为每行\"故障序号 故障时间\"。")
+    return values.reshape(-1, 2)[:, 1].copy()
+
+
+def cache_key(path: str, use_hash: bool = False) -> str:
+    """
+    计算数据文件的缓存键。
+
+    默认由文件的绝对路径、大小和修改时间计算；use_hash为True时改用文件内容的SHA-1，
+    适用于修改时间不可靠（如从其他机器复制）的文件。
+
+    :param path: 文件路径。
+    :param use_hash: 是否使用文件内容的哈希值。
+    :return: 缓存键。
+    """
+    digest = hashlib.sha1()
+    if use_hash:
+        with open(path, "rb") as input_file:
+            for block in iter(lambda: input_file.read(1 << 20), b""):
+                digest.update(block)
+    else:
+        stat = os.stat(path)
+        digest.update(f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def _write_cache(times: np.ndarray, path: str, directory: str, cache_path: str):
+    """
+    写入一个数据文件的缓存，并删除同一数据文件过期的缓存。
+
+    :param times: 解析得到的故障时间。
+    :param path: 数据文件路径。
+    :param directory: 缓存目录。
+    :param cache_path: 缓存文件路径。
+    """
+    os.makedirs(directory, exist_ok=True)
+    # 先写临时文件再重命名，避免并发读取到不完整的缓存
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as output_file:
+            np.save(output_file, times)
+        os.replace(temp_path, cache_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    # 删除同一数据文件过期的缓存
+    prefix = f"{os.path.basename(path)}."
+    for name in os.listdir(directory):
+        stale = os.path.join(directory, name)
+        key = name[len(prefix):-len(".npy")]
+        if name.startswith(prefix) and name.endswith(".npy") and len(key) == 40 and "." not in key \
+                and stale != cache_path:
+            os.remove(stale)
+
+
+def load_failure_times(paths: Union[str, List[str]], cache: bool = True, cache_dir: str = None,
+                       use_hash: bool = False, mmap: bool = True) -> np.ndarray:
+    """
+    读取一个或多个故障数据文件的故障时间。
+
+    多个文件的故障时间按给定顺序拼接。启用缓存时，每个文件解析后保存为.npy缓存文件，
+    文件名包含缓存键，数据文件未变化时直接以内存映射方式加载，跳过解析。缓存无法写入（如目录只读）时仍返回解析结果。
+
+    :param paths: 文件路径或文件路径列表，支持.gz压缩文件。
+    :param cache: 是否使用缓存。
+    :param cache_dir: 缓存目录，为None时使用数据文件所在目录下的.failure_cache目录。
+    :param use_hash: 缓存键是否使用文件内容的哈希值，默认使用文件大小和修改时间。
+    :param mmap: 读取缓存时是否使用内存映射。
+    :return: 故障时间数组。
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    columns = []
+    for path in map(os.fspath, paths):
+        if not cache:
+            columns.append(parse_failure_file(path))
+            continue
+        directory = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+        cache_path = os.path.join(directory, f"{os.path.basename(path)}.{cache_key(path, use_hash)}.npy")
+        if os.path.exists(cache_path):
+            columns.append(np.load(cache_path, mmap_mode="r" if mmap else None))
+            continue
+        times = parse_failure_file(path)
+        try:
+            _write_cache(times, path, directory, cache_path)
+        except OSError:
+            pass  # 缓存只是加速手段，目录只读等原因无法写入时直接返回解析结果
+        columns.append(times)
+    if len(columns) == 1:
+        return columns[0]
+    return np.concatenate(columns)
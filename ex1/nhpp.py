@@ -0,0 +1,263 @@
+from typing import Dict, List, Union
+import warnings
+import numpy as np
+from scipy.special import xlogy
+from stats import FailureStats, GroupedFailureStats
+from loader import load_failure_times
+from solver import ConvergenceWarning, solve
+from curves import DEFAULT_CHUNK_SIZE, evaluate_curves
+
+DEFAULT_TOLERANCE = 1e-12  # 求根的默认精度
+
+class NHPPModel:
+    name = "NHPP"  # 模型名称，由子类设置
+
+    def __init__(self):
+        """
+        初始化NHPPModel类的实例。
+
+        NHPP类模型由均值函数m(t)和失效强度λ(t)两个参数a、b决定，子类只需给出m(t)、λ(t)、
+        由b确定a的公式以及关于b的似然方程，其余的拟合、对数似然和评价指标均由本类在NumPy数组上完成。
+        子类的均值函数都可写为m(t) = a*G(b*t)，给出G及其导数后即可按区间故障数（分组数据）拟合。
+        """
+        self.t = []  # 存储故障时间的列表（由read_data读取时为数组），初始为空列表
+        self.a = 0  # 参数a，初始值为0
+        self.b = 0  # 参数b，初始值为0
+        self.stats = None  # 故障数据的充分统计量，在calculate中一次性计算
+        self.solver = "brent"  # 求根方法，可选"bisection"、"newton"、"illinois"、"brent"
+        self.xtol = DEFAULT_TOLERANCE  # 无量纲参数x = b*tn的精度
+        self.ftol = DEFAULT_TOLERANCE  # 归一化似然方程的残差精度
+        self.max_iterations = 1000  # 最大迭代次数
+        self.iterations = 0  # 求根迭代次数
+        self.evaluations = 0  # 函数求值次数
+        self.residual = None  # 根处的函数值
+        self.converged = None  # 是否收敛
+
+    def read_data(self, path: Union[str, List[str]] = "test.txt"):
+        """
+        从文件中读取故障数据。
+
+        :param path: 文件路径或文件路径列表。
+        """
+        self.t = load_failure_times(path)
+
+    def mean_value(self, t: np.ndarray) -> np.ndarray:
+        """
+        计算均值函数m(t)，即到时刻t为止的期望累积故障数。
+
+        :param t: 时间数组。
+        :return: 均值函数数组。
+        """
+        raise NotImplementedError
+
+    def intensity(self, t: np.ndarray) -> np.ndarray:
+        """
+        计算失效强度λ(t) = m'(t)。
+
+        :param t: 时间数组。
+        :return: 失效强度数组。
+        """
+        raise NotImplementedError
+
+    def shape(self, z: np.ndarray) -> np.ndarray:
+        """
+        计算均值函数的形状函数G(z)，m(t) = a*G(b*t)。
+
+        :param z: 无量纲时间b*t。
+        :return: G(z)。
+        """
+        raise NotImplementedError
+
+    def shape_derivative(self, z: np.ndarray) -> np.ndarray:
+        """
+        计算形状函数的导数G'(z)。
+
+        :param z: 无量纲时间b*t。
+        :return: G'(z)。
+        """
+        raise NotImplementedError
+
+    def expected_total_failures(self) -> float:
+        """
+        计算时间趋于无穷时的期望累积故障数m(∞)。
+
+        :return: 期望总故障数，有限故障模型为a。
+        """
+        return float(self.a)
+
+    def a_from_x(self, stats: FailureStats, x: float) -> float:
+        """
+        给定x = b*tn时参数a的极大似然估计。
+
+        :param stats: 故障数据的充分统计量。
+        :param x: 无量纲参数x = b*tn。
+        :return: 参数a。
+        """
+        raise NotImplementedError
+
+    def score(self, stats: FailureStats, x: float) -> float:
+        """
+        代入a的估计后关于b的似然方程，以x = b*tn为自变量并乘以tn/n归一化。
+
+        约定x较小时为正、x较大时为负，与solver中的求根方法一致。
+
+        :param stats: 故障数据的充分统计量。
+        :param x: 无量纲参数x = b*tn。
+        :return: 归一化的似然方程函数值。
+        """
+        raise NotImplementedError
+
+    def grouped_score(self, stats: GroupedFailureStats, x: float) -> float:
+        """
+        分组数据代入a的估计后关于b的似然方程，以x = b*tn为自变量并除以总故障数归一化：
+        sum(y_j*(u_j*G'(x*u_j) - u_{j-1}*G'(x*u_{j-1}))/(G(x*u_j) - G(x*u_{j-1})))/n - G'(x)/G(x)。
+
+        每次求值对区间数组做一次向量化计算。
+
+        :param stats: 分组数据的统计量。
+        :param x: 无量纲参数x = b*tn。
+        :return: 归一化的似然方程函数值。
+        """
+        upper, lower = x * stats.u_upper, x * stats.u_lower
+        numerator = stats.u_upper * self.shape_derivative(upper) - stats.u_lower * self.shape_derivative(lower)
+        ratio = numerator / (self.shape(upper) - self.shape(lower))
+        return float(np.dot(stats.counts, ratio)) / stats.n - float(self.shape_derivative(x) / self.shape(x))
+
+    def log_likelihood(self, stats: Union[FailureStats, GroupedFailureStats] = None) -> float:
+        """
+        计算当前参数下的对数似然。
+
+        故障时间数据为 sum(log λ(t_i)) - m(tn)；分组数据为 sum(y_j*log(m(s_j) - m(s_{j-1}))) - m(s_k)，
+        略去与参数无关的常数项。
+
+        :param stats: 故障数据的统计量，为None时使用self.stats，两者都没有时根据t计算。
+        :return: 对数似然值。
+        """
+        stats = stats if stats is not None else self.stats if self.stats is not None else FailureStats(self.t)
+        with np.errstate(divide="ignore"):
+            if isinstance(stats, GroupedFailureStats):
+                increments = self.mean_value(stats.upper) - self.mean_value(stats.lower)
+                return float(np.sum(xlogy(stats.counts, increments)) - self.mean_value(stats.tn))
+            return float(np.sum(np.log(self.intensity(stats.t))) - self.mean_value(stats.tn))
+
+    def _tolerances(self):
+        """
+        求根使用的精度。
+
+        :return: (xtol, ftol)。
+        """
+        return self.xtol, self.ftol
+
+    def calculate(self, stats: FailureStats = None):
+        """
+        计算模型的参数a和b。
+
+        先在x = b*tn上倍增搜索似然方程的变号区间，再按self.solver指定的求根方法求解，
+        并将迭代次数、函数求值次数、最终残差和是否收敛记录在模型上。似然方程无正根或求根未收敛时a、b置为0，
+        converged为False。
+
+        :param stats: 已根据t计算好的充分统计量，为None时根据t计算。多个模型可共享同一份统计量。
+        """
+        self.stats = stats if stats is not None else FailureStats(self.t)
+        self._solve_profile(self.stats)
+
+    def fit_grouped(self, counts: Union[List[float], np.ndarray], endpoints: Union[List[float], np.ndarray] = None):
+        """
+        按区间故障数（分组数据）计算模型的参数a和b。
+
+        对数似然为 sum(y_j*log(m(s_j) - m(s_{j-1}))) - m(s_k)，a的估计为n/G(b*s_k)，
+        关于b的似然方程见grouped_score，求根方式与calculate相同。
+
+        :param counts: 各区间的故障数。
+        :param endpoints: 各区间的右端点，为None时取1, 2, ..., k。
+        """
+        self.stats = GroupedFailureStats(counts, endpoints)
+        self._solve_profile(self.stats)
+
+    def _solve_profile(self, stats: Union[FailureStats, GroupedFailureStats]):
+        """
+        求解关于x = b*tn的似然方程并计算参数a和b。
+
+        :param stats: 故障时间数据或分组数据的统计量。
+        """
+        score = self.grouped_score if isinstance(stats, GroupedFailureStats) else self.score
+
+        def f(x):
+            return score(stats, x)
+
+        left = 1e-4
+        evaluations = 1
+        if not f(left) > 0:
+            self._clear(evaluations)  # 数据没有可靠性增长的趋势，似然方程无正根
+            return
+        right = 1.0
+        evaluations += 1
+        while f(right) > 0:
+            left = right
+            right *= 2
+            evaluations += 1
+            if right > 1e6:
+                self._clear(evaluations)
+                return
+
+        xtol, ftol = self._tolerances()
+        result = solve(self.solver, f, left, right, xtol, ftol, self.max_iterations)
+        self.iterations = result.iterations
+        self.evaluations = evaluations + result.evaluations
+        self.residual = result.residual
+        self.converged = result.converged
+        if not result.converged:
+            warnings.warn(f"{result.reason}，请检查数据或算法。", ConvergenceWarning)
+            self.a = self.b = 0
+            return
+        self.b = result.root / stats.tn
+        self.a = self.a_from_x(stats, result.root)
+
+    def _clear(self, evaluations: int):
+        """
+        似然方程无正根时清除上一次的拟合结果，a、b置为0，converged置为False。
+
+        :param evaluations: 搜索变号区间时的函数求值次数。
+        """
+        self.a = self.b = 0
+        self.iterations = 0
+        self.evaluations = evaluations
+        self.residual = None
+        self.converged = False
+
+    def curves(self, t: np.ndarray, x: np.ndarray = None,
+               chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, np.ndarray]:
+        """
+        在时间网格上计算均值函数、失效强度、期望剩余故障数以及条件可靠度R(x|t)。
+
+        :param t: 时间网格。
+        :param x: 任务时长，可为标量或数组，为None时不计算条件可靠度。
+        :param chunk_size: 每块的元素数上限。
+        :return: 见curves.evaluate_curves。
+        """
+        return evaluate_curves(self, t, x, chunk_size)
+
+    def print_results(self):
+        """
+        打印计算结果。
+        """
+        print(f"{self.name}模型：")
+        print(f"a={self.a}")
+        print(f"b={self.b}")
+
+    def calculate_MTBF(self):
+        """
+        计算最后一个故障时刻的平均故障间隔时间（MTBF），即1/λ(tn)。
+
+        :return: 平均故障间隔时间（MTBF）。
+        """
+        tn = self.stats.tn if self.stats is not None else self.t[-1]
+        return 1 / float(self.intensity(tn))
+
+    def calculate_failure_rate_mean(self):
+        """
+        计算各故障时刻失效强度的均值。
+
+        :return: 失效率均值。
+        """
+        return float(np.mean(self.intensity(np.asarray(self.t, dtype=float))))
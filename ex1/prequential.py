@@ -0,0 +1,144 @@
+from typing import Dict, Sequence
+import math
+import warnings
+import numpy as np
+from JM import JMModel
+from GO import GOModel
+from solver import ConvergenceWarning
+
+
+def ks_distance(u: np.ndarray) -> float:
+    """
+    计算u-plot的Kolmogorov-Smirnov距离，即u值的经验分布函数与[0, 1]均匀分布之间的最大偏差。
+
+    :param u: 预测分布函数在实际观测值处的取值。
+    :return: KS距离，u为空时返回NaN。
+    """
+    m = len(u)
+    if m == 0:
+        return float("nan")
+    u = np.sort(u)
+    i = np.arange(1, m + 1)
+    return float(max(np.max(i / m - u), np.max(u - (i - 1) / m)))
+
+
+def _jm_predict(model: JMModel, k: int, x: float):
+    """
+    JM模型对下一个故障间隔x的预测分布函数值和对数密度。
+
+    已观测k个故障时间（k-1个间隔）时，第k个间隔服从参数为Fi*(N0-k+1)的指数分布。
+
+    :param model: 用前k个故障时间拟合的JM模型。
+    :param k: 已观测的故障数。
+    :param x: 实际观测到的下一个故障间隔。
+    :return: (u, log_density)，模型无有效拟合时返回None。
+    """
+    rate = model.Fi * (model.N0 - k + 1)
+    if not model.Fi > 0 or not rate > 0:
+        return None
+    return -math.expm1(-rate * x), math.log(rate) - rate * x
+
+
+def _go_predict(model: GOModel, tn: float, x: float):
+    """
+    GO模型对下一个故障间隔x的预测分布函数值和对数密度。
+
+    下一个故障间隔的生存函数为exp(-(m(tn + x) - m(tn)))。
+
+    :param model: 用当前已观测故障时间拟合的GO模型。
+    :param tn: 最后一个已观测的故障时间。
+    :param x: 实际观测到的下一个故障间隔。
+    :return: (u, log_density)，模型无有效拟合时返回None。
+    """
+    a, b = model.a, model.b
+    if not (a > 0 and b > 0):
+        return None
+    increment = a * (math.exp(-b * tn) - math.exp(-b * (tn + x)))
+    intensity = a * b * math.exp(-b * (tn + x))
+    if intensity <= 0:
+        return None
+    return -math.expm1(-increment), math.log(intensity) - increment
+
+
+def prequential(t: Sequence[float], ex: float, ey: float, epslv: float, start: int = 10,
+                solver: str = "newton") -> Dict[str, object]:
+    """
+    滚动起点（prequential）预测评价。
+
+    对每个前缀t[:k]（k从start到n-1）拟合JM和GO模型并预测下一个故障间隔，记录预测分布函数值u
+    和预测密度。模型通过append_failure逐个追加故障，充分统计量O(1)更新且以上一次的根热启动，
+    整个评价的代价近似为O(n)。故障时间倒退的点不做预测，两个模型按前缀从头重新拟合。
+    两个模型都有有效预测的点才计入预测似然比。
+
+    :param t: 故障时间。
+    :param ex: JM模型的ex。
+    :param ey: JM模型的ey。
+    :param epslv: GO模型的epslv。
+    :param start: 第一次预测时使用的故障数。
+    :param solver: 求根方法。
+    :return: 包含两个模型的u值数组、KS距离、有效预测次数以及对数预测似然比（JM相对GO）的字典。
+    """
+    t = [float(value) for value in t]
+    n = len(t)
+    if not 2 <= start < n:
+        raise ValueError("start应不小于2且小于故障数。")
+
+    jm_model, go_model = JMModel(), GOModel()
+    jm_model.ex, jm_model.ey, jm_model.solver = ex, ey, solver
+    go_model.epslv, go_model.solver = epslv, solver
+    jm_model.t, go_model.t = t[:start], t[:start]
+
+    jm_u, go_u = [], []
+    log_plr = 0.0
+    paired = 0
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        jm_model.calculate()
+        go_model.calculate()
+        for k in range(start, n):
+            x = t[k] - t[k - 1]
+            if x >= 0:
+                jm_prediction = _jm_predict(jm_model, k, x)
+                go_prediction = _go_predict(go_model, t[k - 1], x)
+            else:
+                jm_prediction = go_prediction = None  # 故障时间非递增，不是有效的故障间隔
+            if jm_prediction is not None:
+                jm_u.append(jm_prediction[0])
+            if go_prediction is not None:
+                go_u.append(go_prediction[0])
+            if jm_prediction is not None and go_prediction is not None:
+                log_plr += jm_prediction[1] - go_prediction[1]
+                paired += 1
+            if x >= 0:
+                jm_model.append_failure(t[k])
+                go_model.append_failure(t[k])
+            else:
+                # 故障时间倒退时不能O(1)更新统计量，按前缀t[:k+1]从头重新拟合
+                jm_model.t, go_model.t = t[:k + 1], t[:k + 1]
+                jm_model.calculate()
+                go_model.calculate()
+
+    jm_u, go_u = np.array(jm_u), np.array(go_u)
+    return {
+        "jm_u": jm_u, "go_u": go_u,
+        "jm_ks": ks_distance(jm_u), "go_ks": ks_distance(go_u),
+        "jm_predictions": len(jm_u), "go_predictions": len(go_u),
+        "log_plr": log_plr, "paired_predictions": paired,
+    }
+
+
+def print_prequential(result: Dict[str, object]):
+    """
+    打印滚动起点预测评价的结果。
+
+    :param result: prequential返回的结果。
+    """
+    print(f"JM模型u-plot KS距离: {result['jm_ks']}（有效预测{result['jm_predictions']}次）")
+    print(f"GO模型u-plot KS距离: {result['go_ks']}（有效预测{result['go_predictions']}次）")
+    print(f"JM相对GO的对数预测似然比: {result['log_plr']}（共{result['paired_predictions']}次）")
+    if result["log_plr"] > 0:
+        print("在预测似然方面，JM模型表现更好。")
+    elif result["log_plr"] < 0:
+        print("在预测似然方面，GO模型表现更好。")
+    else:
+        print("在预测似然方面，JM模型和GO模型表现相同。")
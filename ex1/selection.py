@@ -0,0 +1,132 @@
+from typing import Dict, List, Tuple, Union
+import math
+import numpy as np
+from scipy.special import gammaln
+from stats import FailureStats, GroupedFailureStats
+from batch import BatchFailureStats, fit_go_batch, fit_jm_batch
+
+CRITERIA = ["log_likelihood", "AIC", "BIC", "MSE"]  # 模型选择指标
+PARAMETER_COUNT = 2  # 各模型的参数个数：JM为N0、Fi，NHPP模型为a、b
+
+
+def evaluate_model(model, stats: Union[FailureStats, GroupedFailureStats] = None) -> Dict[str, float]:
+    """
+    计算已拟合模型的对数似然、AIC、BIC和均方误差。
+
+    JM模型的拟合把t_1, ..., t_{n-1}看作在(0, tn]内观测到的n-1个故障（第一个故障时间t0不计入故障间隔），
+    为了可以比较，故障时间数据上NHPP模型的对数似然同样取这n-1个故障在(0, tn]内的似然，即从完整似然中减去ln λ(t0)，
+    各模型的观测数都为n-1。分组数据按区间似然计算，观测数为总故障数。
+    均方误差为各观测时刻的均值函数m(t)与实际累积故障数之差的平方均值，分组数据在各区间右端点处比较。
+
+    :param model: 已拟合的模型，需提供log_likelihood和mean_value方法。
+    :param stats: 模型拟合时使用的统计量，为None时使用model.stats，两者都没有时根据model.t计算。
+    :return: 包含log_likelihood、AIC、BIC和MSE的字典，模型无有效拟合时各项为NaN。
+    """
+    stats = stats if stats is not None else model.stats if model.stats is not None else FailureStats(model.t)
+    if not model.mean_value(stats.tn) > 0:
+        return {criterion: float("nan") for criterion in CRITERIA}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_likelihood = model.log_likelihood(stats)
+        if isinstance(stats, GroupedFailureStats):
+            times, observed, observations = stats.upper, np.cumsum(stats.counts), stats.n
+        else:
+            times, observed, observations = stats.t, np.arange(1, stats.n + 1), stats.n - 1
+            if not hasattr(model, "N0"):
+                t0 = stats.t[0]
+                log_likelihood -= float(np.log(model.intensity(t0)))
+    return {
+        "log_likelihood": log_likelihood,
+        "AIC": 2 * PARAMETER_COUNT - 2 * log_likelihood,
+        "BIC": PARAMETER_COUNT * math.log(observations) - 2 * log_likelihood,
+        "MSE": float(np.mean((model.mean_value(times) - observed) ** 2)),
+    }
+
+
+def select_models(models: Dict[str, object], stats: Union[FailureStats, GroupedFailureStats] = None,
+                  criterion: str = "AIC") -> List[Tuple[str, Dict[str, float]]]:
+    """
+    按指定指标对同一份数据上拟合的多个模型排序。
+
+    :param models: 模型名称到已拟合模型的字典，如compare.fit_all_models的返回值。
+    :param stats: 各模型共享的统计量，为None时使用各模型自己的统计量。
+    :param criterion: 排序指标，log_likelihood越大越好，其余越小越好。
+    :return: 按优劣排序的(模型名称, 指标字典)列表，无有效拟合的模型排在最后。
+    """
+    if criterion not in CRITERIA:
+        raise ValueError(f"未知的模型选择指标：{criterion}，可选：{'、'.join(CRITERIA)}")
+    sign = -1 if criterion == "log_likelihood" else 1
+    results = [(name, evaluate_model(model, stats)) for name, model in models.items()]
+
+    def order(item):
+        value = item[1][criterion]
+        return (math.isnan(value), sign * value if not math.isnan(value) else 0.0)
+
+    return sorted(results, key=order)
+
+
+def select_batch(offsets: np.ndarray, values: np.ndarray, ex: float, ey: float, epslv: float,
+                 criterion: str = "AIC") -> Dict[str, object]:
+    """
+    对多组故障数据批量拟合JM和GO模型，并按指定指标逐组选择模型。
+
+    所有组的充分统计量只计算一次，两个模型的拟合、对数似然和均方误差都在扁平数组上向量化计算。
+    JM模型的对数似然由充分统计量闭式计算；GO模型与evaluate_model一样取t_1, ..., t_{n-1}在(0, tn]内的似然
+    (n-1)*ln(a*b) - b*sum(t_i) - a*(1 - e^(-b*tn))，其中i从1到n-1。
+
+    :param offsets: 长度为组数+1的偏移量数组。
+    :param values: 所有组的故障时间拼接成的扁平数组。
+    :param ex: JM模型的ex。
+    :param ey: JM模型的ey。
+    :param epslv: GO模型的epslv。
+    :param criterion: 选择指标。
+    :return: 字典，"models"为模型名称列表；"JM"、"GO"为各自的参数和指标数组；
+             "rank"为形状(组数, 模型数)的名次（0为最好）；"best"为每组最好模型的下标，所有模型都无效时为-1。
+    """
+    if criterion not in CRITERIA:
+        raise ValueError(f"未知的模型选择指标：{criterion}，可选：{'、'.join(CRITERIA)}")
+    stats = BatchFailureStats(offsets, values)
+    jm = fit_jm_batch(offsets, values, ex, ey, stats)
+    go = fit_go_batch(offsets, values, epslv, stats=stats)
+    n = stats.n
+    local = np.arange(len(stats.values)) - np.repeat(stats.offsets[:-1], n) + 1  # 组内累积故障数
+    starts = stats.offsets[:-1]
+    t = stats.values
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        N0, Fi = jm["N0"], jm["Fi"]
+        exposure = N0 * stats.tn - stats.weighted_sum  # 与拟合使用的jm_Fi一致
+        jm["log_likelihood"] = (n - 1) * np.log(Fi) + gammaln(N0 + 1) - gammaln(N0 - n + 2) - Fi * exposure
+        jm_mean = N0[stats.group] * -np.expm1(-Fi[stats.group] * t)
+        jm["MSE"] = np.add.reduceat((jm_mean - local) ** 2, starts) / n
+
+        a, b = go["a"], go["b"]
+        go["log_likelihood"] = (n - 1) * np.log(a * b) - b * stats.time_sum \
+            + a * np.expm1(-b * stats.tn)
+        go_mean = a[stats.group] * -np.expm1(-b[stats.group] * t)
+        go["MSE"] = np.add.reduceat((go_mean - local) ** 2, starts) / n
+
+    for result in (jm, go):
+        result["AIC"] = 2 * PARAMETER_COUNT - 2 * result["log_likelihood"]
+        result["BIC"] = PARAMETER_COUNT * np.log(n - 1) - 2 * result["log_likelihood"]
+
+    names = ["JM", "GO"]
+    scores = np.column_stack([jm[criterion], go[criterion]])
+    if criterion == "log_likelihood":
+        scores = -scores
+    scores = np.where(np.isfinite(scores), scores, np.inf)  # 无效拟合排在最后
+    rank = np.argsort(np.argsort(scores, axis=1, kind="stable"), axis=1)
+    best = np.where(np.isfinite(scores).any(axis=1), np.argmin(scores, axis=1), -1)
+    return {"models": names, "JM": jm, "GO": go, "rank": rank, "best": best}
+
+
+def print_selection(ranking: List[Tuple[str, Dict[str, float]]], criterion: str = "AIC"):
+    """
+    打印模型选择的结果。
+
+    :param ranking: select_models返回的排序结果。
+    :param criterion: 排序使用的指标。
+    """
+    print(f"{'模型':>8} " + " ".join(f"{column:>16}" for column in CRITERIA))
+    for name, result in ranking:
+        print(f"{name:>8} " + " ".join(f"{result[column]:>16.6g}" for column in CRITERIA))
+    print(f"按{criterion}，{ranking[0][0]}模型表现最好。")
@@ -0,0 +1,336 @@
+from collections import OrderedDict
+from typing import Dict, Tuple
+import argparse
+import asyncio
+import json
+import math
+import os
+import numpy as np
+from JM import JMModel
+from GO import GOModel
+from MO import MOModel
+from S import SModel
+from stats import FailureStats
+from loader import load_failure_times
+from fitcache import SETTINGS
+
+MODELS = {"JM": JMModel, "GO": GOModel, "MO": MOModel, "S": SModel}  # 可拟合的模型
+DEFAULTS = {"JM": {"ex": 1e-3, "ey": 1e-3}, "GO": {"epslv": 1e-3}}  # 请求未给出时使用的精度参数
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+def _plain(value):
+    """
+    将NumPy数组和标量转换为可JSON序列化的值，非有限的浮点数转换为None。
+
+    :param value: 任意值。
+    :return: JSON值。
+    """
+    if isinstance(value, np.ndarray):
+        return [_plain(item) for item in value.tolist()]
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+class Dataset:
+    def __init__(self, t: np.ndarray, max_models: int = 8):
+        """
+        初始化Dataset类的实例。
+
+        数据集保存故障时间的充分统计量和在其上拟合过的模型。追加故障时统计量以O(1)更新，
+        版本号加一并清空已拟合的模型，下次请求时基于同一份统计量重新拟合。
+        已拟合的模型超过max_models个时按最近最少使用（LRU）的顺序淘汰。
+
+        :param t: 故障时间。
+        :param max_models: 最多保存的已拟合模型数。
+        """
+        self.stats = FailureStats(t)  # 故障数据的充分统计量
+        self.version = 0  # 数据版本号，每次追加故障后加一
+        self.max_models = max_models
+        self.models = OrderedDict()  # (模型名称, 设置)到已拟合模型的有序字典，最近使用的排在最后
+
+
+class FittingServer:
+    def __init__(self, max_datasets: int = 256, max_points: int = 10_000_000, max_models: int = 8,
+                 data_root: str = None):
+        """
+        初始化FittingServer类的实例。
+
+        服务常驻内存，保存已上传的数据集及拟合结果，数据集数或故障时间总数超过上限时按最近最少使用（LRU）的顺序淘汰。
+        请求和响应均为JSON，接口如下：
+        GET /health；GET /datasets；PUT /datasets/<名称>（times或path）；POST /datasets/<名称>/append（times）；
+        DELETE /datasets/<名称>；POST /fit；POST /curves；POST /gm。
+        path只能指向data_root目录下的文件，未设置data_root时不接受path。请求体不是JSON对象时返回400。
+        /gm使用实验2目录（ex2）中的GM模型，需要在启动前将该目录加入PYTHONPATH，否则/gm返回500和说明信息。
+
+        :param max_datasets: 最多保存的数据集数。
+        :param max_points: 所有数据集故障时间总数的上限。
+        :param max_models: 每个数据集最多保存的已拟合模型数。
+        :param data_root: 允许读取的服务端数据目录。
+        """
+        self.max_datasets = max_datasets
+        self.max_points = max_points
+        self.max_models = max_models
+        self.data_root = os.path.realpath(data_root) if data_root is not None else None
+        self.datasets = OrderedDict()  # 名称到Dataset的有序字典，最近使用的排在最后
+        self.points = 0  # 当前保存的故障时间总数
+
+    def _dataset(self, name: str) -> Dataset:
+        """
+        获取数据集并标记为最近使用。
+
+        :param name: 数据集名称。
+        :return: 数据集。
+        """
+        if name not in self.datasets:
+            raise KeyError(f"数据集{name}不存在。")
+        self.datasets.move_to_end(name)
+        return self.datasets[name]
+
+    def _evict(self):
+        """
+        淘汰最久未使用的数据集，直到数据集数和故障时间总数都不超过上限。最近使用的一个数据集总是保留。
+        """
+        while len(self.datasets) > 1 and (len(self.datasets) > self.max_datasets or self.points > self.max_points):
+            _, dataset = self.datasets.popitem(last=False)
+            self.points -= dataset.stats.n
+
+    def put_dataset(self, name: str, body: Dict) -> Dict:
+        """
+        上传或替换数据集，故障时间由times直接给出，或由path指定的data_root下的文件读取（不写入缓存）。
+
+        :param name: 数据集名称。
+        :param body: 请求体。
+        :return: 数据集信息。
+        """
+        if "times" in body:
+            t = np.asarray(body["times"], dtype=float)
+        elif "path" in body:
+            if self.data_root is None:
+                raise ValueError("服务未设置数据目录，不接受path，请直接上传times。")
+            path = os.path.realpath(os.path.join(self.data_root, body["path"]))
+            if os.path.commonpath([path, self.data_root]) != self.data_root:
+                raise ValueError("path应位于服务的数据目录下。")
+            t = np.array(load_failure_times(path, cache=False))
+        else:
+            raise ValueError("请求体应包含times或path。")
+        if t.ndim != 1 or len(t) < 2:
+            raise ValueError("故障时间应为至少包含两个元素的一维数组。")
+        if name in self.datasets:
+            self.points -= self.datasets.pop(name).stats.n
+        self.datasets[name] = Dataset(t, self.max_models)
+        self.points += len(t)
+        self._evict()
+        return {"dataset": name, "n": len(t), "version": 0}
+
+    def append(self, name: str, body: Dict) -> Dict:
+        """
+        向数据集追加故障时间。
+
+        :param name: 数据集名称。
+        :param body: 请求体，times为追加的故障时间列表。
+        :return: 数据集信息。
+        """
+        dataset = self._dataset(name)
+        times = np.atleast_1d(np.asarray(body.get("times", []), dtype=float))
+        # 先整体检查，避免追加到一半时出错留下部分更新的数据集
+        if len(times) and not (times[0] >= dataset.stats.tn and np.all(np.diff(times) >= 0)):
+            raise ValueError("追加的故障时间应单调不减，且不早于数据集最后一个故障时间。")
+        for value in times:
+            dataset.stats.append(float(value))
+        dataset.version += 1
+        dataset.models.clear()
+        self.points += len(times)
+        self._evict()
+        return {"dataset": name, "n": dataset.stats.n, "version": dataset.version}
+
+    def _model(self, body: Dict):
+        """
+        获取请求对应的已拟合模型，数据和设置未变化时直接复用内存中的模型。
+
+        :param body: 请求体，包含dataset、model以及ex、ey、epslv、solver等设置。
+        :return: (模型名称, 已拟合模型, 是否复用)。
+        """
+        name = body.get("model", "JM")
+        if name not in MODELS:
+            raise ValueError(f"未知的模型：{name}，可选：{'、'.join(MODELS)}")
+        dataset = self._dataset(body["dataset"])
+        settings = {**DEFAULTS.get(name, {}), **{key: body[key] for key in SETTINGS if key in body}}
+        key = (name, tuple(sorted(settings.items())))
+        if key in dataset.models:
+            dataset.models.move_to_end(key)
+            return name, dataset.models[key], True
+        model = MODELS[name]()
+        for setting, value in settings.items():
+            setattr(model, setting, value)
+        model.t = dataset.stats.t
+        model.calculate(dataset.stats)
+        dataset.models[key] = model
+        while len(dataset.models) > dataset.max_models:
+            dataset.models.popitem(last=False)
+        return name, model, False
+
+    def fit(self, body: Dict) -> Dict:
+        """
+        拟合模型并返回参数、求根统计信息、MTBF和失效率均值。
+
+        :param body: 请求体。
+        :return: 拟合结果。
+        """
+        name, model, reused = self._model(body)
+        if name == "JM":
+            parameters, valid = {"N0": model.N0, "Fi": model.Fi}, model.Fi > 0
+        else:
+            parameters, valid = {"a": model.a, "b": model.b}, model.b > 0
+        result = {"model": name, "reused": reused, **parameters,
+                  "iterations": model.iterations, "evaluations": model.evaluations,
+                  "residual": model.residual, "converged": model.converged}
+        if valid:
+            result["MTBF"] = model.calculate_MTBF()
+            result["failure_rate_mean"] = model.calculate_failure_rate_mean()
+        return {key: _plain(value) for key, value in result.items()}
+
+    def curves(self, body: Dict) -> Dict:
+        """
+        计算已拟合模型在时间网格t（及任务时长x）上的曲线。
+
+        :param body: 请求体，除fit的字段外还包含t和可选的x。
+        :return: 曲线。
+        """
+        name, model, reused = self._model(body)
+        curves = model.curves(np.asarray(body["t"], dtype=float), body.get("x"))
+        return {"model": name, "reused": reused, **{key: _plain(value) for key, value in curves.items()}}
+
+    def gm(self, body: Dict) -> Dict:
+        """
+        拟合GM(1,1)模型并预测后续数据。
+
+        :param body: 请求体，data为数据序列，predict为预测个数。
+        :return: 参数、拟合值、精度指标和预测值。
+        """
+        try:
+            from GM import GMModel  # GM模型位于实验2目录
+        except ImportError:
+            raise RuntimeError("GM模型不可用，请将实验2目录加入PYTHONPATH后启动服务，例如：PYTHONPATH=../ex2 python server.py")
+        model = GMModel()
+        model.set_model(list(body["data"]))
+        model.precision_evaluation()
+        return {key: _plain(value) for key, value in {
+            "a": model.argu_a, "b": model.argu_b, "C": model.C, "P": model.P,
+            "fitted": model.get_predicted_data(),
+            "prediction": model.predict(int(body.get("predict", 0))),
+        }.items()}
+
+    def dispatch(self, method: str, path: str, body: Dict) -> Tuple[int, Dict]:
+        """
+        按请求方法和路径分派请求。
+
+        :param method: 请求方法。
+        :param path: 请求路径。
+        :param body: 解析后的请求体。
+        :return: (状态码, 响应体)。
+        """
+        if not isinstance(body, dict):
+            return 400, {"error": "请求体应为JSON对象。"}
+        parts = [part for part in path.split("?")[0].split("/") if part]
+        try:
+            if parts == ["health"] and method == "GET":
+                return 200, {"status": "ok", "datasets": len(self.datasets), "points": self.points}
+            if parts == ["datasets"] and method == "GET":
+                return 200, {"datasets": [{"dataset": name, "n": dataset.stats.n, "version": dataset.version}
+                                          for name, dataset in self.datasets.items()]}
+            if len(parts) == 2 and parts[0] == "datasets":
+                if method == "PUT":
+                    return 200, self.put_dataset(parts[1], body)
+                if method == "DELETE":
+                    self.points -= self._dataset(parts[1]).stats.n
+                    del self.datasets[parts[1]]
+                    return 200, {"dataset": parts[1], "deleted": True}
+            if len(parts) == 3 and parts[0] == "datasets" and parts[2] == "append" and method == "POST":
+                return 200, self.append(parts[1], body)
+            handlers = {"fit": self.fit, "curves": self.curves, "gm": self.gm}
+            if len(parts) == 1 and parts[0] in handlers and method == "POST":
+                return 200, handlers[parts[0]](body)
+            return 404 if method in ("GET", "POST", "PUT", "DELETE") else 405, {"error": f"不支持的请求：{method} {path}"}
+        except KeyError as error:
+            message = error.args[0] if error.args else ""
+            if isinstance(message, str) and message.startswith("数据集"):
+                return 404, {"error": message}
+            return 400, {"error": f"请求体缺少字段：{message}"}
+        except (ValueError, TypeError, OSError) as error:
+            return 400, {"error": str(error)}
+        except RuntimeError as error:
+            return 500, {"error": str(error)}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        处理一个HTTP/1.1连接，支持同一连接上的多个请求（keep-alive）。
+
+        :param reader: 连接的读取端。
+        :param writer: 连接的写入端。
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, path, _ = line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = header.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                data = await reader.readexactly(int(headers.get("content-length", 0)))
+                try:
+                    body = json.loads(data) if data else {}
+                except ValueError:
+                    status, payload = 400, {"error": "请求体不是有效的JSON。"}
+                else:
+                    try:
+                        status, payload = self.dispatch(method, path, body)
+                    except Exception as error:  # 保持服务运行，错误返回给客户端
+                        status, payload = 500, {"error": repr(error)}
+                response = json.dumps(payload, ensure_ascii=False).encode()
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                             f"Content-Type: application/json; charset=utf-8\r\n"
+                             f"Content-Length: {len(response)}\r\n\r\n".encode() + response)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765):
+        """
+        在host:port上启动服务并一直运行。
+
+        :param host: 监听地址，默认只监听本机。
+        :param port: 监听端口。
+        """
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="常驻内存的JM、GO、MO、S型和GM模型拟合服务",
+                                     epilog="/gm需要将实验2目录加入PYTHONPATH，例如：PYTHONPATH=../ex2 python server.py")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8765, help="监听端口")
+    parser.add_argument("--max-datasets", type=int, default=256, help="最多保存的数据集数")
+    parser.add_argument("--max-points", type=int, default=10_000_000, help="所有数据集故障时间总数的上限")
+    parser.add_argument("--max-models", type=int, default=8, help="每个数据集最多保存的已拟合模型数")
+    parser.add_argument("--data-root", help="允许通过path读取的服务端数据目录，不设置时不接受path")
+    args = parser.parse_args()
+    print(f"拟合服务运行在http://{args.host}:{args.port}")
+    asyncio.run(FittingServer(args.max_datasets, args.max_points, args.max_models, args.data_root)
+                .serve(args.host, args.port))
@@ -0,0 +1,327 @@
+from typing import Callable, Optional, Tuple
+import math
+from scipy import optimize
+
+
+MAX_ITERATIONS = "达到最大迭代次数，可能未收敛"  # 未收敛原因：迭代次数用完
+NO_SIGN_CHANGE = "区间端点函数值同号，区间内没有可求的根"  # 未收敛原因：区间不变号
+
+
+class ConvergenceWarning(UserWarning):
+    """
+    求根未收敛时发出的警告。
+    """
+
+
+class SolverResult:
+    def __init__(self, root: float, iterations: int, evaluations: int, residual: float, converged: bool,
+                 reason: str = None):
+        """
+        初始化SolverResult类的实例。
+
+        :param root: 求得的根。
+        :param iterations: 迭代次数。
+        :param evaluations: 函数求值次数（含导数求值）。
+        :param residual: 根处的函数值。
+        :param converged: 是否在最大迭代次数内满足精度要求。
+        :param reason: 未收敛的原因，MAX_ITERATIONS或NO_SIGN_CHANGE，收敛时为None。
+        """
+        self.root = root
+        self.iterations = iterations
+        self.evaluations = evaluations
+        self.residual = residual
+        self.converged = converged
+        self.reason = reason
+
+
+class _Counter:
+    def __init__(self, f: Callable[[float], float]):
+        """
+        包装函数f，统计求值次数并记录最近一次求值的位置和结果。
+
+        :param f: 被包装的函数。
+        """
+        self.f = f
+        self.count = 0
+        self.last_x = None
+        self.last_y = None
+
+    def __call__(self, x: float) -> float:
+        self.count += 1
+        self.last_x = x
+        self.last_y = self.f(x)
+        return self.last_y
+
+    def residual(self, x: float) -> float:
+        """
+        返回x处的函数值，若x恰为最近一次求值的位置则不重复求值。
+
+        :param x: 自变量。
+        :return: 函数值。
+        """
+        if x == self.last_x:
+            return self.last_y
+        return self(x)
+
+
+def _check_bracket(f: _Counter, left: float, right: float,
+                   ftol: float) -> Tuple[float, float, Optional[SolverResult]]:
+    """
+    计算区间端点的函数值并检查区间是否变号。
+
+    端点函数值同号时区间内没有可求的根，不再迭代，返回|f|较小的端点：该端点满足ftol时视为收敛，
+    否则converged为False，原因为NO_SIGN_CHANGE。
+
+    :param f: 计数的目标函数。
+    :param left: 区间左端点。
+    :param right: 区间右端点。
+    :param ftol: 函数值精度。
+    :return: (f(left), f(right), 结果)，区间变号时结果为None。
+    """
+    fl, fr = f(left), f(right)
+    if fl * fr > 0:
+        x, y = (left, fl) if math.fabs(fl) <= math.fabs(fr) else (right, fr)
+        if math.fabs(y) <= ftol:
+            return fl, fr, SolverResult(x, 0, f.count, y, True)
+        return fl, fr, SolverResult(x, 0, f.count, y, False, NO_SIGN_CHANGE)
+    return fl, fr, None
+
+
+def bisection(f: Callable[[float], float], left: float, right: float, xtol: float, ftol: float,
+              max_iterations: int = 1000, df: Optional[Callable[[float], float]] = None,
+              x0: Optional[float] = None) -> SolverResult:
+    """
+    二分法求根。
+
+    先检查区间端点函数值是否变号，同号时不迭代，返回converged为False的结果。
+    函数值与左端点同号时收缩左端点，否则收缩右端点。区间宽度不超过xtol或|f(中点)|不超过ftol时停止，根取当前区间中点。
+
+    :param f: 目标函数，在[left, right]两端异号。
+    :param left: 区间左端点。
+    :param right: 区间右端点。
+    :param xtol: 区间宽度精度。
+    :param ftol: 函数值精度。
+    :param max_iterations: 最大迭代次数。
+    :param df: 导数，二分法不使用。
+    :param x0: 初始猜测，二分法不使用。
+    :return: 求根结果。
+    """
+    f = _Counter(f)
+    fl, _, result = _check_bracket(f, left, right, ftol)
+    if result is not None:
+        return result
+    for iteration in range(max_iterations):
+        xm = (left + right) / 2
+        if math.fabs(right - left) <= xtol:
+            return SolverResult(xm, iteration, f.count, f.residual(xm), True)
+        y = f(xm)
+        if math.fabs(y) <= ftol:
+            return SolverResult(xm, iteration + 1, f.count, y, True)
+        if (y > 0) == (fl > 0):
+            left = xm
+        else:
+            right = xm
+    xm = (left + right) / 2
+    return SolverResult(xm, max_iterations, f.count, f.residual(xm), False, MAX_ITERATIONS)
+
+
+def newton(f: Callable[[float], float], left: float, right: float, xtol: float, ftol: float,
+           max_iterations: int = 1000, df: Optional[Callable[[float], float]] = None,
+           x0: Optional[float] = None) -> SolverResult:
+    """
+    带区间保护的牛顿法求根。
+
+    与二分法相同，先检查区间端点函数值是否变号。始终维护一个变号区间，牛顿步落在区间外或导数为0时退化为二分步，
+    因此收敛性不差于二分法，在根附近为二次收敛。
+
+    :param f: 目标函数，在[left, right]两端异号。
+    :param left: 区间左端点。
+    :param right: 区间右端点。
+    :param xtol: 步长及区间宽度精度。
+    :param ftol: 函数值精度。
+    :param max_iterations: 最大迭代次数。
+    :param df: 导数，为None时使用割线近似。
+    :param x0: 初始猜测，为None或不在区间内时取区间中点。
+    :return: 求根结果。
+    """
+    f = _Counter(f)
+    fl, _, result = _check_bracket(f, left, right, ftol)
+    if result is not None:
+        return result
+    derivative_count = 0
+    x = x0 if x0 is not None and left < x0 < right else (left + right) / 2
+    prev_x, prev_y = None, None
+    for iteration in range(max_iterations):
+        y = f(x)
+        if math.fabs(y) <= ftol:
+            return SolverResult(x, iteration + 1, f.count + derivative_count, y, True)
+        if (y > 0) == (fl > 0):
+            left = x
+        else:
+            right = x
+        if math.fabs(right - left) <= xtol:
+            return SolverResult(x, iteration + 1, f.count + derivative_count, y, True)
+
+        if df is not None:
+            slope = df(x)
+            derivative_count += 1
+        elif prev_x is not None and x != prev_x:
+            slope = (y - prev_y) / (x - prev_x)
+        else:
+            slope = 0
+        prev_x, prev_y = x, y
+
+        x_new = x - y / slope if slope != 0 else None
+        if x_new is None or not (left < x_new < right):
+            x_new = (left + right) / 2  # 牛顿步越界，改用二分步
+        if math.fabs(x_new - x) <= xtol:
+            return SolverResult(x_new, iteration + 1, f.count + derivative_count, f.residual(x_new), True)
+        x = x_new
+    return SolverResult(x, max_iterations, f.count + derivative_count, f.residual(x), False, MAX_ITERATIONS)
+
+
+def illinois(f: Callable[[float], float], left: float, right: float, xtol: float, ftol: float,
+             max_iterations: int = 1000, df: Optional[Callable[[float], float]] = None,
+             x0: Optional[float] = None) -> SolverResult:
+    """
+    Illinois改进的试位法求根。
+
+    同一端点连续保留两次时将其函数值减半，避免普通试位法一端停滞的问题。先检查区间端点函数值是否变号，
+    迭代点始终限制在当前区间内。
+
+    :param f: 目标函数，在[left, right]两端异号。
+    :param left: 区间左端点。
+    :param right: 区间右端点。
+    :param xtol: 区间宽度精度。
+    :param ftol: 函数值精度。
+    :param max_iterations: 最大迭代次数。
+    :param df: 导数，试位法不使用。
+    :param x0: 初始猜测，试位法不使用。
+    :return: 求根结果。
+    """
+    f = _Counter(f)
+    fl, fr, result = _check_bracket(f, left, right, ftol)
+    if result is not None:
+        return result
+    if fl == 0:
+        return SolverResult(left, 0, f.count, fl, True)
+    side = 0  # 上一次保留的端点：-1为左端点，1为右端点
+    x = left
+    for iteration in range(max_iterations):
+        x = min(max((left * fr - right * fl) / (fr - fl), left), right)  # 舍入误差不使迭代点越出区间
+        y = f(x)
+        if math.fabs(y) <= ftol:
+            return SolverResult(x, iteration + 1, f.count, y, True)
+        if (y > 0) == (fl > 0):
+            left, fl = x, y
+            if side == 1:
+                fr /= 2
+            side = 1
+        else:
+            right, fr = x, y
+            if side == -1:
+                fl /= 2
+            side = -1
+        if math.fabs(right - left) <= xtol:
+            return SolverResult(x, iteration + 1, f.count, y, True)
+    return SolverResult(x, max_iterations, f.count, f.residual(x), False, MAX_ITERATIONS)
+
+
+def brent(f: Callable[[float], float], left: float, right: float, xtol: float, ftol: float,
+          max_iterations: int = 1000, df: Optional[Callable[[float], float]] = None,
+          x0: Optional[float] = None) -> SolverResult:
+    """
+    Brent法求根，基于scipy.optimize.brentq。
+
+    与其他方法相同，先检查区间端点函数值是否变号。brentq只按xtol判断收敛，ftol仅用于判断最终残差是否满足要求。
+
+    :param f: 目标函数，在[left, right]两端异号。
+    :param left: 区间左端点。
+    :param right: 区间右端点。
+    :param xtol: 区间宽度精度。
+    :param ftol: 函数值精度。
+    :param max_iterations: 最大迭代次数。
+    :param df: 导数，Brent法不使用。
+    :param x0: 初始猜测，Brent法不使用。
+    :return: 求根结果。
+    """
+    f = _Counter(f)
+    _, _, result = _check_bracket(f, left, right, ftol)
+    if result is not None:
+        return result
+    try:
+        root, info = optimize.brentq(f, left, right, xtol=xtol, maxiter=max_iterations,
+                                     full_output=True, disp=False)
+    except ValueError:
+        # 函数值为NaN等原因无法求根
+        x = (left + right) / 2
+        return SolverResult(x, 0, f.count, f.residual(x), False, NO_SIGN_CHANGE)
+    residual = f.residual(root)
+    converged = info.converged or math.fabs(residual) <= ftol
+    return SolverResult(root, info.iterations, f.count, residual, converged, None if converged else MAX_ITERATIONS)
+
+
+def warm_bracket(f: Callable[[float], float], x0: float, left: float, right: float,
+                 step: float) -> Tuple[float, float, int]:
+    """
+    从初始猜测x0出发向根的一侧倍增步长搜索，在[left, right]内找到包含根的更小区间。
+
+    与bisection、newton相同，约定f在根左侧为正、右侧为负。用于数据略有变化后以上一次的根热启动求根。
+
+    :param f: 目标函数，在[left, right]内由正变负。
+    :param x0: 初始猜测，通常为上一次求得的根。
+    :param left: 区间左端点。
+    :param right: 区间右端点。
+    :param step: 初始步长。
+    :return: (left, right, evaluations)，缩小后的区间及函数求值次数。
+    """
+    if x0 is None or not left < x0 < right:
+        return left, right, 0
+    evaluations = 1
+    if f(x0) > 0:
+        lo = x0
+        while lo + step < right:
+            evaluations += 1
+            if f(lo + step) <= 0:
+                return lo, lo + step, evaluations
+            lo += step
+            step *= 2
+        return lo, right, evaluations
+    hi = x0
+    while hi - step > left:
+        evaluations += 1
+        if f(hi - step) > 0:
+            return hi - step, hi, evaluations
+        hi -= step
+        step *= 2
+    return left, hi, evaluations
+
+
+SOLVERS = {
+    "bisection": bisection,
+    "newton": newton,
+    "illinois": illinois,
+    "brent": brent,
+}
+
+
+def solve(method: str, f: Callable[[float], float], left: float, right: float, xtol: float, ftol: float,
+          max_iterations: int = 1000, df: Optional[Callable[[float], float]] = None,
+          x0: Optional[float] = None) -> SolverResult:
+    """
+    按名称调用求根方法。
+
+    :param method: 求根方法名称，可选"bisection"、"newton"、"illinois"、"brent"。
+    :param f: 目标函数，在[left, right]两端异号。
+    :param left: 区间左端点。
+    :param right: 区间右端点。
+    :param xtol: 区间宽度精度。
+    :param ftol: 函数值精度。
+    :param max_iterations: 最大迭代次数。
+    :param df: 导数，仅牛顿法使用。
+    :param x0: 初始猜测，仅牛顿法使用。
+    :return: 求根结果。
+    """
+    if method not in SOLVERS:
+        raise ValueError(f"未知的求根方法：{method}，可选：{', '.join(SOLVERS)}")
+    return SOLVERS[method](f, left, right, xtol, ftol, max_iterations, df, x0)
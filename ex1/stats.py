@@ -0,0 +1,165 @@
+from typing import List, Union
+import numpy as np
+import math
+from scipy.special import digamma, gammaln, polygamma
+
+
+class FailureStats:
+    def __init__(self, t: Union[List[float], np.ndarray]):
+        """
+        初始化FailureStats类的实例。
+
+        该方法将故障时间转换为NumPy数组，并一次性计算JM、GO模型所需的充分统计量：
+        故障数n、最后一个故障时间tn、加权间隔和sum((i-1)*(t_i - t_{i-1}))、P值、
+        故障时间和以及D值。NHPP模型还使用全部故障时间之和。
+
+        :param t: 故障时间列表或数组。
+        """
+        self._buffer = np.asarray(t, dtype=float)  # 故障时间缓冲区，追加故障时按倍增策略扩容
+        self.n = len(self._buffer)  # 故障数
+        self.tn = self.t[-1]  # 最后一个故障时间
+        # 加权间隔和：sum((i-1)*(t_i - t_{i-1}))，i从1到n-1
+        self.weighted_sum = float(np.dot(np.arange(self.n - 1), np.diff(self.t)))
+        self.time_sum = float(self.t[1:].sum())  # 故障时间和sum(t_i)，i从1到n-1
+        self.total_sum = self.time_sum + float(self.t[0])  # 全部故障时间之和，NHPP模型的似然方程使用
+        self._update_derived()
+
+    @property
+    def t(self) -> np.ndarray:
+        """
+        故障时间数组，为缓冲区前n个元素的视图。
+        """
+        return self._buffer[:self.n]
+
+    def _update_derived(self):
+        """
+        根据累加量更新P值和D值。tn为0时两者为inf或NaN，模型据此判定无解。
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.P = self.weighted_sum / self.tn  # JM模型中的P值
+            self.D = self.time_sum / self.tn / self.n  # GO模型中的D值
+
+    def append(self, t_new: float):
+        """
+        追加一个新的故障时间，并以O(1)的代价更新所有充分统计量。
+
+        :param t_new: 新的故障时间，不能早于最后一个故障时间tn。
+        """
+        if not t_new >= self.tn:
+            raise ValueError(f"新的故障时间{t_new}早于最后一个故障时间{self.tn}。")
+        if self.n == len(self._buffer):
+            buffer = np.empty(max(2 * self.n, 16))
+            buffer[:self.n] = self._buffer[:self.n]
+            self._buffer = buffer
+        self._buffer[self.n] = t_new
+        # 新故障的序号i = n，对加权间隔和的贡献为(i-1)*(t_i - t_{i-1})
+        self.weighted_sum += (self.n - 1) * (t_new - self.tn)
+        self.time_sum += t_new
+        self.total_sum += t_new
+        self.n += 1
+        self.tn = self._buffer[self.n - 1]
+        self._update_derived()
+
+    def harmonic(self, N: float) -> float:
+        """
+        计算调和级数sum(1/(N-i+1))，i从1到n-1。
+
+        利用双伽马函数恒等式 sum(1/k, k=N-n+2..N) = digamma(N+1) - digamma(N-n+2)，
+        计算量与故障数n无关。
+
+        :param N: 待计算的N值，要求N > n-2。
+        :return: 调和级数的值。
+        """
+        return float(digamma(N + 1) - digamma(N - self.n + 2))
+
+    def jm_function(self, N: float) -> float:
+        """
+        计算JM模型似然方程在N处的函数值。
+
+        :param N: 待计算的N值。
+        :return: 函数值。
+        """
+        return self.harmonic(N) - (self.n - 1) / (N - self.P)
+
+    def jm_derivative(self, N: float) -> float:
+        """
+        计算JM模型似然方程在N处的导数值。
+
+        :param N: 待计算的N值。
+        :return: 导数值。
+        """
+        return float(polygamma(1, N + 1) - polygamma(1, N - self.n + 2)) + (self.n - 1) / (N - self.P) ** 2
+
+    def jm_Fi(self, N0: float) -> float:
+        """
+        根据N0计算JM模型的故障强度Fi。
+
+        :param N0: 初始故障数。
+        :return: 故障强度Fi。
+        """
+        return (self.n - 1) / (N0 * self.tn - self.weighted_sum)
+
+    def jm_log_likelihood(self, N0: float, Fi: float) -> float:
+        """
+        计算JM模型在(N0, Fi)处的对数似然。
+
+        第i个故障间隔x_i（i从1到n-1）服从参数为Fi*(N0-i+1)的指数分布，与jm_Fi和似然方程（P = 加权间隔和/tn）一致，
+        第一个间隔从0开始计算，即x_1 = t_1，因此拟合得到的(N0, Fi)正是该对数似然的极大值点。对数似然为
+        (n-1)*ln(Fi) + sum(ln(N0-i+1)) - Fi*sum((N0-i+1)*x_i)，
+        其中sum(ln(N0-i+1)) = lnΓ(N0+1) - lnΓ(N0-n+2)，sum((N0-i+1)*x_i) = N0*tn - 加权间隔和，计算量与n无关。
+
+        :param N0: 初始故障数，要求N0 > n-2。
+        :param Fi: 故障强度。
+        :return: 对数似然值。
+        """
+        n = self.n
+        exposure = N0 * self.tn - self.weighted_sum
+        return float((n - 1) * math.log(Fi) + gammaln(N0 + 1) - gammaln(N0 - n + 2) - Fi * exposure)
+
+    def go_function(self, xm: float) -> float:
+        """
+        计算GO模型方程(1 - D*xm)*e^xm + (D-1)*xm - 1在xm处的函数值。
+
+        :param xm: 待计算的xm值。
+        :return: 函数值。
+        """
+        return (1 - self.D * xm) * math.exp(xm) + (self.D - 1) * xm - 1
+
+    def go_derivative(self, xm: float) -> float:
+        """
+        计算GO模型方程在xm处的导数值。
+
+        :param xm: 待计算的xm值。
+        :return: 导数值。
+        """
+        return (1 - self.D - self.D * xm) * math.exp(xm) + self.D - 1
+
+
+class GroupedFailureStats:
+    def __init__(self, counts: Union[List[float], np.ndarray], endpoints: Union[List[float], np.ndarray] = None):
+        """
+        初始化GroupedFailureStats类的实例。
+
+        分组数据给出各时间区间(s_{j-1}, s_j]内的故障数y_j，其中s_0 = 0。该类计算NHPP模型分组似然所需的量：
+        总故障数n、观测终止时间tn = s_k，以及各区间端点除以tn后的相对位置。故障数为0的区间对似然方程没有贡献，
+        只保留故障数为正的区间，因此拟合的计算量与区间数而不是故障数成正比。
+
+        :param counts: 各区间的故障数。
+        :param endpoints: 各区间的右端点，为None时取1, 2, ..., k（即单位长度的区间）。
+        """
+        counts = np.asarray(counts, dtype=float)
+        endpoints = np.arange(1, len(counts) + 1, dtype=float) if endpoints is None \
+            else np.asarray(endpoints, dtype=float)
+        if counts.ndim != 1 or counts.shape != endpoints.shape or len(counts) == 0:
+            raise ValueError("区间故障数和区间端点应为长度相同的非空一维数组。")
+        if np.any(counts < 0) or not np.all(np.diff(endpoints) > 0) or not endpoints[0] > 0:
+            raise ValueError("区间故障数应非负，区间端点应为正且严格递增。")
+        lower = np.concatenate([[0.0], endpoints[:-1]])
+        positive = counts > 0
+        self.counts = counts[positive]  # 故障数为正的区间的故障数y_j
+        self.upper = endpoints[positive]  # 这些区间的右端点
+        self.lower = lower[positive]  # 这些区间的左端点
+        self.n = float(counts.sum())  # 总故障数
+        self.tn = float(endpoints[-1])  # 观测终止时间
+        self.u_upper = self.upper / self.tn  # 右端点的相对位置
+        self.u_lower = self.lower / self.tn  # 左端点的相对位置
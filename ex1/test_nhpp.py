@@ -0,0 +1,37 @@
+import os
+import numpy as np
+import pytest
+from scipy import optimize
+from GO import GOModel
+from MO import MOModel
+from S import SModel
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test.txt")
+
+
+@pytest.mark.parametrize("model_class", [MOModel, SModel])
+def test_failed_refit_clears_parameters(model_class):
+    model = model_class()
+    model.read_data(DATA)
+    model.calculate()
+    assert model.converged and model.b > 0
+    model.t = np.sqrt(np.arange(1.0, 50.0)) * 100  # 故障间隔越来越短，没有可靠性增长，似然方程无正根
+    model.calculate()
+    assert model.converged is False
+    assert model.a == 0 and model.b == 0
+
+
+def test_go_grouped_fit_with_default_settings():
+    counts = [12, 9, 9, 7, 6, 5, 4, 3, 3, 2, 2, 1]
+    model = GOModel()
+    model.fit_grouped(counts)
+    assert model.converged and model.a > 0 and model.b > 0
+
+    def negative_log_likelihood(parameters):
+        model_at = GOModel()
+        model_at.a, model_at.b = parameters
+        return -model_at.log_likelihood(model.stats)
+
+    best = optimize.minimize(negative_log_likelihood, [sum(counts), 0.1], method="Nelder-Mead",
+                             options={"xatol": 1e-10, "fatol": 1e-12, "maxiter": 10000})
+    assert np.allclose([model.a, model.b], best.x, rtol=1e-5)
@@ -0,0 +1,17 @@
+import math
+import os
+from loader import load_failure_times
+from prequential import prequential
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test.txt")
+
+
+def test_prequential_on_non_monotone_data():
+    # test.txt中的故障时间不是单调递增的，追加早于tn的故障时间时模型应从头重新拟合而不是中止
+    t = load_failure_times(DATA, cache=False)
+    result = prequential(t, 1e-3, 1e-3, 1e-3, start=10)
+    assert result["jm_predictions"] > 0 and result["go_predictions"] > 0
+    assert math.isfinite(result["jm_ks"]) and math.isfinite(result["go_ks"])
+    assert math.isfinite(result["log_plr"])
+    forward = sum(t[k] >= t[k - 1] for k in range(10, len(t)))  # 只有非负的故障间隔参与预测
+    assert result["jm_predictions"] <= forward and result["go_predictions"] <= forward
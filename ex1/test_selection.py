@@ -0,0 +1,38 @@
+import numpy as np
+from benchmark import simulate_jm
+from GO import GOModel
+from JM import JMModel
+from selection import evaluate_model, select_batch
+
+
+def _fit_jm(t):
+    model = JMModel()
+    model.ex = model.ey = 1e-12
+    model.solver = "brent"
+    model.t = t
+    model.calculate()
+    return model
+
+
+def test_jm_log_likelihood_is_maximal_at_fit():
+    t = simulate_jm(60, seed=3) + 150  # 第一个故障时间远离0，两种暴露量定义的差别明显
+    model = _fit_jm(t)
+    assert model.converged and model.Fi > 0
+    best = model.stats.jm_log_likelihood(model.N0, model.Fi)
+    for dN0, dFi in [(1e-3, 0), (-1e-3, 0), (0, 1e-3), (0, -1e-3), (1e-3, 1e-3), (-1e-3, -1e-3)]:
+        N0, Fi = model.N0 * (1 + dN0), model.Fi * (1 + dFi)
+        assert model.stats.jm_log_likelihood(N0, Fi) < best
+
+
+def test_select_batch_matches_evaluate_model():
+    data = [simulate_jm(60, seed=seed) + 150 for seed in range(3)]
+    offsets = np.cumsum([0] + [len(t) for t in data])
+    result = select_batch(offsets, np.concatenate(data), 1e-12, 1e-12, 1e-12)
+    for k, t in enumerate(data):
+        jm = _fit_jm(t)
+        go = GOModel()
+        go.epslv = 1e-12
+        go.t = t
+        go.calculate()
+        assert np.isclose(result["JM"]["log_likelihood"][k], evaluate_model(jm)["log_likelihood"], rtol=1e-6)
+        assert np.isclose(result["GO"]["log_likelihood"][k], evaluate_model(go)["log_likelihood"], rtol=1e-6)
@@ -0,0 +1,17 @@
+import pytest
+from server import FittingServer
+
+
+@pytest.mark.parametrize("body", [[1, 2], "x", 3, None])
+def test_non_object_body_is_bad_request(body):
+    server = FittingServer()
+    for method, path in [("POST", "/fit"), ("PUT", "/datasets/a"), ("POST", "/gm")]:
+        status, payload = server.dispatch(method, path, body)
+        assert status == 400 and "error" in payload
+
+
+def test_fit_roundtrip():
+    server = FittingServer()
+    assert server.dispatch("PUT", "/datasets/a", {"times": [1.0, 3.0, 6.0, 10.0, 15.0, 21.0]})[0] == 200
+    status, payload = server.dispatch("POST", "/fit", {"dataset": "a", "model": "GO"})
+    assert status == 200 and payload["model"] == "GO"
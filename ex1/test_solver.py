@@ -0,0 +1,47 @@
+import math
+import os
+import warnings
+import pytest
+from JM import JMModel
+from loader import load_failure_times
+from solver import NO_SIGN_CHANGE, SOLVERS, ConvergenceWarning, solve
+from stats import FailureStats
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test.txt")
+
+
+@pytest.mark.parametrize("method", list(SOLVERS))
+def test_root_inside_bracket(method):
+    result = solve(method, lambda x: 2 - x * x, 0.0, 3.0, 1e-12, 1e-12, df=lambda x: -2 * x)
+    assert result.converged and result.reason is None
+    assert 0.0 <= result.root <= 3.0
+    assert math.isclose(result.root, math.sqrt(2), rel_tol=1e-9)
+
+
+@pytest.mark.parametrize("method", list(SOLVERS))
+def test_no_sign_change_is_not_converged(method):
+    result = solve(method, lambda x: 1 + x * x, -1.0, 1.0, 1e-9, 1e-9)
+    assert not result.converged
+    assert result.reason == NO_SIGN_CHANGE
+    assert -1.0 <= result.root <= 1.0
+
+
+@pytest.mark.parametrize("method", list(SOLVERS))
+def test_jm_bracket_without_root(method):
+    # test.txt上JM的区间[135, 136]两端函数值都为负
+    stats = FailureStats(load_failure_times(DATA, cache=False))
+    result = solve(method, stats.jm_function, 135, 136, 1e-3, 1e-3, df=stats.jm_derivative)
+    assert not result.converged
+    assert result.reason == NO_SIGN_CHANGE
+    assert 135 <= result.root <= 136
+
+
+def test_jm_warns_with_solver_reason():
+    model = JMModel()
+    model.ex = model.ey = 1e-3
+    model.t = load_failure_times(DATA, cache=False)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ConvergenceWarning)
+        model.calculate()
+    assert not model.converged
+    assert any(NO_SIGN_CHANGE in str(warning.message) for warning in caught)
@@ -2,6 +2,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from JM import JMModel
 from GO import GOModel
+from fitcache import FitCache
 import os
 
 plt.rcParams["font.sans-serif"] = ["SimHei"]  # 设置字体
@@ -27,18 +28,20 @@ def visualize_models():
     # 设置GO模型参数
     go_model.set_epslv()
 
-    # 计算JM模型和GO模型的相关参数
-    jm_model.calculate()
-    go_model.calculate()
+    # 计算JM模型和GO模型的相关参数，数据和精度参数未变化时直接使用缓存的结果
+    fit_cache = FitCache()
+    fit_cache.fit(jm_model)
+    fit_cache.fit(go_model)
+    fit_cache.close()
 
     # 时间范围
     time_range = np.linspace(0, 6000, 1000)
 
     # JM模型预测的故障数量
-    jm_cumulative_failures = jm_model.N0 * (1 - np.exp(-jm_model.Fi * time_range))
+    jm_cumulative_failures = jm_model.mean_value(time_range)
 
     # GO模型预测的故障数量
-    go_cumulative_failures = go_model.a * (1 - np.exp(-go_model.b * time_range))
+    go_cumulative_failures = go_model.mean_value(time_range)
 
     # 实际故障数量
     actual_cumulative_failures = np.arange(1, len(jm_model.t) + 1)
@@ -1,5 +1,166 @@
+import time
 import numpy as np
-from scipy import interpolate
+from scipy import linalg
+
+
+def find_extrema(y):
+    """
+    寻找序列的极大值点和极小值点的下标
+
+    由一阶差分diff的符号一次性判断所有内部点：左侧不下降且右侧不上升为极大值，左侧不上升且右侧不下降为极小值
+    （与逐点比较相邻值的判断方式相同，平台上的点同时计入）。两个端点按同样的规则只与一侧相邻点比较。
+
+    参数:
+    y (numpy.ndarray或类似可迭代对象): 数据序列，至少包含2个数据。
+
+    返回:
+    tuple: 两个下标数组，分别是极大值点和极小值点的下标，按从小到大排列。
+    """
+    d = np.diff(np.asarray(y, dtype=float))
+    is_max = np.empty(len(d) + 1, dtype=bool)
+    is_min = np.empty(len(d) + 1, dtype=bool)
+    is_max[1:-1] = (d[:-1] >= 0) & (d[1:] <= 0)
+    is_min[1:-1] = (d[:-1] <= 0) & (d[1:] >= 0)
+    is_max[0], is_min[0] = d[0] <= 0, d[0] >= 0
+    is_max[-1], is_min[-1] = d[-1] >= 0, d[-1] <= 0
+    return np.flatnonzero(is_max), np.flatnonzero(is_min)
+
+
+def count_zero_crossings(y):
+    """
+    统计序列的过零次数，即相邻两个数据符号相反（乘积小于零）的次数
+
+    参数:
+    y (numpy.ndarray或类似可迭代对象): 数据序列。
+
+    返回:
+    int: 过零次数。
+    """
+    y = np.asarray(y, dtype=float)
+    return int(np.count_nonzero(((y[:-1] < 0) & (y[1:] > 0)) | ((y[:-1] > 0) & (y[1:] < 0))))
+
+
+class SplineEnvelope:
+    def __init__(self, boundary="not-a-knot"):
+        """
+        初始化三次样条包络线引擎的对象
+
+        引擎按序列长度缓存等间距的求值网格以及求值时使用的下标和偏移缓冲区，同一次分解中网格不变，无需重复生成。
+        上下两条包络线的三次样条由节点处的一阶导数确定，两组三对角方程拼成一个块对角的带状方程组，只调用一次solve_banded求解。
+
+        参数:
+        boundary (str, 可选): 边界条件，"not-a-knot"与interpolate.splrep(k=3, s=0)的插值样条相同，
+                              "natural"为两端二阶导数为零的自然样条。默认值为"not-a-knot"。
+        """
+        if boundary not in ("not-a-knot", "natural"):
+            raise ValueError(f"未知的边界条件：{boundary}，可选：not-a-knot、natural")
+        self.boundary = boundary  # 样条的边界条件
+        self.grid = None  # 求值网格
+        self._key = None  # 当前网格对应的(最小值, 最大值, 长度)
+        self._index = None  # 网格点所在的样条区间下标，形状为(2, 长度)
+        self._offset = None  # 网格点相对区间左端点的偏移，形状为(2, 长度)
+        self._term = None  # 求值时的临时缓冲区，形状为(2, 长度)
+        self._out = None  # 包络线输出缓冲区，形状为(2, 长度)
+
+    def prepare(self, xmin, xmax, length):
+        """
+        准备求值网格和缓冲区，最小值、最大值和长度不变时直接复用
+
+        参数:
+        xmin (float): 网格的最小值。
+        xmax (float): 网格的最大值。
+        length (int): 网格长度。
+
+        返回:
+        numpy.ndarray: 求值网格。
+        """
+        key = (float(xmin), float(xmax), int(length))
+        if key != self._key:
+            self._key = key
+            self.grid = np.linspace(xmin, xmax, length)
+            self._index = np.empty((2, length), dtype=np.intp)
+            self._offset = np.empty((2, length))
+            self._term = np.empty((2, length))
+            self._out = np.empty((2, length))
+        return self.grid
+
+    def _system(self, x, y, ab, b):
+        """
+        填写一组节点的一阶导数所满足的三对角方程组
+
+        参数:
+        x (numpy.ndarray): 严格递增的节点，至少包含4个数据。
+        y (numpy.ndarray): 节点处的值。
+        ab (numpy.ndarray): 带状矩阵中对应这一组节点的切片，形状为(3, 节点数)。
+        b (numpy.ndarray): 右端项中对应这一组节点的切片。
+
+        返回:
+        tuple: 包含两个数组，分别是相邻节点的间距和各区间的斜率。
+        """
+        dx = np.diff(x)
+        slope = np.diff(y) / dx
+        ab[0, 2:] = dx[:-1]
+        ab[1, 1:-1] = 2 * (dx[:-1] + dx[1:])
+        ab[2, :-2] = dx[1:]
+        b[1:-1] = 3 * (dx[1:] * slope[:-1] + dx[:-1] * slope[1:])
+        if self.boundary == "natural":
+            ab[1, 0], ab[0, 1], b[0] = 2, 1, 3 * slope[0]
+            ab[2, -2], ab[1, -1], b[-1] = 1, 2, 3 * slope[-1]
+        else:
+            d = x[2] - x[0]
+            ab[1, 0], ab[0, 1] = dx[1], d
+            b[0] = ((dx[0] + 2 * d) * dx[1] * slope[0] + dx[0] ** 2 * slope[1]) / d
+            d = x[-1] - x[-3]
+            ab[1, -1], ab[2, -2] = dx[-2], d
+            b[-1] = (dx[-1] ** 2 * slope[-2] + (2 * d + dx[-1]) * dx[-2] * slope[-1]) / d
+        return dx, slope
+
+    def envelopes(self, x_upper, y_upper, x_lower, y_lower):
+        """
+        在求值网格上计算通过极大值点和极小值点的两条三次样条包络线
+
+        网格超出节点范围的部分按首末区间的三次多项式外推，与interpolate.splev的默认行为相同。
+
+        参数:
+        x_upper (numpy.ndarray): 极大值点的x值，严格递增，至少包含4个数据。
+        y_upper (numpy.ndarray): 极大值点的y值。
+        x_lower (numpy.ndarray): 极小值点的x值，严格递增，至少包含4个数据。
+        y_lower (numpy.ndarray): 极小值点的y值。
+
+        返回:
+        numpy.ndarray: 形状为(2, 网格长度)的输出缓冲区，两行分别是上包络线和下包络线，下一次调用时会被覆盖。
+        """
+        if self.grid is None:
+            raise ValueError("请先调用prepare准备求值网格。")
+        nu, nl = len(x_upper), len(x_lower)
+        if min(nu, nl) < 4:
+            raise ValueError("构造三次样条包络线至少需要4个极大值点和4个极小值点。")
+        ab = np.zeros((3, nu + nl))  # 块对角带状矩阵，两块之间的非对角元保持为零
+        b = np.empty(nu + nl)
+        du, su = self._system(x_upper, y_upper, ab[:, :nu], b[:nu])
+        dl, sl = self._system(x_lower, y_lower, ab[:, nu:], b[nu:])
+        s = linalg.solve_banded((1, 1), ab, b, overwrite_ab=True, overwrite_b=True)
+
+        # 各区间的三次多项式系数，两组区间依次拼接
+        x = np.concatenate([x_upper[:-1], x_lower[:-1]])
+        dx = np.concatenate([du, dl])
+        slope = np.concatenate([su, sl])
+        left = np.concatenate([s[:nu - 1], s[nu:-1]])
+        right = np.concatenate([s[1:nu], s[nu + 1:]])
+        c0 = np.concatenate([y_upper[:-1], y_lower[:-1]])
+        c2 = (3 * slope - 2 * left - right) / dx
+        c3 = (left + right - 2 * slope) / dx ** 2
+
+        index, offset, term, out = self._index, self._offset, self._term, self._out
+        index[0] = np.clip(np.searchsorted(x_upper, self.grid, side="right") - 1, 0, nu - 2)
+        index[1] = np.clip(np.searchsorted(x_lower, self.grid, side="right") - 1, 0, nl - 2) + nu - 1
+        np.take(x, index, out=offset)
+        np.subtract(self.grid, offset, out=offset)
+        np.take(c3, index, out=out)
+        for c in (c2, left, c0):  # 秦九韶（Horner）算法逐次求值
+            out *= offset
+            out += np.take(c, index, out=term)
+        return out
 
 
 class EMDModel:
@@ -15,98 +176,87 @@ class EMDModel:
         """
         self.datax = datax  # 存储输入数据的x值序列，用于后续各种计算和操作
         self.datay = datay  # 存储输入数据的y值序列，与datax相对应，是主要的分析对象
-        self.H = []  # 用于储存通过后续处理得到的IMF（本征模态函数）分量，初始化为空列表
+        self.H = np.empty((0, len(datax)))  # 最近一次extract_imf得到的IMF（本征模态函数）分量，每行一个分量
+        # 筛分停止条件：满足任一已启用的条件即停止筛分
+        self.imf_test = True  # 是否使用is_IMF的判定
+        self.sd_threshold = None  # 相邻两次筛分结果的SD（CalSD）小于该值时停止，为None时不使用
+        self.s_number = None  # 极值点数与过零点数相差不超过1且连续S次保持不变时停止，为None时不使用
+        self.energy_threshold = None  # 包络线均值与中间数据的能量比小于该值时停止，为None时不使用
+        self.max_sifts = 1000  # 每个IMF分量的最大筛分次数，保证分解时间有上界
+        self.envelope = SplineEnvelope()  # 三次样条包络线引擎，缓存求值网格和输出缓冲区
+        self.spline_fits = 0  # 三次样条拟合的累计次数
+        self.imf_stats = []  # 最近一次extract_imf中每个IMF分量的统计信息
 
     def FindMax(self, Datax, Datay):
         """
         寻找数据中的极大值点
 
-        该方法遍历输入的数据序列，按照一定的条件判断并找出其中的极大值点及其对应的x值。
+        该方法由find_extrema一次性找出数据序列的极大值点，首尾两个端点与内部点使用一致的判断规则。
 
         参数:
         Datax (numpy.ndarray或类似可迭代对象): 待分析数据的x值序列。
         Datay (numpy.ndarray或类似可迭代对象): 待分析数据的y值序列，与Datax中的元素一一对应。
 
         返回:
-        tuple: 包含两个列表，第一个列表是极大值点对应的x值，第二个列表是极大值点对应的y值。
+        tuple: 包含两个数组，第一个数组是极大值点对应的x值，第二个数组是极大值点对应的y值。
         """
-        x, y = [], []  # 初始化用于存储极大值点的x值和y值的空列表
-
-        if Datay[0] >= Datay[1]:  # 如果第一个数据点的y值大于等于第二个数据点的y值
-            x.append(1)  # 将x值设为1（可能是数据序列的索引从1开始的一种约定，具体需根据数据含义确定）
-            y.append(Datay[0])  # 将第一个数据点的y值作为极大值点的y值
-
-        for i in range(1, len(Datax) - 2):  # 遍历数据序列中除了首尾几个特殊点之外的部分
-            if Datay[i] >= Datay[i + 1] and Datay[i] >= Datay[i - 1]:  # 如果当前数据点的y值大于等于前后相邻数据点的y值
-                x.append(Datax[i])  # 将当前数据点的x值添加到极大值点的x值列表中
-                y.append(Datay[i])  # 将当前数据点的y值添加到极大值点的y值列表中
-
-        if Datay[len(Datax) - 1] >= Datay[len(Datax) - 2]:  # 如果最后一个数据点的y值大于等于倒数第二个数据点的y值
-            x.append(Datax[len(Datax) - 1])  # 将最后一个数据点的x值添加到极大值点的x值列表中
-            y.append(Datay[len(Datax) - 1])  # 将最后一个数据点的y值添加到极大值点的y值列表中
-
-        return x, y  # 返回极大值点对应的x值和y值的列表
+        index = find_extrema(Datay)[0]  # 极大值点的下标
+        return np.asarray(Datax)[index], np.asarray(Datay)[index]  # 返回极大值点对应的x值和y值
 
     def FindMin(self, Datax, Datay):
         """
         寻找数据中的极小值点
 
-        与FindMax方法类似，该方法用于遍历输入的数据序列，找出其中的极小值点及其对应的x值。
+        与FindMax方法类似，该方法由find_extrema一次性找出数据序列的极小值点。
 
         参数:
         Datax (numpy.ndarray或类似可迭代对象): 待分析数据的x值序列。
         Datay (numpy.ndarray或类似可迭代对象): 待分析数据的y值序列，与Datax中的元素一一对应。
 
         返回:
-        tuple: 包含两个列表，第一个列表是极小值点对应的x值，第二个列表是极小值点对应的y值。
+        tuple: 包含两个数组，第一个数组是极小值点对应的x值，第二个数组是极小值点对应的y值。
         """
-        x, y = [], []  # 初始化用于存储极小值点的x值和y值的空列表
-
-        if Datay[0] <= Datay[1]:  # 如果第一个数据点的y值小于等于第二个数据点的y值
-            x.append(Datax[0])  # 将第一个数据点的x值添加到极小值点的x值列表中
-            y.append(Datay[0])  # 将第一个数据点的y值添加到极小值点的y值列表中
-
-        for i in range(1, len(Datax) - 1):  # 遍历数据序列中除了首尾特殊点之外的部分
-            if Datay[i] <= Datay[i + 1] and Datay[i] <= Datay[i - 1]:  # 如果当前数据点的y值小于等于前后相邻数据点的y值
-                x.append(Datax[i])  # 将当前数据点的x值添加到极小值点的x值列表中
-                y.append(Datay[i])  # 将当前数据点的y值添加到极小值点的y值列表中
+        index = find_extrema(Datay)[1]  # 极小值点的下标
+        return np.asarray(Datax)[index], np.asarray(Datay)[index]  # 返回极小值点对应的x值和y值
 
-        if Datay[len(Datax) - 1] <= Datay[len(Datax) - 2]:  # 如果最后一个数据点的y值小于等于倒数第二个数据点的y值
-            x.append(Datax[len(Datax) - 1])  # 将最后一个数据点的x值添加到极小值点的x值列表中
-            y.append(Datay[len(Datax) - 1])  # 将最后一个数据点的y值添加到极小值点的y值列表中
-
-        return x, y  # 返回极小值点对应的x值和y值的列表
-
-    def getCubicLine(self, Datax, Datay, length):
+    def getCubicLine(self, Datax, Datay, length, extrema=None):
         """
         获取极大值和极小值点的包络线
 
-        该方法首先找到数据的极大值点和极小值点，然后利用插值函数生成通过这些极值点的三次样条曲线，作为包络线。
+        该方法首先找到数据的极大值点和极小值点，然后由包络线引擎envelope生成通过这些极值点的三次样条曲线，作为包络线。
+        求值网格按长度缓存，两条包络线在一次带状方程组求解中同时拟合。
 
         参数:
         Datax (numpy.ndarray或类似可迭代对象): 待分析数据的x值序列。
         Datay (numpy.ndarray或类似可迭代对象): 待分析数据的y值序列，与Datax中的元素一一对应。
         length (int): 生成包络线时使用的x值序列长度，通常用于控制包络线的分辨率。
+        extrema (tuple, 可选): find_extrema已求得的(极大值下标, 极小值下标)，为None时重新计算。
 
         返回:
         tuple: 包含两条曲线的y值序列，分别是极大值点包络线的y值序列和极小值点包络线的y值序列。
         """
-        x, y = self.FindMax(Datax, Datay)  # 找到数据中的极大值点及其对应的x值和y值
-        tck = interpolate.splrep(x, y, k=3)  # 使用scipy的插值函数生成通过极大值点的三次样条函数的表示形式
-        xx = np.linspace(min(Datax), max(Datax), length)  # 生成在Datax的最小值和最大值之间等间距的x值序列，用于计算包络线的y值
-        ymax = interpolate.splev(xx, tck, der=0)  # 通过三次样条函数计算极大值点包络线的y值序列
+        ymax, ymin = self._envelopes(Datax, Datay, length, extrema)
+        return ymax.copy(), ymin.copy()  # 返回极大值点包络线的y值序列和极小值点包络线的y值序列
 
-        x, y = self.FindMin(Datax, Datay)  # 找到数据中的极小值点及其对应的x值和y值
-        tck = interpolate.splrep(x, y, k=3)  # 使用scipy的插值函数生成通过极小值点的三次样条函数的表示形式
-        ymin = interpolate.splev(xx, tck, der=0)  # 通过三次样条函数计算极小值点包络线的y值序列
+    def _envelopes(self, Datax, Datay, length, extrema=None):
+        """
+        与getCubicLine相同，但直接返回包络线引擎输出缓冲区的视图，供筛分内部使用
 
-        return ymax, ymin  # 返回极大值点包络线的y值序列和极小值点包络线的y值序列
+        返回:
+        tuple: 上包络线和下包络线，下一次调用时会被覆盖。
+        """
+        Datax, Datay = np.asarray(Datax, dtype=float), np.asarray(Datay, dtype=float)
+        maxima, minima = extrema if extrema is not None else find_extrema(Datay)
+        self.envelope.prepare(Datax.min(), Datax.max(), length)  # Datax的最小值和最大值之间等间距的x值序列，网格不变时复用
+        ymax, ymin = self.envelope.envelopes(Datax[maxima], Datay[maxima], Datax[minima], Datay[minima])
+        self.spline_fits += 2
+        return ymax, ymin
 
     def FindZeros(self, Datax, Datay):
         """
         找到过零点的数量
 
-        该方法遍历数据序列，检查相邻数据点的y值乘积是否小于零，以此来确定过零点的数量。
+        该方法由count_zero_crossings一次性检查相邻数据点的y值是否异号，以此来确定过零点的数量。
 
         参数:
         Datax (numpy.ndarray或类似可迭代对象): 待分析数据的x值序列。
@@ -115,41 +265,38 @@ class EMDModel:
         返回:
         int: 过零点的数量。
         """
-        num = 0  # 初始化过零点数量为0
-        for i in range(0, len(Datax) - 1):  # 遍历数据序列中除了最后一个数据点之外的部分
-            if Datay[i] * Datay[i + 1] < 0:  # 如果相邻两个数据点的y值乘积小于零，说明存在过零点
-                num += 1  # 过零点数量加1
-        return num  # 返回过零点的数量
+        return count_zero_crossings(Datay)  # 返回过零点的数量
 
-    def is_IMF(self, Hdata):
+    def is_IMF(self, Hdata, extrema=None, yaver=None):
         """
         判断是否为IMF分量
 
         该方法根据一系列条件判断输入的数据序列是否符合IMF（本征模态函数）的定义。
+        筛分过程中已求得的极值点和包络线均值可以直接传入，避免重复计算。
 
         参数:
         Hdata (numpy.ndarray或类似可迭代对象): 待判断的数据序列。
+        extrema (tuple, 可选): find_extrema已求得的(极大值下标, 极小值下标)，为None时重新计算。
+        yaver (numpy.ndarray, 可选): 已求得的上下包络线均值，为None时重新计算。
 
         返回:
         bool: 如果数据序列符合IMF的定义，则返回True；否则返回False。
         """
-        x = np.linspace(1, len(Hdata), len(Hdata))  # 生成与输入数据序列长度相同的等间距x值序列，可能用于后续分析与数据序列的对应关系
-        xx, y1 = self.FindMax(x, Hdata)  # 找到数据序列中的极大值点及其对应的x值和y值
-        xx, y2 = self.FindMin(x, Hdata)  # 找到数据序列中的极小值点及其对应的x值和y值
-        num1 = len(y1) + len(y2)  # 计算极大值点和极小值点的总数
-        num2 = self.FindZeros(x, Hdata)  # 找到数据序列中的过零点数量
+        Hdata = np.asarray(Hdata, dtype=float)
+        maxima, minima = extrema if extrema is not None else find_extrema(Hdata)
+        num1 = len(maxima) + len(minima)  # 计算极大值点和极小值点的总数
+        num2 = count_zero_crossings(Hdata)  # 找到数据序列中的过零点数量
 
         # 判断局部极值点的数量和过零点的数量是否相等（允许有一定的误差，这里误差范围设定为相差不超过1）
         flag1 = abs(num1 - num2) <= 1
 
-        ymax, ymin = self.getCubicLine(x, Hdata, len(Hdata))  # 获取数据序列的极大值点和极小值点的包络线
-        yaver = (ymax + ymin) / 2  # 计算包络线的平均值
-        num3 = 0
+        if yaver is None:
+            x = np.linspace(1, len(Hdata), len(Hdata))  # 生成与输入数据序列长度相同的等间距x值序列
+            ymax, ymin = self._envelopes(x, Hdata, len(Hdata), (maxima, minima))  # 获取数据序列的极大值点和极小值点的包络线
+            yaver = (ymax + ymin) / 2  # 计算包络线的平均值
         error = 0.1
-        for i in  range(0, len(Hdata)):
-            if abs(yaver[i]) < error:  # 如果包络线平均值的绝对值小于设定的误差值
-                num3 += 1  # 满足条件的点数量加1
-        flag2 = num3 / len(Hdata) >= 0.95  # 判断满足条件的点占总点数的比例是否达到设定的阈值
+        # 判断包络线平均值的绝对值小于设定误差值的点占总点数的比例是否达到设定的阈值
+        flag2 = np.count_nonzero(np.abs(yaver) < error) / len(Hdata) >= 0.95
 
         return flag1 and flag2  # 如果两个条件都满足，则返回True，表示是IMF分量；否则返回False
 
@@ -172,40 +319,106 @@ class EMDModel:
 
         return SD  # 返回计算得到的SD值
 
-    def extract_imf(self, N=3):
+    def sift(self, datax, data, m):
+        """
+        从数据中筛分出一个IMF分量
+
+        反复用中间数据减去其上下包络线的均值，直到满足任一已启用的停止条件：is_IMF判定、SD阈值、S数、能量比，
+        或达到最大筛分次数。每个中间数据只求一次极值点和包络线，既用于判断停止条件，也直接用于下一次筛分。
+
+        参数:
+        datax (numpy.ndarray): 数据的x值序列。
+        data (numpy.ndarray): 待筛分的数据。
+        m (numpy.ndarray): data的上下包络线均值。
+
+        返回:
+        tuple: 包含两个元素，第一个元素是筛分得到的IMF分量，第二个元素是包含筛分次数sifts、停止原因stop和最后一次SD值sd的字典。
+        """
+        h = data
+        stable = 0  # S数判据：极值点数和过零点数连续保持不变的次数
+        counts = None
+        sifts, SD, reason = 0, float("nan"), "max_sifts"
+        while sifts < self.max_sifts:
+            sifts += 1
+            PreH = h  # 记录当前的中间数据
+            h = PreH - m  # 用之前的中间数据减去包络线平均值得到新的中间数据
+            extrema = find_extrema(h)
+            if min(map(len, extrema)) < 4:
+                reason = "extrema"  # 极值点不足以构造三次样条包络线
+                break
+            ymax, ymin = self._envelopes(datax, h, len(datax), extrema)
+            m_next = (ymax + ymin) / 2
+            SD = self.CalSD(PreH, h)
+            if self.imf_test and self.is_IMF(h, extrema, m_next):  # 判断中间数据是否符合IMF分量的定义
+                reason = "imf"
+                break
+            if self.sd_threshold is not None and SD < self.sd_threshold:
+                reason = "sd"
+                break
+            if self.s_number is not None:
+                current = (len(extrema[0]) + len(extrema[1]), count_zero_crossings(h))
+                stable = stable + 1 if current == counts and abs(current[0] - current[1]) <= 1 else 0
+                counts = current
+                if stable >= self.s_number:
+                    reason = "s_number"
+                    break
+            if self.energy_threshold is not None and np.dot(m_next, m_next) < self.energy_threshold * np.dot(h, h):
+                reason = "energy"
+                break
+            m = m_next
+        return h, {"sifts": sifts, "stop": reason, "sd": SD}
+
+    def extract_imf(self, N=3, dtype=np.float64, out=None, path=None):
         """
         提取多个IMF分量
 
-        该方法通过迭代的方式从输入数据中提取指定数量的IMF分量。
+        该方法通过迭代的方式从输入数据中提取指定数量的IMF分量。每个分量的筛分由sift完成，筛分次数有上界；
+        剩余数据的极值点不足以构造包络线时提前结束。每个分量的统计信息保存在imf_stats中。
+
+        结果保存在一个预先分配的形状为(N + 1, 数据长度)的数组中：前面各行依次是IMF分量，最后一行是余量，
+        提前结束时未提取的行为零。筛分始终以float64计算，只有写入结果时才转换为数组的数据类型。
+        每次调用都使用新的（或out给定的）数组，并用其中IMF分量部分的视图替换self.H，因此可以在同一模型上重复调用。
 
         参数:
         N (int, 可选): 要提取的IMF分量数量，默认值为3。
+        dtype (numpy.dtype, 可选): 结果数组的数据类型，如np.float32，默认值为np.float64。
+        out (numpy.ndarray, 可选): 用于保存结果的形状为(N + 1, 数据长度)的数组，可在分解大量序列时重复使用。
+        path (str, 可选): 为结果创建内存映射的.npy文件路径，适用于很长的序列，给出out时忽略。
 
         返回:
-        tuple: 包含两个元素，第一个元素是提取得到的IMF分量列表，第二个元素是提取完IMF分量后剩余的数据。
+        tuple: 包含两个元素，第一个元素是提取得到的IMF分量组成的二维数组，每行一个分量，第二个元素是提取完IMF分量后剩余的数据，
+               两者都是结果数组的视图。
         """
-        InitalData = self.datay  # 将输入数据的y值序列作为初始数据
+        datax = np.asarray(self.datax, dtype=float)
+        InitalData = np.asarray(self.datay, dtype=float)  # 将输入数据的y值序列作为初始数据
+        shape = (N + 1, len(InitalData))
+        if out is None:
+            out = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape) if path is not None \
+                else np.empty(shape, dtype=dtype)
+        elif out.shape != shape:
+            raise ValueError(f"结果数组的形状应为{shape}。")
+        self.imf_stats = []
+        count = 0  # 已提取的IMF分量数量
         for j in range(1, N + 1):  # 进行指定次数的迭代提取
-            ymax, ymin = self.getCubicLine(self.datax, InitalData, len(self.datax))  # 获取当前数据的极大值点和极小值点的包络线
+            if min(map(len, find_extrema(InitalData))) < 4:
+                break  # 剩余数据的极值点不足以构造三次样条包络线，已接近单调趋势，不再提取
+            start, spline_fits = time.perf_counter(), self.spline_fits
+            ymax, ymin = self._envelopes(datax, InitalData, len(datax))  # 获取当前数据的极大值点和极小值点的包络线
             # self.draw(self.datax, InitalData, ymax, ymin, len(self.datax))  # 可能是用于绘制相关图形的函数，这里暂时注释掉
 
             m = (ymax + ymin) / 2  # 计算包络线的平均值
-            h = InitalData - m  # 用初始数据减去包络线平均值得到中间数据
-            is_accept = self.is_IMF(h)  # 判断中间数据是否符合IMF分量的定义
-
-            num = 0
-            while not is_accept:  # 如果不符合IMF分量的定义，则进行循环调整
-                num += 1
-                PreH = h  # 记录当前的中间数据
-                ymax, ymin = self.getCubicLine(self.datax, PreH, len(self.datax))  # 获取新的包络线
-                m = (ymax + ymin) / 2  # 计算新的包络线平均值
-                h = PreH - m  # 用之前的中间数据减去新的包络线平均值得到新的中间数据
-                is_accept = self.is_IMF(h)  # 再次判断新的中间数据是否符合IMF分量的定义
-
-            self.H.append(h)  # 将符合IMF分量定义的中间数据添加到IMF分量列表中
+            h, stats = self.sift(datax, InitalData, m)
+            stats.update(time=time.perf_counter() - start, spline_fits=self.spline_fits - spline_fits)
+            self.imf_stats.append(stats)  # 记录筛分次数、停止原因、耗时和样条拟合次数
+
+            out[count] = h  # 将符合IMF分量定义的中间数据写入结果数组
+            count += 1
             InitalData = InitalData - h  # 用初始数据减去已提取的IMF分量，得到剩余的数据用于下一次迭代
 
-        return self.H, InitalData  # 返回提取得到的IMF分量列表和剩余的数据
+        out[count:N] = 0
+        out[N] = InitalData
+        self.H = out[:count]
+        return self.H, out[N]  # 返回提取得到的IMF分量数组和剩余的数据
 
     def fit_residual(self, degree=3):
         """
@@ -223,4 +436,148 @@ class EMDModel:
         p1 = np.poly1d(z1)  # 根据拟合得到的系数创建一个多项式对象
         y_pred = p1(self.datax)  # 使用多项式对象计算在输入数据的x值序列上的预测值
 
-        return y_pred  # 返回拟合后的预测值序列
\ No newline at end of file
+        return y_pred  # 返回拟合后的预测值序列
+
+
+class StreamingEMDModel:
+    def __init__(self, window, overlap=None, N=3, mirror=None):
+        """
+        初始化流式（滑动窗口）EMD模型的对象
+
+        数据按长度为window、相邻窗口重叠overlap个数据的窗口依次分解，每个窗口两端各镜像延拓mirror个数据以减小端点效应，
+        分解后去掉延拓部分。相邻窗口在重叠区内按线性权重交叉过渡拼接，重叠区之前的结果不再受后续数据影响，随即输出。
+        模型只保存当前窗口的数据和上一个窗口重叠区的分解结果，内存占用只与窗口长度有关，不需要保存或重新处理历史数据。
+
+        参数:
+        window (int): 窗口长度，至少为8。
+        overlap (int, 可选): 相邻窗口重叠的数据个数，小于window，默认值为window // 4。
+        N (int, 可选): 每个窗口要提取的IMF分量数量，默认值为3。
+        mirror (int, 可选): 窗口两端镜像延拓的数据个数，不超过window - 1，默认值为window // 4。
+        """
+        overlap = window // 4 if overlap is None else overlap
+        mirror = window // 4 if mirror is None else mirror
+        if window < 8 or not 0 <= overlap < window or not 0 <= mirror < window:
+            raise ValueError("窗口长度至少为8，重叠数据个数和镜像延拓个数应在0到window - 1之间。")
+        self.window = window  # 窗口长度
+        self.overlap = overlap  # 相邻窗口重叠的数据个数
+        self.hop = window - overlap  # 相邻窗口起点的间隔
+        self.N = N  # 每个窗口要提取的IMF分量数量
+        self.mirror = mirror  # 窗口两端镜像延拓的数据个数
+        length = window + 2 * mirror
+        self.model = EMDModel(np.arange(1, length + 1, dtype=float), None)  # 分解各窗口的EMD模型，筛分设置可直接修改
+        self.weights = np.arange(1, overlap + 1) / (overlap + 1)  # 重叠区内新窗口结果的权重，从0线性增加到1
+        self._buffer = np.empty(window)  # 当前窗口的数据
+        self._size = 0  # 当前窗口中已有的数据个数
+        self._pending = None  # 上一个窗口重叠区的分解结果，形状为(N + 1, overlap)，等待与下一个窗口拼接
+        self.received = 0  # 已接收的数据个数
+        self.emitted = 0  # 已输出的数据个数
+        self.trend = None  # 最近输出的余量（趋势）值，flush后为数据流最后的趋势值
+
+    def _decompose(self, y):
+        """
+        对一个窗口的数据做镜像延拓后的EMD分解
+
+        参数:
+        y (numpy.ndarray): 窗口数据。
+
+        返回:
+        numpy.ndarray: 形状为(N + 1, len(y))的数组，与extract_imf的结果数组相同，前N行是IMF分量，最后一行是余量。
+        """
+        if len(y) < 4:
+            result = np.zeros((self.N + 1, len(y)))
+            result[-1] = y  # 数据太少，无法求包络线，全部作为余量
+            return result
+        m = min(self.mirror, len(y) - 1)
+        extended = np.concatenate([y[m:0:-1], y, y[-2:-m - 2:-1]]) if m else y
+        if len(extended) != len(self.model.datax):
+            self.model.datax = np.arange(1, len(extended) + 1, dtype=float)
+        self.model.datay = extended
+        result = np.empty((self.N + 1, len(extended)))
+        self.model.extract_imf(self.N, out=result)
+        return result[:, m:m + len(y)]
+
+    def _stitch(self, result, keep):
+        """
+        将窗口的分解结果与上一个窗口的重叠区拼接，返回可以输出的部分，并保存末尾keep个数据的结果等待下一次拼接
+
+        参数:
+        result (numpy.ndarray): 窗口的分解结果。
+        keep (int): 留待下一次拼接的数据个数。
+
+        返回:
+        numpy.ndarray: 可以输出的分解结果，形状为(N + 1, 数据个数)。
+        """
+        if self._pending is not None:
+            width = self._pending.shape[1]
+            weights = self.weights if width == self.overlap else np.arange(1, width + 1) / (width + 1)
+            result[:, :width] = (1 - weights) * self._pending + weights * result[:, :width]
+        done = result.shape[1] - keep
+        self._pending = result[:, done:].copy() if keep else None
+        output = result[:, :done]
+        self.emitted += output.shape[1]
+        if output.shape[1]:
+            self.trend = float(output[-1, -1])
+        return output
+
+    def extend(self, values):
+        """
+        接收新数据，每凑满一个窗口就分解一次，并输出已经确定的分解结果
+
+        参数:
+        values (numpy.ndarray或类似可迭代对象): 新数据序列。
+
+        返回:
+        numpy.ndarray: 形状为(N + 1, 数据个数)的数组，前N行是IMF分量，最后一行是余量，数据个数可以为0。
+        """
+        values = np.atleast_1d(np.asarray(values, dtype=float))
+        outputs = [np.empty((self.N + 1, 0))]
+        start = 0
+        while start < len(values):
+            count = min(self.window - self._size, len(values) - start)
+            self._buffer[self._size:self._size + count] = values[start:start + count]
+            self._size += count
+            start += count
+            if self._size == self.window:
+                outputs.append(self._stitch(self._decompose(self._buffer), self.overlap))
+                self._buffer[:self.overlap] = self._buffer[self.hop:]  # 重叠区的数据留作下一个窗口的开头
+                self._size = self.overlap
+        self.received += len(values)
+        return np.concatenate(outputs, axis=1)
+
+    def update(self, value):
+        """
+        接收一个新数据
+
+        参数:
+        value (float): 新数据。
+
+        返回:
+        numpy.ndarray: 与extend相同。
+        """
+        return self.extend([value])
+
+    def flush(self):
+        """
+        输出尚未确定的全部分解结果
+
+        当前窗口中还有未分解的数据时，对当前窗口中已有的数据（上一个窗口的重叠区及其后接收的数据）分解一次，
+        与上一个窗口的重叠区拼接后输出。
+        调用后窗口状态和received、emitted计数回到初始状态，可以继续接收新的数据流；
+        trend保留这个数据流最后的余量（趋势）值，直到新的数据流输出结果。
+
+        返回:
+        numpy.ndarray: 形状为(N + 1, 数据个数)的数组。
+        """
+        fresh = self._size - (self.overlap if self._pending is not None else 0)  # 尚未分解过的数据个数
+        if fresh > 0:
+            output = self._stitch(self._decompose(self._buffer[:self._size].copy()), 0)
+        elif self._pending is not None:
+            output, self._pending = self._pending, None
+            self.trend = float(output[-1, -1])
+        else:
+            output = np.empty((self.N + 1, 0))
+        self._size = 0
+        self._pending = None
+        self.received = 0
+        self.emitted = 0
+        return output
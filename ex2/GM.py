@@ -1,4 +1,6 @@
+from collections import deque
 import numpy as np
+from gm_batch import solve_normal_equations
 
 
 class GMModel:
@@ -17,6 +19,8 @@ class GMModel:
         self.modeling_result_arr = np.array(())  # 存储对实验数据的拟合值，初始为空数组
         self.P = 0  # 小误差概率，初始化为0
         self.C = 0  # 后验方差比值，初始化为0
+        self.MAPE = 0  # 平均绝对百分比误差（%），初始化为0
+        self.residual_arr = np.array(())  # 实验数据与拟合值之差，初始为空数组
 
     def set_model(self, arr:list):
         """
@@ -38,23 +42,14 @@ class GMModel:
         参数:
         arr (list): 实验数据的列表形式。
         """
-        self.test_data = np.array(arr).flatten()  # 将输入的列表转换为一维的numpy数组，作为实验数据集
+        self.test_data = np.array(arr, dtype=float).flatten()  # 将输入的列表转换为一维的numpy数组，作为实验数据集
 
-        add_data = []
-        sum_val = 0
-        for i in range(len(self.test_data)):
-            sum_val = sum_val + self.test_data[i]  # 对实验数据进行累加
-            add_data.append(sum_val)
-        self.add_data = np.array(add_data)  # 将累加后的数据转换为numpy数组
+        self.add_data = np.cumsum(self.test_data)  # 对实验数据进行一次累加
 
-        ser = []
-        for i in range(len(self.add_data) - 1):
-            temp = (-1) * ((1 / 2) * self.add_data[i] + (1 / 2) * self.add_data[i + 1])
-            ser.append(temp)
-        B = np.vstack((np.array(ser).flatten(), np.ones(len(ser), ).flatten()))
-        self.MAT_B = np.array(B).T  # 构建矩阵B并转置
+        ser = -0.5 * (self.add_data[:-1] + self.add_data[1:])  # 背景值，即相邻累加值均值的相反数
+        self.MAT_B = np.column_stack((ser, np.ones(len(ser))))  # 构建矩阵B
 
-        Y = np.array(self.test_data[1:])
+        Y = self.test_data[1:]
         self.MAT_Y = np.reshape(Y, (len(Y), 1))  # 构建矩阵Y并重塑为列向量形式
 
     def __compute(self):
@@ -62,26 +57,23 @@ class GMModel:
         私有方法：计算模型的参数a和b。
 
         通过之前构建的矩阵B和矩阵Y，利用矩阵运算来计算出模型的两个重要参数a和b。
+        B^T*B只有2×2，正规方程直接按闭式解求解，无需求逆矩阵。
         """
-        temp_1 = np.dot(self.MAT_B.T, self.MAT_B)  # 先计算矩阵B的转置与自身的点积
-        temp_2 = np.matrix(temp_1).I  # 对上述结果求逆
-        temp_3 = np.dot(np.array(temp_2), self.MAT_B.T)  # 再与矩阵B的转置做点积
-        vec = np.dot(temp_3, self.MAT_Y)  # 最后与矩阵Y做点积得到包含参数a和b的向量
+        z = self.MAT_B[:, 0]
+        y = self.MAT_Y[:, 0]
+        self.argu_a, self.argu_b = solve_normal_equations(len(y), z.sum(), np.dot(z, z), y.sum(), np.dot(z, y))
 
-        self.argu_a = vec.flatten()[0]  # 从向量中获取参数a的值
-        self.argu_b = vec.flatten()[1]  # 从向量中获取参数b的值
-
-    def __predict(self, k:int) -> float:
+    def __predict(self, k):
         """
         私有方法：根据模型参数进行预测计算。
 
-        基于已经计算出的参数a和b，以及给定的预测步数k，计算出相应的预测值。
+        基于已经计算出的参数a和b，以及给定的预测步数k，计算出相应的预测值。k为数组时一次计算所有步数。
 
         参数:
-        k (int): 预测的步数。
+        k (int或numpy.ndarray): 预测的步数。
 
         返回:
-        float: 预测的值。
+        float或numpy.ndarray: 预测的值。
         """
         part_1 = 1 - np.exp(self.argu_a)  # 计算预测公式的第一部分
         part_2 = self.test_data[0] - self.argu_b / self.argu_a  # 计算预测公式的第二部分
@@ -93,11 +85,11 @@ class GMModel:
         """
         私有方法：获取对实验数据的拟合值。
 
-        通过调用__predict方法，依次计算出每个实验数据点对应的拟合值，并存储在modeling_result_arr中。
+        通过对步数数组调用一次__predict方法，计算出每个实验数据点对应的拟合值，并存储在modeling_result_arr中。
+        第一个拟合值取实验数据的第一个值。
         """
-        ls = [self.__predict(i + 1) for i in range(len(self.test_data) - 1)]
-        ls.insert(0, self.test_data[0])
-        self.modeling_result_arr = np.array(ls)  # 将计算出的拟合值转换为numpy数组并存储
+        self.modeling_result_arr = self.__predict(np.arange(len(self.test_data), dtype=float))
+        self.modeling_result_arr[0] = self.test_data[0]
 
     def predict(self, number:int) -> list:
         """
@@ -111,42 +103,57 @@ class GMModel:
         返回:
         list: 预测结果的列表形式。
         """
-        prediction = [self.__predict(i + len(self.test_data)) for i in range(number)]
-        return prediction
+        return self.forecast(number).tolist()
 
-    def precision_evaluation(self):
+    def forecast(self, horizon:int) -> np.ndarray:
         """
-        对模型的精度进行评估。
+        预测实验数据之后任意步数的数据。
 
-        通过计算实验数据与拟合数据之间的误差，进而计算出平均误差、平均实验数据值等，最终得出小误差概率P和后验方差比值C。
+        参数:
+        horizon (int): 预测步数。
+
+        返回:
+        numpy.ndarray: 预测结果数组。
         """
-        error = [
-            self.test_data[i] - self.modeling_result_arr[i]
-            for i in range(len(self.test_data))
-        ]  # 计算每个实验数据点与对应拟合值的误差
+        n = len(self.test_data)
+        return self.__predict(np.arange(n, n + horizon, dtype=float))
 
-        aver_error = np.mean(error)  # 计算平均误差
+    def precision_evaluation(self):
+        """
+        对模型的精度进行评估。
 
-        aver_test_data = np.mean(self.test_data)  # 计算平均实验数据值
+        通过计算实验数据与拟合数据之间的误差，进而计算出平均误差、平均实验数据值等，最终得出小误差概率P和后验方差比值C，
+        同时计算残差数组和平均绝对百分比误差MAPE。全部为数组运算，适用于很长的序列。
+        """
+        error = self.test_data - self.modeling_result_arr  # 计算每个实验数据点与对应拟合值的误差
+        self.residual_arr = error
 
-        temp1 = 0
-        temp2 = 0
-        for i in range(len(error)):
-            temp1 = temp1 + (self.test_data[i] - aver_test_data) ** 2
-            temp2 = temp2 + (error[i] - aver_error) ** 2
-        square_S_1 = temp1 / len(self.test_data)  # 计算实验数据的方差
-        square_S_2 = temp2 / len(error)  # 计算误差的方差
+        square_S_1 = np.var(self.test_data)  # 计算实验数据的方差
+        square_S_2 = np.var(error)  # 计算误差的方差
 
         self.C = np.sqrt(square_S_2) / np.sqrt(square_S_1)  # 计算后验方差比值
 
-        ls = [i
-              for i in range(len(error))
-              if np.abs(error[i] - aver_error) < (0.6745 * np.sqrt(square_S_1))
-              ]
-        self.P = len(ls) / len(error)  # 计算小误差概率
+        self.P = np.count_nonzero(np.abs(error - np.mean(error)) < (0.6745 * np.sqrt(square_S_1))) / len(error)  # 计算小误差概率
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.MAPE = float(np.mean(np.abs(error / self.test_data))) * 100  # 实验数据含0时为inf
 
         # print("精度指标P,C值为：", self.P, self.C)
 
+    def evaluate(self, horizon:int = 0) -> dict:
+        """
+        评估模型精度并预测后续数据。
+
+        参数:
+        horizon (int): 预测步数。
+
+        返回:
+        dict: 包含残差数组residuals、后验方差比值C、小误差概率P、平均绝对百分比误差MAPE和预测数组forecast。
+        """
+        self.precision_evaluation()
+        return {"residuals": self.residual_arr, "C": self.C, "P": self.P, "MAPE": self.MAPE,
+                "forecast": self.forecast(horizon)}
+
     def get_predicted_data(self):
         """
         获取模型对实验数据的拟合值。
@@ -154,4 +161,126 @@ class GMModel:
         返回:
         numpy.ndarray: 模型对实验数据的拟合值数组。
         """
-        return self.modeling_result_arr
\ No newline at end of file
+        return self.modeling_result_arr
+
+
+class RollingGMModel:
+    def __init__(self, window: int):
+        """
+        初始化RollingGMModel类的实例。
+
+        等维新息（新陈代谢）GM(1,1)模型：只用最近window个数据建模，每进入一个新数据就去掉最旧的数据。
+        正规方程所需的累加量sum(z)、sum(z^2)、sum(y)、sum(z*y)随数据进出以O(1)的代价更新，不必重新累加和求逆。
+
+        参数:
+        window (int): 窗口长度，至少为3。
+        """
+        if window < 3:
+            raise ValueError("窗口长度至少为3。")
+        self.window = window  # 窗口长度
+        self.values = deque()  # 窗口内的原始数据
+        self.pairs = deque()  # 窗口内每个方程的(全局背景值g_k, y_k)
+        self.total = 0.0  # 全局一次累加值，即到最新数据为止所有数据之和
+        self.base = 0.0  # 窗口第一个数据之前所有数据之和，窗口内的一次累加值为全局累加值减去base
+        self.sum_g = 0.0  # 窗口内sum(g_k)
+        self.sum_gg = 0.0  # 窗口内sum(g_k^2)
+        self.sum_gy = 0.0  # 窗口内sum(g_k*y_k)
+        self.sum_y = 0.0  # 窗口内sum(y_k)
+        self.updates = 0  # 更新次数，用于定期重新计算累加量
+        self.argu_a = 0  # 模型的参数a，初始化为0
+        self.argu_b = 0  # 模型的参数b，初始化为0
+
+    def update(self, value: float):
+        """
+        加入一个新数据，窗口已满时去掉最旧的数据，并更新参数a和b。
+
+        全局背景值g_k = -(C_{k-1} + C_k)/2（C为全局累加值）与窗口无关，窗口内的背景值为z_k = g_k + base，
+        因此窗口滑动时只需加入新方程、去掉最旧的方程并修改base。为避免全局累加值不断增大造成的舍入误差累积，
+        每滑动window次按窗口内的数据重新计算一次累加量，均摊代价仍为O(1)。
+
+        参数:
+        value (float): 新数据。
+        """
+        value = float(value)
+        previous = self.total
+        self.total += value
+        if self.values:
+            self._add_pair(-0.5 * (previous + self.total), value, 1)
+        self.values.append(value)
+        if len(self.values) > self.window:
+            self.base += self.values.popleft()
+            self._add_pair(*self.pairs.popleft(), -1)
+        self.updates += 1
+        if self.updates % self.window == 0:
+            self._rebase()
+        if len(self.values) >= 3:
+            self._solve()
+
+    def extend(self, values):
+        """
+        依次加入多个新数据。
+
+        参数:
+        values (list): 新数据序列。
+        """
+        for value in values:
+            self.update(value)
+
+    def _add_pair(self, g: float, y: float, sign: int):
+        """
+        私有方法：将一个方程加入（sign为1）或移出（sign为-1）累加量。
+
+        参数:
+        g (float): 全局背景值。
+        y (float): 原始数据。
+        sign (int): 1或-1。
+        """
+        if sign > 0:
+            self.pairs.append((g, y))
+        self.sum_g += sign * g
+        self.sum_gg += sign * g * g
+        self.sum_gy += sign * g * y
+        self.sum_y += sign * y
+
+    def _rebase(self):
+        """
+        私有方法：以窗口第一个数据为起点重新计算全局累加值和各累加量。
+        """
+        add_data = np.cumsum(self.values)
+        g = -0.5 * (add_data[:-1] + add_data[1:])
+        y = np.array(self.values)[1:]
+        self.pairs = deque(zip(g.tolist(), y.tolist()))
+        self.total = float(add_data[-1])
+        self.base = 0.0
+        self.sum_g, self.sum_gg = float(g.sum()), float(np.dot(g, g))
+        self.sum_gy, self.sum_y = float(np.dot(g, y)), float(y.sum())
+
+    def _solve(self):
+        """
+        私有方法：由累加量计算窗口内的正规方程并求解参数a和b。
+
+        z_k = g_k + base，故 sum(z) = sum(g) + m*base，sum(z^2) = sum(g^2) + 2*base*sum(g) + m*base^2，
+        sum(z*y) = sum(g*y) + base*sum(y)。
+        """
+        m = len(self.pairs)
+        base = self.base
+        S_z = self.sum_g + m * base
+        S_zz = self.sum_gg + 2 * base * self.sum_g + m * base * base
+        S_zy = self.sum_gy + base * self.sum_y
+        self.argu_a, self.argu_b = solve_normal_equations(m, S_z, S_zz, self.sum_y, S_zy)
+
+    def forecast(self, h: int = 1) -> np.ndarray:
+        """
+        预测窗口之后的h个数据，与对窗口内数据调用GMModel.set_model后再调用predict(h)的结果一致。
+
+        参数:
+        h (int): 预测步数。
+
+        返回:
+        numpy.ndarray: 预测结果。
+        """
+        if len(self.values) < 3:
+            raise ValueError("窗口内至少需要3个数据才能预测。")
+        a, b = self.argu_a, self.argu_b
+        k = np.arange(len(self.values), len(self.values) + h)
+        return (1 - np.exp(a)) * (self.values[0] - b / a) * np.exp(-a * k)
@@ -0,0 +1,195 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from EMD import EMDModel, SplineEnvelope
+
+SETTINGS = ["imf_test", "sd_threshold", "s_number", "energy_threshold", "max_sifts"]  # 复制到子进程的筛分设置
+
+_MODEL = None  # 子进程中复用的EMD模型，由_init_worker设置
+_ARRAYS = {}  # 子进程中挂载的共享内存数组，名称到(SharedMemory, numpy.ndarray)的字典
+
+
+def _settings(model):
+    """
+    读取模型的筛分设置和包络线边界条件
+
+    参数:
+    model (EMDModel): EMD模型。
+
+    返回:
+    dict: 设置名称到取值的字典。
+    """
+    settings = {name: getattr(model, name) for name in SETTINGS}
+    settings["boundary"] = model.envelope.boundary
+    return settings
+
+
+def _init_worker(datax, settings, arrays):
+    """
+    进程池初始化函数：每个子进程只接收一次x值序列和筛分设置，并按名称挂载共享内存中的结果数组
+
+    参数:
+    datax (numpy.ndarray): 数据的x值序列。
+    settings (dict): _settings返回的筛分设置。
+    arrays (dict): 数组名称到(共享内存名称, 形状)的字典。
+    """
+    global _MODEL
+    _MODEL = EMDModel(datax, None)
+    _MODEL.envelope = SplineEnvelope(settings["boundary"])
+    for name in SETTINGS:
+        setattr(_MODEL, name, settings[name])
+    for name, (shm_name, shape) in arrays.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _ARRAYS[name] = (shm, np.ndarray(shape, dtype=float, buffer=shm.buf))
+
+
+def _decompose(y, N):
+    """
+    用子进程中的EMD模型分解一个序列
+
+    参数:
+    y (numpy.ndarray): 待分解的序列。
+    N (int): 要提取的IMF分量数量。
+
+    返回:
+    numpy.ndarray: 形状为(N + 1, 序列长度)的数组，前N行是IMF分量，提前结束时缺少的分量为零，最后一行是余量。
+    """
+    _MODEL.datay = y
+    result = np.empty((N + 1, len(y)))
+    _MODEL.extract_imf(N, out=result)
+    return result
+
+
+def _eemd_chunk(task):
+    """
+    对一块加噪声的序列做EMD分解，分量之和写入共享内存中本块对应的行，在进程池的子进程中执行
+
+    参数:
+    task (tuple): (块号, 块内的试验次数, 随机种子, 噪声标准差, IMF分量数量)。
+    """
+    chunk, trials, seed, amplitude, N = task
+    rng = np.random.default_rng(seed)
+    data, total = _ARRAYS["data"][1], _ARRAYS["total"][1]
+    total[chunk] = 0
+    for _ in range(trials):
+        total[chunk] += _decompose(data + amplitude * rng.standard_normal(len(data)), N)
+
+
+def _noise_chunk(task):
+    """
+    CEEMDAN的第一步：生成一块白噪声，把它们的前N-1个EMD分量写入共享内存，并累加加噪声后序列的第一个IMF分量
+
+    参数:
+    task (tuple): (块号, 本块第一个试验的序号, 块内的试验次数, 随机种子, 噪声标准差, IMF分量数量)。
+    """
+    chunk, start, trials, seed, amplitude, N = task
+    rng = np.random.default_rng(seed)
+    data, modes, total = _ARRAYS["data"][1], _ARRAYS["modes"][1], _ARRAYS["total"][1]
+    total[chunk] = 0
+    for i in range(start, start + trials):
+        noise = rng.standard_normal(len(data))
+        if N > 1:
+            modes[i] = _decompose(noise, N - 1)[:-1]
+        total[chunk] += _decompose(data + amplitude * noise, 1)[0]
+
+
+def _ceemdan_chunk(task):
+    """
+    CEEMDAN提取第k+1个分量（k从1开始）：对余量加上第k个噪声分量后的序列取第一个IMF分量，并累加到共享内存中本块对应的行
+
+    参数:
+    task (tuple): (块号, 本块第一个试验的序号, 块内的试验次数, 噪声分量序号k, 噪声相对幅度)。
+    """
+    chunk, start, trials, k, noise_width = task
+    residual, modes, total = _ARRAYS["data"][1], _ARRAYS["modes"][1], _ARRAYS["total"][1]
+    scale = noise_width * np.std(residual)
+    total[chunk] = 0
+    for i in range(start, start + trials):
+        mode = modes[i, k - 1]
+        std = np.std(mode)
+        noisy = residual + scale / std * mode if std > 0 else residual
+        total[chunk] += _decompose(noisy, 1)[0]
+
+
+def ensemble_emd(model, N=3, trials=100, noise_width=0.2, method="eemd", seed=0, workers=None, chunk_size=8):
+    """
+    集合经验模态分解（EEMD）和自适应噪声完备集合经验模态分解（CEEMDAN）
+
+    EEMD对原序列分别加上trials组标准差为noise_width倍原序列标准差的白噪声，各自做EMD分解后对IMF分量取平均。
+    CEEMDAN先对各组白噪声做EMD分解，第一个IMF分量为原序列加噪声后第一个分量的平均，此后第k+1个分量为当前余量加上
+    按余量标准差缩放的第k个噪声分量后第一个分量的平均，余量逐次减去已提取的分量，各分量与余量之和精确等于原序列。
+
+    试验按chunk_size分块交给进程池执行，每块的随机种子由SeedSequence(seed)按块号派生，每块的分量之和写入共享内存中
+    该块对应的行，最后按块号顺序求和，因此结果只取决于seed和chunk_size，与进程数无关。CEEMDAN的噪声分量同样保存在共享内存中，
+    占用trials * (N - 1) * 序列长度个浮点数。
+
+    参数:
+    model (EMDModel): 提供数据和筛分设置（停止条件、最大筛分次数、包络线边界条件）的EMD模型。
+    N (int, 可选): 要提取的IMF分量数量，默认值为3。
+    trials (int, 可选): 加噪声的试验次数，默认值为100。
+    noise_width (float, 可选): 噪声标准差与序列标准差之比，默认值为0.2。
+    method (str, 可选): "eemd"或"ceemdan"，默认值为"eemd"。
+    seed (int, 可选): 随机种子，默认值为0。
+    workers (int, 可选): 并行进程数，为1时在当前进程中计算，为None时使用CPU核数。
+    chunk_size (int, 可选): 每块的试验次数，默认值为8。
+
+    返回:
+    tuple: 包含两个元素，第一个元素是形状为(N, 序列长度)的IMF分量数组，第二个元素是余量。
+    """
+    if method not in ("eemd", "ceemdan"):
+        raise ValueError(f"未知的集合分解方法：{method}，可选：eemd、ceemdan")
+    datax = np.asarray(model.datax, dtype=float)
+    datay = np.asarray(model.datay, dtype=float)
+    n = len(datay)
+    sizes = [chunk_size] * (trials // chunk_size)
+    if trials % chunk_size:
+        sizes.append(trials % chunk_size)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]).tolist()
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    amplitude = noise_width * np.std(datay)
+    layout = {"data": (n,), "total": ((len(sizes), N + 1, n) if method == "eemd" else (len(sizes), n))}
+    if method == "ceemdan":
+        layout["modes"] = (trials, N - 1, n)
+
+    blocks = {name: shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+              for name, shape in layout.items()}
+    executor = None
+    try:
+        arrays = {name: np.ndarray(shape, dtype=float, buffer=blocks[name].buf) for name, shape in layout.items()}
+        arrays["data"][:] = datay
+        initargs = (datax, _settings(model), {name: (blocks[name].name, shape) for name, shape in layout.items()})
+        if workers == 1:
+            _init_worker(*initargs)
+            mapper = map
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs)
+            mapper = executor.map
+
+        if method == "eemd":
+            list(mapper(_eemd_chunk, [(chunk, size, seeds[chunk], amplitude, N) for chunk, size in enumerate(sizes)]))
+            result = arrays["total"].sum(axis=0) / trials
+            return result[:N], result[N]
+
+        imfs = np.zeros((N, n))
+        list(mapper(_noise_chunk, [(chunk, starts[chunk], size, seeds[chunk], amplitude, N)
+                                   for chunk, size in enumerate(sizes)]))
+        imfs[0] = arrays["total"].sum(axis=0) / trials
+        residual = datay - imfs[0]
+        for k in range(1, N):
+            arrays["data"][:] = residual  # 子进程从共享内存读取当前余量
+            list(mapper(_ceemdan_chunk, [(chunk, starts[chunk], size, k, noise_width)
+                                         for chunk, size in enumerate(sizes)]))
+            imfs[k] = arrays["total"].sum(axis=0) / trials
+            residual = residual - imfs[k]
+        return imfs, residual
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        arrays = None  # 释放对共享内存的引用后才能关闭
+        for name in list(_ARRAYS):  # workers为1时当前进程也挂载了共享内存
+            if _ARRAYS[name][0].name in {block.name for block in blocks.values()}:
+                shm, _ = _ARRAYS.pop(name)
+                shm.close()
+        for block in blocks.values():
+            block.close()
+            block.unlink()
@@ -0,0 +1,119 @@
+import numpy as np
+
+
+def pack(series_list):
+    """
+    将多条长度不同的序列打包为偏移量数组和扁平数组。
+
+    参数:
+    series_list (list): 多条数据序列。
+
+    返回:
+    tuple: (offsets, values)，第k条序列为values[offsets[k]:offsets[k + 1]]。
+    """
+    lengths = np.array([len(s) for s in series_list], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    values = np.concatenate([np.asarray(s, dtype=float).ravel() for s in series_list])
+    return offsets, values
+
+
+def solve_normal_equations(m, S_z, S_zz, S_y, S_zy):
+    """
+    以闭式解求解GM(1,1)的2×2最小二乘正规方程。
+
+    矩阵B的行为(z_k, 1)，Y的元素为y_k，正规方程为
+    [[S_zz, S_z], [S_z, m]] * [a, b]^T = [S_zy, S_y]^T，
+    由克拉默法则得 a = (m*S_zy - S_z*S_y)/det，b = (S_zz*S_y - S_z*S_zy)/det，其中det = m*S_zz - S_z^2。
+    各参数可以是标量，也可以是形状相同的数组（同时求解多个方程组）。
+
+    参数:
+    m (int或numpy.ndarray): 方程个数，即序列长度减一。
+    S_z (float或numpy.ndarray): sum(z_k)。
+    S_zz (float或numpy.ndarray): sum(z_k^2)。
+    S_y (float或numpy.ndarray): sum(y_k)。
+    S_zy (float或numpy.ndarray): sum(z_k*y_k)。
+
+    返回:
+    tuple: 参数(a, b)。
+    """
+    det = m * S_zz - S_z * S_z
+    a = (m * S_zy - S_z * S_y) / det
+    b = (S_zz * S_y - S_z * S_zy) / det
+    return a, b
+
+
+def fit_gm_batch(data, offsets=None, horizon=0):
+    """
+    一次拟合多条序列的GM(1,1)模型。
+
+    一次累加序列由cumsum得到，背景值z_k = -(x1_{k-1} + x1_k)/2，所有序列的正规方程由分组求和
+    （np.add.reduceat）得到后以闭式解同时求解；拟合值、后验方差比值C和小误差概率P也全部为数组运算，
+    与逐条调用GMModel.set_model和precision_evaluation的结果一致。
+
+    参数:
+    data (numpy.ndarray): offsets为None时为形状(序列数, 序列长度)的二维数组；否则为所有序列拼接成的扁平数组。
+    offsets (numpy.ndarray): 长度为序列数+1的偏移量数组，为None时data按行划分。每条序列至少包含3个数据。
+    horizon (int): 每条序列向后预测的步数。
+
+    返回:
+    dict: 包含参数a、b、后验方差比值C、小误差概率P、平均绝对百分比误差MAPE（%）的数组，
+    与data形状相同的拟合值fitted和残差residuals，以及形状为(序列数, horizon)的预测值forecast。
+    """
+    data = np.asarray(data, dtype=float)
+    if offsets is None:
+        if data.ndim != 2:
+            raise ValueError("不给出offsets时data应为二维数组。")
+        rows, columns = data.shape
+        offsets = np.arange(0, rows * columns + 1, columns)
+        values = data.ravel()
+        add_data = np.cumsum(data, axis=1).ravel()
+    else:
+        offsets = np.asarray(offsets, dtype=np.int64)
+        values = data.ravel()
+        # 全局累加后减去每条序列起点之前的累加值，得到每条序列各自的一次累加序列
+        total = np.cumsum(values)
+        base = np.concatenate(([0.0], total))[offsets[:-1]]
+        add_data = total - np.repeat(base, np.diff(offsets))
+
+    starts = offsets[:-1]
+    n = np.diff(offsets)
+    if np.any(n < 3):
+        raise ValueError("每条序列至少需要包含3个数据。")
+    local = np.arange(len(values)) - np.repeat(starts, n)  # 序列内下标k
+    first = local == 0
+
+    # 背景值z_k = -(x1_{k-1} + x1_k)/2 与 y_k = x0_k，k从1到n-1；每条序列的第一个位置不参与正规方程
+    z = np.empty_like(values)
+    z[1:] = -0.5 * (add_data[:-1] + add_data[1:])
+    z[first] = 0.0
+    y = np.where(first, 0.0, values)
+    m = n - 1
+    a, b = solve_normal_equations(m, np.add.reduceat(z, starts), np.add.reduceat(z * z, starts),
+                                  np.add.reduceat(y, starts), np.add.reduceat(z * y, starts))
+
+    # 拟合值：第一个位置为原始数据，之后为(1 - e^a)*(x0_0 - b/a)*e^(-a*k)
+    x0 = values[starts]
+    group_a = np.repeat(a, n)
+    scale = np.repeat((1 - np.exp(a)) * (x0 - b / a), n)
+    fitted = np.where(first, values, scale * np.exp(-group_a * local))
+
+    # 精度检验：C = S2/S1，P为|e_k - mean(e)| < 0.6745*S1的比例
+    error = values - fitted
+    aver_error = np.add.reduceat(error, starts) / n
+    aver_data = np.add.reduceat(values, starts) / n
+    S1 = np.sqrt(np.add.reduceat((values - np.repeat(aver_data, n)) ** 2, starts) / n)
+    S2 = np.sqrt(np.add.reduceat((error - np.repeat(aver_error, n)) ** 2, starts) / n)
+    small = np.abs(error - np.repeat(aver_error, n)) < 0.6745 * np.repeat(S1, n)
+    P = np.add.reduceat(small.astype(float), starts) / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        MAPE = np.add.reduceat(np.abs(error / values), starts) / n * 100  # 序列含0时为inf
+
+    # 预测第n, n+1, ..., n+horizon-1步
+    steps = n[:, np.newaxis] + np.arange(horizon)
+    forecast = ((1 - np.exp(a)) * (x0 - b / a))[:, np.newaxis] * np.exp(-a[:, np.newaxis] * steps)
+
+    if data.ndim == 2:
+        fitted = fitted.reshape(data.shape)
+        error = error.reshape(data.shape)
+    return {"a": a, "b": b, "fitted": fitted, "residuals": error, "C": S2 / S1, "P": P, "MAPE": MAPE,
+            "forecast": forecast}
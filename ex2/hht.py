@@ -0,0 +1,108 @@
+import numpy as np
+from scipy import fft, sparse
+
+DEFAULT_CHUNK_SIZE = 1 << 22  # 每批处理的数据点数上限，控制复数缓冲区的大小
+
+
+def _rows(shape, chunk_size):
+    """
+    按数据点数上限把二维数组的行分成若干批
+
+    参数:
+    shape (tuple): 数组形状(行数, 列数)。
+    chunk_size (int): 每批的数据点数上限。
+
+    返回:
+    list: 每批的行切片。
+    """
+    step = max(1, chunk_size // max(shape[1], 1))
+    return [slice(start, min(start + step, shape[0])) for start in range(0, shape[0], step)]
+
+
+def analytic_signal(imfs, out=None):
+    """
+    计算各IMF分量的解析信号
+
+    对二维数组按行一次批量做实数FFT，正频率分量乘2、直流和奈奎斯特分量保持不变、负频率分量置零后做逆FFT，
+    结果的实部为原序列，虚部为其希尔伯特变换，与scipy.signal.hilbert相同。float32输入得到complex64结果。
+
+    参数:
+    imfs (numpy.ndarray): 形状为(分量数, 数据长度)的IMF分量数组，一维数组视为一个分量。
+    out (numpy.ndarray, 可选): 保存结果的复数数组，形状与imfs相同。
+
+    返回:
+    numpy.ndarray: 解析信号，形状与imfs相同。
+    """
+    imfs = np.asarray(imfs)
+    n = imfs.shape[-1]
+    spectrum = fft.rfft(imfs, axis=-1)
+    spectrum[..., 1:(n + 1) // 2] *= 2  # 正频率分量乘2，n为偶数时最后一个是奈奎斯特分量，保持不变
+    full = np.zeros(imfs.shape[:-1] + (n,), dtype=spectrum.dtype)
+    full[..., :spectrum.shape[-1]] = spectrum
+    result = fft.ifft(full, axis=-1, overwrite_x=True)
+    if out is None:
+        return result
+    out[...] = result
+    return out
+
+
+def instantaneous(imfs, dt=1.0, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    计算各IMF分量的瞬时幅值和瞬时频率
+
+    瞬时幅值为解析信号的模，瞬时频率为展开后的相位对时间的导数除以2π（由np.gradient按中心差分计算，两端为单侧差分）。
+    分量按行分批计算，每批的复数缓冲区不超过chunk_size个数据点。
+
+    参数:
+    imfs (numpy.ndarray): 形状为(分量数, 数据长度)的IMF分量数组。
+    dt (float, 可选): 采样间隔，默认值为1.0。
+    chunk_size (int, 可选): 每批的数据点数上限。
+
+    返回:
+    tuple: 包含两个与imfs形状相同的数组，分别是瞬时幅值和瞬时频率（单位为1/dt）。
+    """
+    imfs = np.atleast_2d(np.asarray(imfs))
+    dtype = np.float32 if imfs.dtype == np.float32 else np.float64
+    amplitude = np.empty(imfs.shape, dtype=dtype)
+    frequency = np.empty(imfs.shape, dtype=dtype)
+    for rows in _rows(imfs.shape, chunk_size):
+        z = analytic_signal(imfs[rows])
+        np.abs(z, out=amplitude[rows])
+        phase = np.unwrap(np.angle(z), axis=-1)
+        frequency[rows] = np.gradient(phase, dt, axis=-1) / (2 * np.pi) if imfs.shape[1] > 1 else 0
+    return amplitude, frequency
+
+
+def hilbert_spectrum(imfs, dt=1.0, bins=100, fmax=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    计算希尔伯特-黄谱（HHT）和边际谱
+
+    每个分量在每个时刻的瞬时幅值按瞬时频率落入的频率区间累加，得到形状为(频率区间数, 数据长度)的稀疏时频矩阵，
+    只保存非零元素，内存与分量数乘数据长度成正比而与频率区间数无关。瞬时频率为负或不小于fmax的点不计入。
+    边际谱为时频矩阵沿时间方向的积分（幅值之和乘dt），反映各频率的总幅值，可用于寻找故障到达的周期。
+
+    参数:
+    imfs (numpy.ndarray): 形状为(分量数, 数据长度)的IMF分量数组，如EMDModel.extract_imf返回的第一个元素。
+    dt (float, 可选): 采样间隔，默认值为1.0。
+    bins (int, 可选): 频率区间数，默认值为100。
+    fmax (float, 可选): 频率上限，默认值为奈奎斯特频率0.5/dt。
+    chunk_size (int, 可选): 每批的数据点数上限。
+
+    返回:
+    dict: "edges"为长度bins+1的频率区间端点；"spectrum"为scipy.sparse.csr_matrix格式的时频矩阵；
+          "marginal"为长度bins的边际谱；"amplitude"和"frequency"为瞬时幅值和瞬时频率。
+    """
+    imfs = np.atleast_2d(np.asarray(imfs))
+    fmax = 0.5 / dt if fmax is None else fmax
+    edges = np.linspace(0, fmax, bins + 1)
+    amplitude, frequency = instantaneous(imfs, dt, chunk_size)
+    spectrum = sparse.csr_matrix((bins, imfs.shape[1]))
+    for rows in _rows(imfs.shape, chunk_size):
+        f, a = frequency[rows], amplitude[rows]
+        index = np.floor(f * (bins / fmax)).astype(np.intp)
+        valid = (f >= 0) & (index < bins)
+        times = np.broadcast_to(np.arange(imfs.shape[1]), f.shape)
+        spectrum = spectrum + sparse.coo_matrix((a[valid], (index[valid], times[valid])),
+                                                shape=(bins, imfs.shape[1])).tocsr()  # 重复的(频率, 时刻)自动相加
+    marginal = np.asarray(spectrum.sum(axis=1)).ravel() * dt
+    return {"edges": edges, "spectrum": spectrum, "marginal": marginal, "amplitude": amplitude, "frequency": frequency}
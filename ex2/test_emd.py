@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+from EMD import StreamingEMDModel
+
+
+@pytest.mark.parametrize("length", [300, 301, 250])
+def test_streaming_flush_rebuilds_stream(length):
+    x = np.arange(float(length))
+    y = np.sin(x / 5) + np.sin(x / 17) + 0.01 * x
+    model = StreamingEMDModel(64)
+    outputs = [model.extend(y[:150]), model.extend(y[150:])]
+    tail = model.flush()
+    outputs.append(tail)
+    result = np.concatenate(outputs, axis=1)
+    # 各IMF分量与趋势（余量）之和重建整个数据流，包括flush输出的末尾部分
+    assert result.shape == (model.N + 1, length)
+    assert np.allclose(result.sum(axis=0), y)
+    assert np.allclose(tail.sum(axis=0), y[length - tail.shape[1]:])
+    assert model.trend == tail[-1, -1]
+    assert model.received == 0 and model.emitted == 0